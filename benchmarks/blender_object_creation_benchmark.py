@@ -0,0 +1,419 @@
+"""
+Benchmark of the creation of Blender objects using synthetic reconstructions.
+
+In contrast to the file handler benchmark, this script measures the cost of
+the different representations of cameras and points in Blender (camera
+objects, camera animations, particle systems, meshes and OpenGL draw
+handlers). For each representation and scale the script reports the
+duration, the throughput (objects/s, points/s or cameras/s) and the time
+required to save and load the resulting .blend file.
+
+The script must be run with Blender, for example:
+
+blender --background --factory-startup \
+    --python benchmarks/blender_object_creation_benchmark.py -- \
+    --num_points 10000 100000 1000000 --num_cameras 100 1000 10000 \
+    --output_fp blender_object_creation_benchmark.json
+
+The OpenGL representations require a GPU context. They are skipped
+automatically, if Blender runs in background mode or if no display or GPU
+is available.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.utility.blender_utility import add_collection
+from photogrammetry_importer.utility.blender_camera_utility import (
+    add_cameras,
+    add_camera_animation,
+)
+from photogrammetry_importer.utility.blender_point_utility import (
+    add_points_as_particle_system,
+    add_points_as_mesh,
+)
+from photogrammetry_importer.utility.blender_opengl_utility import (
+    draw_points,
+    draw_camera_frusta,
+)
+from photogrammetry_importer.utility.profiling_utility import (
+    get_profiler,
+    start_profiling,
+)
+
+from benchmarks.synthetic_reconstruction import SyntheticReconstruction
+
+_DEFAULT_POINT_SCALES = [10000, 100000, 1000000, 10000000]
+_DEFAULT_CAMERA_SCALES = [100, 1000, 10000, 50000]
+# Number of cameras used by the benchmarks of the point representations
+_NUM_CAMERAS_OF_POINT_BENCHMARKS = 10
+
+
+def _add_cameras(recon_data, collection):
+    add_cameras(
+        recon_data["cameras"],
+        collection,
+        image_dp=recon_data["image_dp"],
+        add_depth_maps_as_point_cloud=False,
+    )
+
+
+def _add_cameras_with_shared_data(recon_data, collection):
+    add_cameras(
+        recon_data["cameras"],
+        collection,
+        image_dp=recon_data["image_dp"],
+        add_depth_maps_as_point_cloud=False,
+        share_camera_data=True,
+    )
+
+
+def _add_camera_animation(recon_data, collection):
+    add_camera_animation(
+        recon_data["cameras"],
+        collection,
+        animation_frame_source="ORIGINAL",
+        add_background_images=False,
+        number_interpolation_frames=0,
+        interpolation_type="LINEAR",
+        consider_missing_cameras_during_animation=False,
+        remove_rotation_discontinuities=True,
+        image_dp=recon_data["image_dp"],
+        image_fp_type=Camera.IMAGE_FP_TYPE_NAME,
+    )
+
+
+def _add_particle_system(recon_data, collection):
+    add_points_as_particle_system(
+        recon_data["points"],
+        mesh_type="CUBE",
+        point_extent=0.01,
+        add_particle_color_emission=True,
+        reconstruction_collection=collection,
+    )
+
+
+def _add_mesh(recon_data, collection):
+    add_points_as_mesh(recon_data["points"], collection)
+
+
+def _draw_points(recon_data, collection):
+    draw_points(
+        recon_data["points"],
+        add_points_to_point_cloud_handle=True,
+        reconstruction_collection=collection,
+    )
+
+
+def _draw_camera_frusta(recon_data, collection):
+    draw_camera_frusta(
+        recon_data["cameras"], reconstruction_collection=collection
+    )
+
+
+class _Representation:
+    def __init__(self, add_func, element_type, requires_gpu=False):
+        self.add_func = add_func
+        # Either "points" or "cameras"
+        self.element_type = element_type
+        self.requires_gpu = requires_gpu
+
+
+_REPRESENTATIONS = {
+    "cameras": _Representation(_add_cameras, "cameras"),
+    "cameras_shared_data": _Representation(
+        _add_cameras_with_shared_data, "cameras"
+    ),
+    "camera_animation": _Representation(_add_camera_animation, "cameras"),
+    "opengl_camera_frusta": _Representation(
+        _draw_camera_frusta, "cameras", requires_gpu=True
+    ),
+    "particle_system": _Representation(_add_particle_system, "points"),
+    "mesh": _Representation(_add_mesh, "points"),
+    "opengl_points": _Representation(
+        _draw_points, "points", requires_gpu=True
+    ),
+}
+
+
+def get_gpu_skip_reason():
+    """Return why GPU dependent representations can not be benchmarked.
+
+    :return: A string describing the reason or None (if a GPU context is
+        available).
+    """
+    if bpy.app.background:
+        return "Blender runs in background mode"
+    if sys.platform.startswith("linux") and not (
+        os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+    ):
+        return "No display available"
+    try:
+        import gpu
+
+        gpu.shader.from_builtin("3D_FLAT_COLOR")
+    except Exception as err:
+        return "No GPU available (" + str(err) + ")"
+    return None
+
+
+def _get_git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _reset_blend_file():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def _create_recon_data(element_type, scale, image_dp):
+    if element_type == "points":
+        recon = SyntheticReconstruction(
+            _NUM_CAMERAS_OF_POINT_BENCHMARKS, scale, track_length=0
+        )
+    else:
+        recon = SyntheticReconstruction(scale, 0, track_length=0)
+    return {
+        "cameras": recon.get_cameras(image_dp),
+        "points": recon.get_points(),
+        "image_dp": image_dp,
+    }
+
+
+def _measure_redraw():
+    # The draw callbacks of the OpenGL representations are executed during
+    # the next redraw of the 3D views
+    try:
+        start_time = time.perf_counter()
+        bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
+        return time.perf_counter() - start_time
+    except RuntimeError:
+        return None
+
+
+def _measure_save_and_load(blend_fp):
+    start_time = time.perf_counter()
+    bpy.ops.wm.save_as_mainfile(filepath=blend_fp, compress=False)
+    save_seconds = time.perf_counter() - start_time
+    blend_file_size = os.path.getsize(blend_fp)
+
+    _reset_blend_file()
+    start_time = time.perf_counter()
+    bpy.ops.wm.open_mainfile(filepath=blend_fp)
+    load_seconds = time.perf_counter() - start_time
+    return save_seconds, load_seconds, blend_file_size
+
+
+def run_representation_benchmark(representation_name, scale, work_dp):
+    """Measure the creation of a single representation at a single scale."""
+    representation = _REPRESENTATIONS[representation_name]
+    image_dp = os.path.join(work_dp, "images")
+    recon_data = _create_recon_data(
+        representation.element_type, scale, image_dp
+    )
+
+    _reset_blend_file()
+    collection = add_collection("Reconstruction")
+    num_objects_before = len(bpy.data.objects)
+
+    start_profiling(representation_name)
+    start_time = time.perf_counter()
+    representation.add_func(recon_data, collection)
+    bpy.context.view_layer.update()
+    seconds = time.perf_counter() - start_time
+    get_profiler().stop()
+
+    num_objects = len(bpy.data.objects) - num_objects_before
+    result = {
+        "seconds": seconds,
+        "num_objects": num_objects,
+        "objects_per_second": num_objects / seconds,
+        "num_" + representation.element_type: scale,
+        representation.element_type + "_per_second": scale / seconds,
+        "profile": get_profiler().to_dict(),
+    }
+    if representation.requires_gpu:
+        result["redraw_seconds"] = _measure_redraw()
+
+    blend_fp = os.path.join(work_dp, representation_name + ".blend")
+    save_seconds, load_seconds, blend_file_size = _measure_save_and_load(
+        blend_fp
+    )
+    os.remove(blend_fp)
+    result["save_seconds"] = save_seconds
+    result["load_seconds"] = load_seconds
+    result["blend_file_size"] = blend_file_size
+    return result
+
+
+def run_benchmark(
+    point_scales=None,
+    camera_scales=None,
+    representation_names=None,
+    max_seconds=None,
+    work_dp=None,
+):
+    """Run the benchmark for the given representations and scales.
+
+    If a run exceeds :code:`max_seconds`, the larger scales of the
+    corresponding representation are skipped.
+    """
+    if point_scales is None:
+        point_scales = _DEFAULT_POINT_SCALES
+    if camera_scales is None:
+        camera_scales = _DEFAULT_CAMERA_SCALES
+    if representation_names is None:
+        representation_names = list(_REPRESENTATIONS.keys())
+    gpu_skip_reason = get_gpu_skip_reason()
+    results = {
+        "metadata": {
+            "git_commit": _get_git_commit(),
+            "date": datetime.datetime.now().isoformat(),
+            "blender_version": bpy.app.version_string,
+            "background": bpy.app.background,
+            "gpu_skip_reason": gpu_skip_reason,
+            "point_scales": point_scales,
+            "camera_scales": camera_scales,
+            "max_seconds": max_seconds,
+        },
+        "representations": {},
+    }
+    work_dp = tempfile.mkdtemp(dir=work_dp)
+    try:
+        for representation_name in representation_names:
+            representation = _REPRESENTATIONS[representation_name]
+            if representation.element_type == "points":
+                scales = point_scales
+            else:
+                scales = camera_scales
+            scale_results = {}
+            results["representations"][representation_name] = scale_results
+            skip_reason = None
+            if representation.requires_gpu:
+                skip_reason = gpu_skip_reason
+            for scale in sorted(scales):
+                if skip_reason is not None:
+                    scale_results[str(scale)] = {"skipped": skip_reason}
+                    continue
+                result = run_representation_benchmark(
+                    representation_name, scale, work_dp
+                )
+                scale_results[str(scale)] = result
+                if max_seconds is not None and result["seconds"] > max_seconds:
+                    skip_reason = "Exceeded maximum duration at {} {}".format(
+                        scale, representation.element_type
+                    )
+    finally:
+        shutil.rmtree(work_dp)
+        _reset_blend_file()
+    return results
+
+
+def _print_summary(results):
+    line_format = "{:<22} {:>10} {:>10} {:>12} {:>12} {:>10} {:>10} {:>10}"
+    print(
+        line_format.format(
+            "Representation",
+            "Scale",
+            "Seconds",
+            "Objects/s",
+            "Elements/s",
+            "Save (s)",
+            "Load (s)",
+            "MB",
+        )
+    )
+    for representation_name, scale_results in results[
+        "representations"
+    ].items():
+        for scale, result in scale_results.items():
+            if "skipped" in result:
+                print(
+                    "{:<22} {:>10} {}".format(
+                        representation_name, scale, result["skipped"]
+                    )
+                )
+                continue
+            element_type = _REPRESENTATIONS[representation_name].element_type
+            print(
+                line_format.format(
+                    representation_name,
+                    scale,
+                    "{:.3f}".format(result["seconds"]),
+                    "{:.0f}".format(result["objects_per_second"]),
+                    "{:.0f}".format(result[element_type + "_per_second"]),
+                    "{:.3f}".format(result["save_seconds"]),
+                    "{:.3f}".format(result["load_seconds"]),
+                    "{:.1f}".format(result["blend_file_size"] / (1024 * 1024)),
+                )
+            )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--num_points", type=int, nargs="+", default=_DEFAULT_POINT_SCALES
+    )
+    parser.add_argument(
+        "--num_cameras", type=int, nargs="+", default=_DEFAULT_CAMERA_SCALES
+    )
+    parser.add_argument(
+        "--representations",
+        nargs="+",
+        choices=list(_REPRESENTATIONS.keys()),
+        default=None,
+    )
+    parser.add_argument(
+        "--max_seconds",
+        type=float,
+        default=600,
+        help="Skip larger scales of a representation after a slower run",
+    )
+    parser.add_argument("--work_dp", default=None)
+    parser.add_argument("--output_fp", default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # Suppress the log messages of the add-on
+        logging.getLogger().setLevel(logging.WARNING)
+
+    results = run_benchmark(
+        point_scales=args.num_points,
+        camera_scales=args.num_cameras,
+        representation_names=args.representations,
+        max_seconds=args.max_seconds,
+        work_dp=args.work_dp,
+    )
+    _print_summary(results)
+    if args.output_fp is not None:
+        with open(args.output_fp, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+
+
+if __name__ == "__main__":
+    # Blender passes the arguments of the script after "--"
+    if "--" in sys.argv:
+        main(sys.argv[sys.argv.index("--") + 1 :])
+    else:
+        main(sys.argv[1:])
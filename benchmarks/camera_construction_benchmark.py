@@ -0,0 +1,99 @@
+"""
+Micro-benchmark measuring the construction cost of camera objects.
+
+Blender is not required to run this script, for example:
+
+python benchmarks/camera_construction_benchmark.py \
+    --num_cameras 100000 --output_fp camera_construction.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_array import CameraArray
+
+
+def _create_default_cameras(num_cameras):
+    return [Camera() for _ in range(num_cameras)]
+
+
+def _create_initialized_cameras(num_cameras):
+    calibration_mat = Camera.compute_calibration_mat(1000, 500, 400)
+    quaternion = np.array([1, 0, 0, 0], dtype=float)
+    center = np.array([1, 2, 3], dtype=float)
+    cameras = []
+    for _ in range(num_cameras):
+        camera = Camera()
+        camera.set_calibration(calibration_mat, 0)
+        camera.set_quaternion(quaternion)
+        camera.set_camera_center_after_rotation(center)
+        cameras.append(camera)
+    return cameras
+
+
+def _create_camera_array_views(num_cameras):
+    camera_array = CameraArray(num_cameras)
+    camera_array.set_quaternions([1, 0, 0, 0])
+    camera_array.set_camera_centers_after_rotation([1, 2, 3])
+    camera_array.set_calibration_mats(
+        Camera.compute_calibration_mat(1000, 500, 400)
+    )
+    return camera_array, camera_array.get_cameras()
+
+
+def _measure(create_func, num_cameras):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = create_func(num_cameras)
+    elapsed_time = time.perf_counter() - start_time
+    allocated_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "total_seconds": elapsed_time,
+        "microseconds_per_camera": elapsed_time / num_cameras * 1e6,
+        "bytes_per_camera": allocated_bytes / num_cameras,
+    }
+
+
+def run_benchmark(num_cameras):
+    """Measure the time and memory required per camera."""
+    return {
+        "num_cameras": num_cameras,
+        "default_cameras": _measure(_create_default_cameras, num_cameras),
+        "initialized_cameras": _measure(
+            _create_initialized_cameras, num_cameras
+        ),
+        "camera_array_views": _measure(
+            _create_camera_array_views, num_cameras
+        ),
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--num_cameras", type=int, default=100000)
+    parser.add_argument("--output_fp", default=None)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.num_cameras)
+    print(json.dumps(results, indent=4))
+    if args.output_fp is not None:
+        with open(args.output_fp, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+
+
+if __name__ == "__main__":
+    # Blender passes the arguments of the script after "--"
+    if "--" in sys.argv:
+        main(sys.argv[sys.argv.index("--") + 1 :])
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,440 @@
+"""
+Benchmark of the file handlers using synthetic reconstructions.
+
+For each file format a synthetic reconstruction is written to a temporary
+directory and parsed with the corresponding file handler (outside of
+Blender). The script reports the duration, the throughput (points/s, MB/s)
+and the peak of the memory allocated by Python and writes the results as
+JSON file, which allows to compare the performance of different commits.
+
+Example:
+
+python benchmarks/file_handler_benchmark.py --num_cameras 100 \
+    --num_points 100000 --output_fp file_handler_benchmark.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import datetime
+import tempfile
+import subprocess
+import importlib.util
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from photogrammetry_importer.file_handlers.colmap_file_handler import (
+    ColmapFileHandler,
+)
+from photogrammetry_importer.file_handlers.meshroom_file_handler import (
+    MeshroomFileHandler,
+)
+from photogrammetry_importer.file_handlers.mve_file_handler import (
+    MVEFileHandler,
+)
+from photogrammetry_importer.file_handlers.nvm_file_handler import (
+    NVMFileHandler,
+)
+from photogrammetry_importer.file_handlers.open3D_file_handler import (
+    Open3DFileHandler,
+)
+from photogrammetry_importer.file_handlers.openmvg_json_file_handler import (
+    OpenMVGJSONFileHandler,
+)
+from photogrammetry_importer.file_handlers.opensfm_json_file_handler import (
+    OpenSfMJSONFileHandler,
+)
+from photogrammetry_importer.file_handlers.point_data_file_handler import (
+    PointDataFileHandler,
+)
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.utility.profiling_utility import get_profiler
+
+from benchmarks.synthetic_reconstruction import (
+    SyntheticReconstruction,
+    write_colmap_workspace,
+    write_nvm_file,
+    write_openmvg_file,
+    write_opensfm_file,
+    write_meshroom_sfm_file,
+    write_mve_workspace,
+    write_open3d_file,
+    write_point_data_file,
+)
+
+_IMAGE_FP_TYPE = Camera.IMAGE_FP_TYPE_NAME
+
+
+class _Format:
+    def __init__(self, write_func, parse_func, required_modules=()):
+        # write_func(recon, odp) returns the path passed to parse_func
+        self.write_func = write_func
+        # parse_func(ifp, recon) returns a (cameras, points) tuple
+        self.parse_func = parse_func
+        self.required_modules = required_modules
+
+    def get_missing_modules(self):
+        return [
+            module
+            for module in self.required_modules
+            if importlib.util.find_spec(module) is None
+        ]
+
+
+def _parse_colmap(idp, recon):
+    cameras, points, _ = ColmapFileHandler.parse_colmap_folder(
+        idp, idp, _IMAGE_FP_TYPE, suppress_distortion_warnings=True
+    )
+    return cameras, points
+
+
+def _parse_meshroom(ifp, recon):
+    cameras, points, _ = MeshroomFileHandler.parse_meshroom_file(
+        ifp, os.path.dirname(ifp), _IMAGE_FP_TYPE, True, "", -1, "", -1
+    )
+    return cameras, points
+
+
+def _parse_mve(idp, recon):
+    return MVEFileHandler.parse_mve_workspace(
+        idp,
+        recon.width,
+        recon.height,
+        add_depth_maps_as_point_cloud=recon.depth_map_width > 0,
+        suppress_distortion_warnings=True,
+    )
+
+
+def _parse_open3d(ifp, recon):
+    image_dp = os.path.join(os.path.dirname(ifp), "images")
+    cameras = Open3DFileHandler.parse_open3d_file(
+        ifp, image_dp, _IMAGE_FP_TYPE, None
+    )
+    return cameras, []
+
+
+def _parse_point_data(ifp, recon):
+    return [], PointDataFileHandler.parse_point_data_file(ifp)
+
+
+def _write_open3d(recon, odp, ext):
+    os.makedirs(os.path.join(odp, "images"))
+    return write_open3d_file(recon, os.path.join(odp, "trajectory" + ext))
+
+
+_FORMATS = {
+    "colmap_txt": _Format(
+        lambda recon, odp: write_colmap_workspace(recon, odp, ext=".txt"),
+        _parse_colmap,
+    ),
+    "colmap_bin": _Format(
+        lambda recon, odp: write_colmap_workspace(recon, odp, ext=".bin"),
+        _parse_colmap,
+    ),
+    "nvm": _Format(
+        lambda recon, odp: write_nvm_file(
+            recon, os.path.join(odp, "model.nvm")
+        ),
+        lambda ifp, recon: NVMFileHandler.parse_nvm_file(
+            ifp,
+            os.path.dirname(ifp),
+            _IMAGE_FP_TYPE,
+            suppress_distortion_warnings=True,
+        ),
+    ),
+    "openmvg": _Format(
+        lambda recon, odp: write_openmvg_file(
+            recon, os.path.join(odp, "sfm_data.json"), odp
+        ),
+        lambda ifp, recon: OpenMVGJSONFileHandler.parse_openmvg_file(
+            ifp,
+            os.path.dirname(ifp),
+            _IMAGE_FP_TYPE,
+            suppress_distortion_warnings=True,
+        ),
+    ),
+    "opensfm": _Format(
+        lambda recon, odp: write_opensfm_file(
+            recon, os.path.join(odp, "reconstruction.json")
+        ),
+        lambda ifp, recon: OpenSfMJSONFileHandler.parse_opensfm_file(
+            ifp,
+            os.path.dirname(ifp),
+            _IMAGE_FP_TYPE,
+            0,
+            suppress_distortion_warnings=True,
+        ),
+    ),
+    "meshroom": _Format(
+        lambda recon, odp: write_meshroom_sfm_file(
+            recon, os.path.join(odp, "cameras.sfm"), odp
+        ),
+        _parse_meshroom,
+    ),
+    "mve": _Format(write_mve_workspace, _parse_mve),
+    "open3d_json": _Format(
+        lambda recon, odp: _write_open3d(recon, odp, ".json"), _parse_open3d
+    ),
+    "open3d_log": _Format(
+        lambda recon, odp: _write_open3d(recon, odp, ".log"), _parse_open3d
+    ),
+    "ply": _Format(
+        lambda recon, odp: write_point_data_file(
+            recon, os.path.join(odp, "points.ply")
+        ),
+        _parse_point_data,
+        required_modules=("pyntcloud",),
+    ),
+    "las": _Format(
+        lambda recon, odp: write_point_data_file(
+            recon, os.path.join(odp, "points.las")
+        ),
+        _parse_point_data,
+        required_modules=("pyntcloud", "pylas"),
+    ),
+    "asc": _Format(
+        lambda recon, odp: write_point_data_file(
+            recon, os.path.join(odp, "points.asc")
+        ),
+        _parse_point_data,
+        required_modules=("pyntcloud",),
+    ),
+    "csv": _Format(
+        lambda recon, odp: write_point_data_file(
+            recon, os.path.join(odp, "points.csv")
+        ),
+        _parse_point_data,
+        required_modules=("pyntcloud",),
+    ),
+}
+
+
+def _get_size_in_bytes(fp_or_dp):
+    if os.path.isfile(fp_or_dp):
+        return os.path.getsize(fp_or_dp)
+    size = 0
+    for root, _, fns in os.walk(fp_or_dp):
+        for fn in fns:
+            size += os.path.getsize(os.path.join(root, fn))
+    return size
+
+
+def _get_git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure_parse(parse_func, ifp, recon, num_repetitions):
+    # The durations are measured without tracemalloc, since tracing the
+    # allocations slows down the parsing considerably
+    profiler = get_profiler()
+    durations = []
+    for _ in range(num_repetitions):
+        profiler.start("Parse")
+        start_time = time.perf_counter()
+        cameras, points = parse_func(ifp, recon)
+        durations.append(time.perf_counter() - start_time)
+        profiler.stop()
+        del points
+
+    tracemalloc.start()
+    parse_func(ifp, recon)
+    _, peak_traced_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cameras, durations, peak_traced_memory, profiler.to_dict()
+
+
+def _measure_depth_maps(cameras):
+    cameras = [camera for camera in cameras if camera.depth_map_fp is not None]
+    if len(cameras) == 0:
+        return None
+    num_depth_points = 0
+    start_time = time.perf_counter()
+    for camera in cameras:
+        world_coords = camera.convert_depth_map_to_world_coords(
+            depth_map_display_sparsity=1
+        )
+        num_depth_points += len(world_coords)
+    duration = time.perf_counter() - start_time
+    return {
+        "num_depth_maps": len(cameras),
+        "num_depth_points": num_depth_points,
+        "seconds": duration,
+        "depth_points_per_second": num_depth_points / duration,
+    }
+
+
+def run_format_benchmark(format_name, recon, work_dp, num_repetitions=3):
+    """Write and parse a synthetic reconstruction in the given format."""
+    file_format = _FORMATS[format_name]
+    missing_modules = file_format.get_missing_modules()
+    if len(missing_modules) > 0:
+        return {"skipped": "Missing modules: " + ", ".join(missing_modules)}
+
+    format_dp = os.path.join(work_dp, format_name)
+    os.makedirs(format_dp)
+    try:
+        ifp = file_format.write_func(recon, format_dp)
+        num_bytes = _get_size_in_bytes(ifp)
+        (
+            cameras,
+            durations,
+            peak_traced_memory,
+            profile,
+        ) = _measure_parse(file_format.parse_func, ifp, recon, num_repetitions)
+        depth_map_result = _measure_depth_maps(cameras)
+    finally:
+        shutil.rmtree(format_dp)
+
+    duration = min(durations)
+    result = {
+        "num_bytes": num_bytes,
+        "seconds": duration,
+        "all_seconds": durations,
+        "megabytes_per_second": num_bytes / (1024 * 1024) / duration,
+        "cameras_per_second": recon.get_num_cameras() / duration,
+        "peak_traced_memory": peak_traced_memory,
+        "profile": profile,
+    }
+    num_points = profile.get("total_counters", {}).get("points")
+    if format_name not in ["open3d_json", "open3d_log"]:
+        result["points_per_second"] = recon.get_num_points() / duration
+    if num_points is not None:
+        result["num_parsed_points"] = num_points
+    if depth_map_result is not None:
+        result["depth_maps"] = depth_map_result
+    return result
+
+
+def run_benchmark(
+    num_cameras,
+    num_points,
+    track_length=3,
+    depth_map_width=0,
+    format_names=None,
+    num_repetitions=3,
+    work_dp=None,
+):
+    """Run the benchmark for the given formats (default: all formats)."""
+    if format_names is None:
+        format_names = list(_FORMATS.keys())
+    recon = SyntheticReconstruction(
+        num_cameras,
+        num_points,
+        track_length=track_length,
+        depth_map_width=depth_map_width,
+    )
+    results = {
+        "metadata": {
+            "git_commit": _get_git_commit(),
+            "date": datetime.datetime.now().isoformat(),
+            "python_version": platform.python_version(),
+            "numpy_version": np.__version__,
+            "platform": platform.platform(),
+            "num_cameras": num_cameras,
+            "num_points": num_points,
+            "track_length": track_length,
+            "depth_map_width": depth_map_width,
+            "num_repetitions": num_repetitions,
+        },
+        "formats": {},
+    }
+    work_dp = tempfile.mkdtemp(dir=work_dp)
+    try:
+        for format_name in format_names:
+            results["formats"][format_name] = run_format_benchmark(
+                format_name, recon, work_dp, num_repetitions
+            )
+    finally:
+        shutil.rmtree(work_dp)
+    return results
+
+
+def _print_summary(results):
+    line_format = "{:<12} {:>10} {:>12} {:>12} {:>10} {:>14}"
+    print(
+        line_format.format(
+            "Format", "Seconds", "Points/s", "MB/s", "MB", "Peak Mem (MB)"
+        )
+    )
+    for format_name, result in results["formats"].items():
+        if "skipped" in result:
+            print("{:<12} {}".format(format_name, result["skipped"]))
+            continue
+        points_per_second = "-"
+        if "points_per_second" in result:
+            points_per_second = "{:.0f}".format(result["points_per_second"])
+        print(
+            line_format.format(
+                format_name,
+                "{:.3f}".format(result["seconds"]),
+                points_per_second,
+                "{:.1f}".format(result["megabytes_per_second"]),
+                "{:.1f}".format(result["num_bytes"] / (1024 * 1024)),
+                "{:.1f}".format(result["peak_traced_memory"] / (1024 * 1024)),
+            )
+        )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--num_cameras", type=int, default=100)
+    parser.add_argument("--num_points", type=int, default=100000)
+    parser.add_argument("--track_length", type=int, default=3)
+    parser.add_argument(
+        "--depth_map_width",
+        type=int,
+        default=0,
+        help="Width of the depth maps of Colmap and MVE (0 disables them)",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=list(_FORMATS.keys()),
+        default=None,
+    )
+    parser.add_argument("--num_repetitions", type=int, default=3)
+    parser.add_argument("--work_dp", default=None)
+    parser.add_argument("--output_fp", default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # Suppress the log messages of the file handlers
+        logging.getLogger().setLevel(logging.WARNING)
+
+    results = run_benchmark(
+        args.num_cameras,
+        args.num_points,
+        track_length=args.track_length,
+        depth_map_width=args.depth_map_width,
+        format_names=args.formats,
+        num_repetitions=args.num_repetitions,
+        work_dp=args.work_dp,
+    )
+    _print_summary(results)
+    if args.output_fp is not None:
+        with open(args.output_fp, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+
+
+if __name__ == "__main__":
+    # Blender passes the arguments of the script after "--"
+    if "--" in sys.argv:
+        main(sys.argv[sys.argv.index("--") + 1 :])
+    else:
+        main(sys.argv[1:])
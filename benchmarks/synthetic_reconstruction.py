@@ -0,0 +1,691 @@
+"""
+Generators of synthetic reconstructions in the supported file formats.
+
+The generated files contain only the information required by the
+corresponding file handlers, i.e. they are not necessarily complete
+reconstructions of the original software packages.
+"""
+
+import os
+import sys
+import json
+import zlib
+import struct
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from photogrammetry_importer.ext.read_write_model import (
+    Camera as ColmapCamera,
+    Image as ColmapImage,
+    write_cameras_text,
+    write_cameras_binary,
+    write_images_text,
+    write_images_binary,
+)
+from photogrammetry_importer.file_handlers.point_data_file_handler import (
+    PointDataFileHandler,
+)
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_array import CameraArray
+from photogrammetry_importer.types.point_array import PointArray
+from photogrammetry_importer.utility.rotation_utility import (
+    rotation_matrices_to_quaternions,
+)
+
+
+class SyntheticReconstruction:
+    """Class representing a random reconstruction of configurable size.
+
+    The cameras are placed on a circle looking at the origin and the points
+    are uniformly distributed in a cube around the origin. Each point is
+    observed by :code:`track_length` randomly chosen cameras.
+    """
+
+    def __init__(
+        self,
+        num_cameras,
+        num_points,
+        track_length=3,
+        width=1920,
+        height=1080,
+        depth_map_width=0,
+        seed=0,
+    ):
+        rng = np.random.default_rng(seed)
+        self.width = width
+        self.height = height
+        self.focal_length = 1.2 * max(width, height)
+        self.principal_point = np.array([width / 2, height / 2])
+        self.image_names = [
+            "image_{:06d}.jpg".format(index) for index in range(num_cameras)
+        ]
+
+        angles = np.linspace(0, 2 * np.pi, num_cameras, endpoint=False)
+        self.centers = np.stack(
+            (
+                10 * np.cos(angles),
+                10 * np.sin(angles),
+                np.full_like(angles, 2),
+            ),
+            axis=1,
+        )
+        # The rows of the (world to camera) rotation matrices are the axes of
+        # the (computer vision) camera coordinate frames
+        z_axes = -self.centers / np.linalg.norm(
+            self.centers, axis=1, keepdims=True
+        )
+        x_axes = np.cross(z_axes, [0, 0, 1])
+        x_axes /= np.linalg.norm(x_axes, axis=1, keepdims=True)
+        y_axes = np.cross(z_axes, x_axes)
+        self.rotation_mats = np.stack((x_axes, y_axes, z_axes), axis=1)
+        self.quaternions = rotation_matrices_to_quaternions(self.rotation_mats)
+        self.translation_vecs = -np.einsum(
+            "nij,nj->ni", self.rotation_mats, self.centers
+        )
+
+        self.coords = rng.uniform(-2, 2, size=(num_points, 3))
+        self.colors = rng.integers(
+            0, 256, size=(num_points, 3), dtype=np.uint8
+        )
+        self.track_image_indices = rng.integers(
+            0, max(num_cameras, 1), size=(num_points, track_length)
+        )
+        self.track_feature_indices = np.tile(
+            np.arange(num_points)[:, np.newaxis], (1, track_length)
+        )
+        self.track_image_coords = rng.uniform(
+            0, 1, size=(num_points, track_length, 2)
+        ) * [width, height]
+
+        self.depth_map_width = depth_map_width
+        self.depth_map_height = int(round(depth_map_width * height / width))
+        self._seed = seed
+
+    def get_num_cameras(self):
+        return len(self.image_names)
+
+    def get_num_points(self):
+        return self.coords.shape[0]
+
+    def get_track_length(self):
+        return self.track_image_indices.shape[1]
+
+    def get_calibration_mat(self):
+        return np.array(
+            [
+                [self.focal_length, 0, self.principal_point[0]],
+                [0, self.focal_length, self.principal_point[1]],
+                [0, 0, 1],
+            ]
+        )
+
+    def get_4x4_world_to_cam_mats(self):
+        world_to_cam_mats = np.zeros((self.get_num_cameras(), 4, 4))
+        world_to_cam_mats[:, 0:3, 0:3] = self.rotation_mats
+        world_to_cam_mats[:, 0:3, 3] = self.translation_vecs
+        world_to_cam_mats[:, 3, 3] = 1
+        return world_to_cam_mats
+
+    def get_4x4_cam_to_world_mats(self):
+        return np.linalg.inv(self.get_4x4_world_to_cam_mats())
+
+    def get_rodrigues_vecs(self):
+        """Return the rotations as axis-angle vectors."""
+        quaternions = self.quaternions * np.sign(self.quaternions[:, 0:1])
+        angles = 2 * np.arccos(np.clip(quaternions[:, 0], -1, 1))
+        sin_half_angles = np.sqrt(1 - np.minimum(quaternions[:, 0] ** 2, 1))
+        axes = np.zeros((len(quaternions), 3))
+        valid = sin_half_angles > 1e-12
+        axes[valid] = quaternions[valid, 1:4] / sin_half_angles[valid, None]
+        return axes * angles[:, np.newaxis]
+
+    def get_depth_map(self, camera_index):
+        """Return a random depth map (depth values between 5 and 15)."""
+        rng = np.random.default_rng(self._seed + camera_index + 1)
+        return rng.uniform(
+            5, 15, size=(self.depth_map_height, self.depth_map_width)
+        ).astype(np.float32)
+
+    def get_point_array(self):
+        return PointArray(self.coords, self.colors)
+
+    def get_points(self):
+        """Return a list of :code:`Point` objects."""
+        return self.get_point_array().get_points()
+
+    def get_cameras(self, image_dp=""):
+        """Return a list of :code:`Camera` objects."""
+        camera_array = CameraArray(self.get_num_cameras())
+        camera_array.set_rotation_mats(self.rotation_mats)
+        camera_array.set_camera_centers_after_rotation(self.centers)
+        camera_array.set_calibration_mats(self.get_calibration_mat())
+        cameras = camera_array.get_cameras()
+        for index, camera in enumerate(cameras):
+            camera.id = index
+            camera.width = self.width
+            camera.height = self.height
+            camera.image_dp = image_dp
+            camera.set_relative_fp(
+                self.image_names[index], Camera.IMAGE_FP_TYPE_NAME
+            )
+        return cameras
+
+
+def _write_rows(ofile, row_format, values, block_size=100000):
+    # Format all rows of a block with a single operation
+    for start in range(0, len(values), block_size):
+        block = values[start : start + block_size]
+        ofile.write(row_format * len(block) % tuple(block.ravel().tolist()))
+
+
+def _get_point_rows(recon):
+    # Object arrays allow to format integer and float columns at once
+    return np.concatenate(
+        (
+            np.asarray(recon.coords, dtype=object),
+            np.asarray(recon.colors, dtype=object),
+        ),
+        axis=1,
+    )
+
+
+def _write_png_header(ofp, width, height):
+    # The image size is read from the header, i.e. the image data is omitted
+    ihdr_data = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    with open(ofp, "wb") as ofile:
+        ofile.write(b"\x89PNG\r\n\x1a\n")
+        ofile.write(struct.pack(">I", len(ihdr_data)))
+        ofile.write(b"IHDR" + ihdr_data)
+        ofile.write(struct.pack(">I", zlib.crc32(b"IHDR" + ihdr_data)))
+
+
+def write_colmap_workspace(recon, workspace_odp, ext=".bin"):
+    """Write a :code:`Colmap` workspace with a sparse model.
+
+    If the reconstruction defines depth maps, these are written to
+    :code:`stereo/depth_maps`.
+    """
+    model_odp = os.path.join(workspace_odp, "sparse")
+    os.makedirs(model_odp, exist_ok=True)
+    os.makedirs(os.path.join(workspace_odp, "images"), exist_ok=True)
+
+    calib_params = np.array([recon.focal_length, *recon.principal_point])
+    colmap_cams = {}
+    colmap_images = {}
+    for index, image_name in enumerate(recon.image_names):
+        colmap_cams[index + 1] = ColmapCamera(
+            id=index + 1,
+            model="SIMPLE_PINHOLE",
+            width=recon.width,
+            height=recon.height,
+            params=calib_params,
+        )
+        colmap_images[index + 1] = ColmapImage(
+            id=index + 1,
+            qvec=recon.quaternions[index],
+            tvec=recon.translation_vecs[index],
+            camera_id=index + 1,
+            name=image_name,
+            xys=np.zeros((0, 2)),
+            point3D_ids=np.zeros(0, dtype=int),
+        )
+
+    track_length = recon.get_track_length()
+    track = np.stack(
+        (recon.track_image_indices + 1, recon.track_feature_indices), axis=2
+    )
+    points_ofp = os.path.join(model_odp, "points3D" + ext)
+    if ext == ".bin":
+        write_cameras_binary(
+            colmap_cams, os.path.join(model_odp, "cameras.bin")
+        )
+        write_images_binary(
+            colmap_images, os.path.join(model_odp, "images.bin")
+        )
+        dtype = np.dtype(
+            [
+                ("id", "<u8"),
+                ("xyz", "<f8", (3,)),
+                ("rgb", "u1", (3,)),
+                ("error", "<f8"),
+                ("track_length", "<u8"),
+                ("track", "<i4", (track_length, 2)),
+            ]
+        )
+        records = np.empty(recon.get_num_points(), dtype=dtype)
+        records["id"] = np.arange(1, recon.get_num_points() + 1)
+        records["xyz"] = recon.coords
+        records["rgb"] = recon.colors
+        records["error"] = 0
+        records["track_length"] = track_length
+        records["track"] = track
+        with open(points_ofp, "wb") as ofile:
+            ofile.write(np.array([len(records)], dtype="<u8").tobytes())
+            ofile.write(records.tobytes())
+    else:
+        write_cameras_text(colmap_cams, os.path.join(model_odp, "cameras.txt"))
+        write_images_text(colmap_images, os.path.join(model_odp, "images.txt"))
+        values = np.concatenate(
+            (
+                np.arange(1, recon.get_num_points() + 1)[:, np.newaxis],
+                _get_point_rows(recon),
+                np.zeros((recon.get_num_points(), 1), dtype=int),
+                track.reshape(recon.get_num_points(), -1),
+            ),
+            axis=1,
+        )
+        row_format = "%d %.17g %.17g %.17g %d %d %d %d"
+        row_format += " %d %d" * track_length + "\n"
+        with open(points_ofp, "w") as ofile:
+            ofile.write("# 3D point list with one line of data per point:\n")
+            _write_rows(ofile, row_format, values)
+
+    if recon.depth_map_width > 0:
+        depth_map_odp = os.path.join(workspace_odp, "stereo", "depth_maps")
+        os.makedirs(depth_map_odp, exist_ok=True)
+        for index, image_name in enumerate(recon.image_names):
+            depth_map = recon.get_depth_map(index)
+            depth_map_ofp = os.path.join(
+                depth_map_odp, image_name + ".geometric.bin"
+            )
+            with open(depth_map_ofp, "wb") as ofile:
+                header = "{}&{}&1&".format(
+                    depth_map.shape[1], depth_map.shape[0]
+                )
+                ofile.write(header.encode())
+                # Colmap stores the (transposed) array in Fortran order,
+                # which corresponds to the C order of the depth map
+                ofile.write(depth_map.tobytes())
+    return workspace_odp
+
+
+def write_nvm_file(recon, ofp):
+    """Write a :code:`VisualSfM` (:code:`.nvm`) file."""
+    with open(ofp, "w") as ofile:
+        ofile.write(
+            "NVM_V3 FixedK {} {} {} {} 0\n\n".format(
+                recon.focal_length,
+                recon.principal_point[0],
+                recon.focal_length,
+                recon.principal_point[1],
+            )
+        )
+        ofile.write("{}\n".format(recon.get_num_cameras()))
+        for index, image_name in enumerate(recon.image_names):
+            values = [recon.focal_length]
+            values += recon.quaternions[index].tolist()
+            values += recon.centers[index].tolist()
+            ofile.write(
+                image_name + "\t" + " ".join(map(repr, values)) + " 0 0\n"
+            )
+        ofile.write("\n{}\n".format(recon.get_num_points()))
+        track_length = recon.get_track_length()
+        measurements = np.concatenate(
+            (
+                recon.track_image_indices[:, :, np.newaxis],
+                recon.track_feature_indices[:, :, np.newaxis],
+                recon.track_image_coords - recon.principal_point,
+            ),
+            axis=2,
+        ).astype(object)
+        values = np.concatenate(
+            (
+                _get_point_rows(recon),
+                np.full((recon.get_num_points(), 1), track_length),
+                measurements.reshape(recon.get_num_points(), -1),
+            ),
+            axis=1,
+        )
+        row_format = "%r %r %r %d %d %d %d"
+        row_format += " %d %d %r %r" * track_length + "\n"
+        _write_rows(ofile, row_format, values)
+    return ofp
+
+
+def write_openmvg_file(recon, ofp, image_dp):
+    """Write an :code:`OpenMVG` (:code:`.json`) file."""
+    views = []
+    extrinsics = []
+    for index, image_name in enumerate(recon.image_names):
+        view_data = {
+            "local_path": "",
+            "filename": image_name,
+            "width": recon.width,
+            "height": recon.height,
+            "id_view": index,
+            "id_intrinsic": 0,
+            "id_pose": index,
+        }
+        views.append(
+            {
+                "key": index,
+                "value": {"ptr_wrapper": {"id": index, "data": view_data}},
+            }
+        )
+        extrinsics.append(
+            {
+                "key": index,
+                "value": {
+                    "rotation": recon.rotation_mats[index].tolist(),
+                    "center": recon.centers[index].tolist(),
+                },
+            }
+        )
+    intrinsic_data = {
+        "width": recon.width,
+        "height": recon.height,
+        "focal_length": recon.focal_length,
+        "principal_point": recon.principal_point.tolist(),
+    }
+    intrinsics = [
+        {
+            "key": 0,
+            "value": {
+                "polymorphic_name": "pinhole",
+                "ptr_wrapper": {"id": 0, "data": intrinsic_data},
+            },
+        }
+    ]
+    structure = []
+    for index, coord in enumerate(recon.coords.tolist()):
+        observations = [
+            {"key": view_index, "value": {"id_feat": feat_index, "x": x}}
+            for view_index, feat_index, x in zip(
+                recon.track_image_indices[index].tolist(),
+                recon.track_feature_indices[index].tolist(),
+                recon.track_image_coords[index].tolist(),
+            )
+        ]
+        structure.append(
+            {"key": index, "value": {"X": coord, "observations": observations}}
+        )
+    json_data = {
+        "sfm_data_version": "0.3",
+        "root_path": image_dp,
+        "views": views,
+        "intrinsics": intrinsics,
+        "extrinsics": extrinsics,
+        "structure": structure,
+        "control_points": [],
+    }
+    with open(ofp, "w") as ofile:
+        json.dump(json_data, ofile)
+    return ofp
+
+
+def write_opensfm_file(recon, ofp):
+    """Write an :code:`OpenSfM` (:code:`reconstruction.json`) file."""
+    cameras = {
+        "synthetic_camera": {
+            "projection_type": "perspective",
+            "width": recon.width,
+            "height": recon.height,
+            "focal": recon.focal_length / max(recon.width, recon.height),
+            "k1": 0.0,
+            "k2": 0.0,
+        }
+    }
+    rodrigues_vecs = recon.get_rodrigues_vecs().tolist()
+    shots = {
+        image_name: {
+            "camera": "synthetic_camera",
+            "rotation": rodrigues_vecs[index],
+            "translation": recon.translation_vecs[index].tolist(),
+        }
+        for index, image_name in enumerate(recon.image_names)
+    }
+    points = {
+        str(index): {"coordinates": coord, "color": color}
+        for index, (coord, color) in enumerate(
+            zip(recon.coords.tolist(), recon.colors.tolist())
+        )
+    }
+    with open(ofp, "w") as ofile:
+        json.dump(
+            [{"cameras": cameras, "shots": shots, "points": points}], ofile
+        )
+    return ofp
+
+
+def write_meshroom_sfm_file(recon, ofp, image_dp):
+    """Write a :code:`Meshroom` (:code:`.sfm`) file.
+
+    Similar to :code:`Meshroom`, all numbers are stored as strings.
+    """
+    views = []
+    poses = []
+    for index, image_name in enumerate(recon.image_names):
+        views.append(
+            {
+                "viewId": str(index),
+                "poseId": str(index),
+                "intrinsicId": "0",
+                "path": os.path.join(image_dp, image_name),
+                "width": str(recon.width),
+                "height": str(recon.height),
+            }
+        )
+        # Meshroom stores the rotation matrices in column major order
+        poses.append(
+            {
+                "poseId": str(index),
+                "pose": {
+                    "transform": {
+                        "rotation": list(
+                            map(
+                                repr,
+                                recon.rotation_mats[index].T.ravel().tolist(),
+                            )
+                        ),
+                        "center": list(
+                            map(repr, recon.centers[index].tolist())
+                        ),
+                    }
+                },
+            }
+        )
+    intrinsics = [
+        {
+            "intrinsicId": "0",
+            "width": str(recon.width),
+            "height": str(recon.height),
+            "type": "pinhole",
+            "pxFocalLength": repr(recon.focal_length),
+            "principalPoint": list(map(repr, recon.principal_point.tolist())),
+            "distortionParams": [],
+        }
+    ]
+    structure = []
+    for index, (coord, color) in enumerate(
+        zip(recon.coords.tolist(), recon.colors.tolist())
+    ):
+        observations = [
+            {
+                "observationId": str(view_index),
+                "featureId": str(feat_index),
+                "x": list(map(repr, x)),
+            }
+            for view_index, feat_index, x in zip(
+                recon.track_image_indices[index].tolist(),
+                recon.track_feature_indices[index].tolist(),
+                recon.track_image_coords[index].tolist(),
+            )
+        ]
+        structure.append(
+            {
+                "landmarkId": str(index),
+                "descType": "sift",
+                "color": list(map(str, color)),
+                "X": list(map(repr, coord)),
+                "observations": observations,
+            }
+        )
+    json_data = {
+        "version": ["1", "0", "0"],
+        "views": views,
+        "intrinsics": intrinsics,
+        "poses": poses,
+        "structure": structure,
+    }
+    with open(ofp, "w") as ofile:
+        json.dump(json_data, ofile, indent=4)
+    return ofp
+
+
+def write_mve_workspace(recon, workspace_odp):
+    """Write a :code:`MVE` workspace.
+
+    If the reconstruction defines depth maps, these are written as
+    :code:`depth-L0.mvei` files to the view directories.
+    """
+    views_odp = os.path.join(workspace_odp, "views")
+    os.makedirs(views_odp, exist_ok=True)
+    max_extent = max(recon.width, recon.height)
+    for index, image_name in enumerate(recon.image_names):
+        view_odp = os.path.join(views_odp, "view_{:04d}.mve".format(index))
+        os.makedirs(view_odp, exist_ok=True)
+        _write_png_header(
+            os.path.join(view_odp, "undistorted.png"),
+            recon.width,
+            recon.height,
+        )
+        principal_point = recon.principal_point / [recon.width, recon.height]
+        with open(os.path.join(view_odp, "meta.ini"), "w") as ofile:
+            ofile.write("[camera]\n")
+            ofile.write(
+                "focal_length = {!r}\n".format(recon.focal_length / max_extent)
+            )
+            ofile.write("pixel_aspect = 1\n")
+            ofile.write(
+                "principal_point = {!r} {!r}\n".format(
+                    *principal_point.tolist()
+                )
+            )
+            ofile.write("radial_distortion = 0 0\n")
+            ofile.write(
+                "rotation = "
+                + " ".join(
+                    map(repr, recon.rotation_mats[index].ravel().tolist())
+                )
+                + "\n"
+            )
+            ofile.write(
+                "translation = "
+                + " ".join(map(repr, recon.translation_vecs[index].tolist()))
+                + "\n\n"
+            )
+            ofile.write(
+                "[view]\nid = {}\nname = {}\n".format(index, image_name)
+            )
+        if recon.depth_map_width > 0:
+            depth_map = recon.get_depth_map(index)
+            with open(os.path.join(view_odp, "depth-L0.mvei"), "wb") as ofile:
+                ofile.write(b"\x89MVE_IMAGE\n")
+                ofile.write(
+                    struct.pack(
+                        "<iiii", depth_map.shape[1], depth_map.shape[0], 1, 9
+                    )
+                )
+                ofile.write(depth_map.astype("<f4").tobytes())
+
+    with open(os.path.join(workspace_odp, "synth_0.out"), "w") as ofile:
+        ofile.write("drews 1.0\n")
+        ofile.write(
+            "{} {}\n".format(recon.get_num_cameras(), recon.get_num_points())
+        )
+        for index in range(recon.get_num_cameras()):
+            ofile.write("{!r} 0 0\n".format(recon.focal_length / max_extent))
+            for row in recon.rotation_mats[index]:
+                ofile.write(" ".join(map(repr, row.tolist())) + "\n")
+            ofile.write(
+                " ".join(map(repr, recon.translation_vecs[index].tolist()))
+                + "\n"
+            )
+        track_length = recon.get_track_length()
+        # The measurements consist of the view index, the feature index and
+        # an unused value
+        measurements = np.stack(
+            (
+                recon.track_image_indices,
+                recon.track_feature_indices,
+                np.zeros_like(recon.track_image_indices),
+            ),
+            axis=2,
+        ).reshape(recon.get_num_points(), -1)
+        values = np.concatenate(
+            (
+                _get_point_rows(recon),
+                np.full((recon.get_num_points(), 1), track_length),
+                measurements,
+            ),
+            axis=1,
+        )
+        row_format = "%r %r %r\n%d %d %d\n%d" + " %d %d %d" * track_length
+        _write_rows(ofile, row_format + "\n", values)
+    return workspace_odp
+
+
+def write_open3d_file(recon, ofp):
+    """Write an :code:`Open3D` (:code:`.json` or :code:`.log`) file."""
+    ext = os.path.splitext(ofp)[1].lower()
+    if ext == ".json":
+        # Open3D stores the matrices in column major order
+        intrinsic = {
+            "width": recon.width,
+            "height": recon.height,
+            "intrinsic_matrix": recon.get_calibration_mat().T.ravel().tolist(),
+        }
+        parameters = [
+            {
+                "class_name": "PinholeCameraParameters",
+                "extrinsic": world_to_cam_mat.T.ravel().tolist(),
+                "intrinsic": intrinsic,
+                "version_major": 1,
+                "version_minor": 0,
+            }
+            for world_to_cam_mat in recon.get_4x4_world_to_cam_mats()
+        ]
+        json_data = {
+            "class_name": "PinholeCameraTrajectory",
+            "parameters": parameters,
+            "version_major": 1,
+            "version_minor": 0,
+        }
+        with open(ofp, "w") as ofile:
+            json.dump(json_data, ofile, indent=4)
+    else:
+        assert ext == ".log"
+        num_cameras = recon.get_num_cameras()
+        with open(ofp, "w") as ofile:
+            for index, cam_to_world_mat in enumerate(
+                recon.get_4x4_cam_to_world_mats()
+            ):
+                ofile.write("{} {} {}\n".format(index, index, num_cameras))
+                for row in cam_to_world_mat:
+                    ofile.write(" ".join(map(repr, row.tolist())) + "\n")
+    return ofp
+
+
+def write_point_data_file(recon, ofp):
+    """Write the points as :code:`.ply`, :code:`.las` or ASCII file.
+
+    ASCII files (:code:`.asc`, :code:`.pts` and :code:`.csv`) store one
+    point per line. Writing :code:`.las` files requires :code:`pylas`.
+    """
+    ext = os.path.splitext(ofp)[1].lower()
+    if ext == ".ply":
+        PointDataFileHandler.write_ply_file(ofp, recon.get_point_array())
+    elif ext == ".las":
+        PointDataFileHandler.write_las_file(ofp, recon.get_point_array())
+    else:
+        assert ext in [".asc", ".pts", ".csv"]
+        values = _get_point_rows(recon)
+        with open(ofp, "w") as ofile:
+            if ext == ".csv":
+                row_format = "%r,%r,%r,%d,%d,%d\n"
+            else:
+                ofile.write("//X Y Z R G B\n")
+                row_format = "%r %r %r %d %d %d\n"
+            _write_rows(ofile, row_format, values)
+    return ofp
@@ -39,44 +39,61 @@ bl_info = {
     "category": "Import-Export",
 }
 
-import bpy
-
-# load and reload submodules
-############################
-
-import importlib
-from .utility import developer_utility
-
-importlib.reload(developer_utility)
-modules = developer_utility.setup_addon_modules(
-    __path__, __name__, "bpy" in locals()
-)
+try:
+    import bpy
+except ImportError:
+    # Allows to use the file handlers (e.g. in benchmarks) without Blender
+    bpy = None
+
+if bpy is not None:
+    # load and reload submodules
+    ############################
+
+    import importlib
+    from .utility import developer_utility
+
+    importlib.reload(developer_utility)
+    modules = developer_utility.setup_addon_modules(
+        __path__, __name__, "bpy" in locals()
+    )
 
-# The root dir is Blenders addon folder.
-# Therefore, we need the "photogrammetry_importer" specifier for this addon
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+    # The root dir is Blenders addon folder.
+    # Therefore, we need the "photogrammetry_importer" specifier for this addon
+    from photogrammetry_importer.utility.logging_utility import (
+        set_log_handler,
+    )
+    from photogrammetry_importer.utility.blender_logging_utility import (
+        log_report,
+    )
 
-from photogrammetry_importer.preferences.addon_preferences import (
-    PhotogrammetryImporterPreferences,
-)
+    from photogrammetry_importer.preferences.addon_preferences import (
+        PhotogrammetryImporterPreferences,
+    )
 
-from photogrammetry_importer.registration.registration import (
-    register_importers,
-    unregister_importers,
-    register_exporters,
-    unregister_exporters,
-)
+    from photogrammetry_importer.registration.registration import (
+        register_importers,
+        unregister_importers,
+        register_exporters,
+        unregister_exporters,
+    )
 
-from photogrammetry_importer.panels.view_3d_panel import OpenGLPanel
-from photogrammetry_importer.utility.blender_opengl_utility import (
-    redraw_points,
-)
+    from photogrammetry_importer.panels.view_3d_panel import OpenGLPanel
+    from photogrammetry_importer.utility.blender_opengl_utility import (
+        redraw_points,
+    )
+    from photogrammetry_importer.utility.blender_camera_utility import (
+        restore_missing_image_proxies,
+    )
 
-bpy.app.handlers.load_post.append(redraw_points)
+    bpy.app.handlers.load_post.append(redraw_points)
+    bpy.app.handlers.load_post.append(restore_missing_image_proxies)
 
 
 def register():
     """ Register importers, exporters and panels. """
+    # Show the messages of the file handlers also in Blender's info area
+    set_log_handler(log_report)
+
     bpy.utils.register_class(PhotogrammetryImporterPreferences)
 
     import_export_prefs = bpy.context.preferences.addons[__name__].preferences
@@ -101,6 +118,7 @@ def unregister():
     bpy.utils.unregister_class(OpenGLPanel)
 
     log_report("INFO", "Unregistered {}".format(bl_info["name"]))
+    set_log_handler(None)
 
 
 if __name__ == "__main__":
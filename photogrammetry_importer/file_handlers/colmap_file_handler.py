@@ -4,18 +4,29 @@ import numpy as np
 from photogrammetry_importer.ext.read_dense import read_array
 from photogrammetry_importer.ext.read_write_model import (
     read_model,
-    write_model,
+    write_cameras_text,
+    write_cameras_binary,
+    write_images_text,
+    write_images_binary,
     Camera as ColmapCamera,
     Image as ColmapImage,
-    Point3D as ColmapPoint3D,
 )
 
 from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_array import CameraArray
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.utility.blender_camera_utility import (
+from photogrammetry_importer.types.point_array import PointArray
+from photogrammetry_importer.utility.camera_utility import (
     check_radial_distortion,
 )
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_span,
+    increment_counter,
+    count_bytes_read,
+)
+from photogrammetry_importer.utility.os_utility import is_file
+from photogrammetry_importer.utility.stop_watch import StopWatch
 
 # From photogrammetry_importer\ext\read_write_model.py
 # CAMERA_MODELS = {
@@ -49,6 +60,11 @@ from photogrammetry_importer.utility.blender_logging_utility import log_report
 class ColmapFileHandler:
     """Class to read and write :code:`Colmap` models and workspaces."""
 
+    # The default settings in Colmap show only points with more than 3
+    # observations, i.e. each exported point gets a track with the
+    # (IMAGE_ID, POINT2D_IDX) pairs (0, 0), (1, 1) and (2, 2)
+    _default_point_track = np.array([[0, 0], [1, 1], [2, 2]], dtype=np.int32)
+
     @staticmethod
     def _parse_camera_param_list(cam):
         name = cam.model
@@ -110,14 +126,20 @@ class ColmapFileHandler:
         #   BaseImage = collections.namedtuple(
         #       "Image", ["id", "qvec", "tvec", "camera_id", "name", "xys", "point3D_ids"])
 
-        cameras = []
-        for col_image in id_to_col_images.values():
-            current_camera = Camera()
+        col_images = list(id_to_col_images.values())
+        # Compute the poses of all cameras at once
+        camera_array = CameraArray(len(col_images))
+        camera_array.set_quaternions(
+            np.array([col_image.qvec for col_image in col_images])
+        )
+        camera_array.set_camera_translation_vectors_after_rotation(
+            np.array([col_image.tvec for col_image in col_images])
+        )
+
+        cameras = camera_array.get_cameras()
+        for index, col_image in enumerate(col_images):
+            current_camera = cameras[index]
             current_camera.id = col_image.id
-            current_camera.set_quaternion(col_image.qvec)
-            current_camera.set_camera_translation_vector_after_rotation(
-                col_image.tvec
-            )
 
             current_camera.image_fp_type = image_fp_type
             current_camera.image_dp = image_dp
@@ -148,12 +170,11 @@ class ColmapFileHandler:
             if not suppress_distortion_warnings:
                 check_radial_distortion(r, current_camera._relative_fp, op)
 
-            camera_calibration_matrix = np.array(
-                [[fx, skew, cx], [0, fy, cy], [0, 0, 1]]
-            )
-            current_camera.set_calibration(
-                camera_calibration_matrix, radial_distortion=0
-            )
+            camera_array.calibration_mats[index] = [
+                [fx, skew, cx],
+                [0, fy, cy],
+                [0, 0, 1],
+            ]
 
             if depth_map_idp is not None:
                 geometric_ifp = os.path.join(
@@ -162,9 +183,9 @@ class ColmapFileHandler:
                 photometric_ifp = os.path.join(
                     depth_map_idp, col_image.name + ".photometric.bin"
                 )
-                if os.path.isfile(geometric_ifp):
+                if is_file(geometric_ifp):
                     depth_map_ifp = geometric_ifp
-                elif os.path.isfile(photometric_ifp):
+                elif is_file(photometric_ifp):
                     depth_map_ifp = photometric_ifp
                 else:
                     depth_map_ifp = None
@@ -174,7 +195,6 @@ class ColmapFileHandler:
                     Camera.DEPTH_MAP_WRT_CANONICAL_VECTORS,
                     shift_depth_map_to_pixel_center=False,
                 )
-            cameras.append(current_camera)
         return cameras
 
     @staticmethod
@@ -243,21 +263,34 @@ class ColmapFileHandler:
 
         # cameras represent information about the camera model
         # images contain pose information
-        id_to_col_cameras, id_to_col_images, id_to_col_points3D = read_model(
-            model_idp, ext=ext
-        )
-
-        cameras = ColmapFileHandler._convert_cameras(
-            id_to_col_cameras,
-            id_to_col_images,
-            image_dp,
-            image_fp_type,
-            depth_map_idp,
-            suppress_distortion_warnings,
-            op,
-        )
+        with profile_span("Read Model"):
+            count_bytes_read(
+                *[
+                    os.path.join(model_idp, name + ext)
+                    for name in ["cameras", "images", "points3D"]
+                ]
+            )
+            (
+                id_to_col_cameras,
+                id_to_col_images,
+                id_to_col_points3D,
+            ) = read_model(model_idp, ext=ext)
+
+        with profile_span("Convert Cameras"):
+            cameras = ColmapFileHandler._convert_cameras(
+                id_to_col_cameras,
+                id_to_col_images,
+                image_dp,
+                image_fp_type,
+                depth_map_idp,
+                suppress_distortion_warnings,
+                op,
+            )
+            increment_counter("cameras", len(cameras))
 
-        points3D = ColmapFileHandler._convert_points(id_to_col_points3D)
+        with profile_span("Convert Points"):
+            points3D = ColmapFileHandler._convert_points(id_to_col_points3D)
+            increment_counter("points", len(points3D))
 
         return cameras, points3D
 
@@ -318,9 +351,76 @@ class ColmapFileHandler:
         return cameras, points, mesh_ifp
 
     @staticmethod
-    def write_colmap_model(odp, cameras, points, op=None):
-        """Write cameras and points as :code:`Colmap` model."""
+    def _get_points3D_binary_dtype(track_length):
+        # Record layout of a point in points3D.bin (without padding)
+        return np.dtype(
+            [
+                ("id", "<u8"),
+                ("xyz", "<f8", (3,)),
+                ("rgb", "u1", (3,)),
+                ("error", "<f8"),
+                ("track_length", "<u8"),
+                ("track", "<i4", (track_length, 2)),
+            ]
+        )
+
+    @staticmethod
+    def _write_points3D_binary(point_array, ofp, block_size=1000000):
+        track = ColmapFileHandler._default_point_track
+        dtype = ColmapFileHandler._get_points3D_binary_dtype(len(track))
+        num_points = len(point_array)
+        with open(ofp, "wb") as ofile:
+            ofile.write(np.array([num_points], dtype="<u8").tobytes())
+            for start in range(0, num_points, block_size):
+                end = min(start + block_size, num_points)
+                records = np.empty(end - start, dtype=dtype)
+                records["id"] = point_array.ids[start:end]
+                records["xyz"] = point_array.coords[start:end]
+                records["rgb"] = point_array.colors[start:end]
+                records["error"] = 0
+                records["track_length"] = len(track)
+                records["track"] = track
+                ofile.write(records.tobytes())
+
+    @staticmethod
+    def _write_points3D_text(point_array, ofp, block_size=100000):
+        track = ColmapFileHandler._default_point_track
+        num_points = len(point_array)
+        # POINT3D_ID, X, Y, Z, R, G, B, ERROR, TRACK[]
+        row_format = "%d %.17g %.17g %.17g %d %d %d 0"
+        row_format += " %d %d" * len(track) % tuple(track.ravel())
+        row_format += "\n"
+        with open(ofp, "w") as ofile:
+            ofile.write(
+                "# 3D point list with one line of data per point:\n"
+                + "#   POINT3D_ID, X, Y, Z, R, G, B, ERROR,"
+                + " TRACK[] as (IMAGE_ID, POINT2D_IDX)\n"
+                + "# Number of points: "
+                + str(num_points)
+                + ", mean track length: "
+                + str(len(track))
+                + "\n"
+            )
+            for start in range(0, num_points, block_size):
+                end = min(start + block_size, num_points)
+                ids = point_array.ids[start:end]
+                coords = point_array.coords[start:end]
+                colors = point_array.colors[start:end]
+                values = np.empty((end - start, 7), dtype=object)
+                values[:, 0] = ids.tolist()
+                values[:, 1:4] = coords.tolist()
+                values[:, 4:7] = colors.tolist()
+                # Format all rows of the block with a single operation
+                ofile.write(row_format * (end - start) % tuple(values.ravel()))
+
+    @staticmethod
+    def write_colmap_model(odp, cameras, points, ext=".txt", op=None):
+        """Write cameras and points as :code:`Colmap` model.
+
+        :param ext: Either ".txt" (text files) or ".bin" (binary files).
+        """
         log_report("INFO", "Write Colmap model folder: " + odp, op)
+        assert ext in [".txt", ".bin"]
 
         if not os.path.isdir(odp):
             os.mkdir(odp)
@@ -332,8 +432,6 @@ class ColmapFileHandler:
         #       "Camera", ["id", "model", "width", "height", "params"])
         #   BaseImage = collections.namedtuple(
         #       "Image", ["id", "qvec", "tvec", "camera_id", "name", "xys", "point3D_ids"])
-        #   Point3D = collections.namedtuple(
-        #       "Point3D", ["id", "xyz", "rgb", "error", "image_ids", "point2D_idxs"])
 
         colmap_cams = {}
         colmap_images = {}
@@ -363,20 +461,20 @@ class ColmapFileHandler:
             )
             colmap_images[cam.id] = colmap_image
 
-        colmap_points3D = {}
-        for point in points:
-            colmap_point = ColmapPoint3D(
-                id=point.id,
-                xyz=point.coord,
-                rgb=point.color,
-                error=0,
-                # The default settings in Colmap show only points with more than
-                # 3 observations
-                image_ids=[0, 1, 2],
-                point2D_idxs=[0, 1, 2],
-            )
-            colmap_points3D[point.id] = colmap_point
-
-        write_model(
-            colmap_cams, colmap_images, colmap_points3D, odp, ext=".txt"
+        point_array = PointArray.from_points(points)
+        log_report("INFO", "Writing " + str(len(point_array)) + " points", op)
+        stop_watch = StopWatch()
+        cameras_ofp = os.path.join(odp, "cameras" + ext)
+        images_ofp = os.path.join(odp, "images" + ext)
+        points_ofp = os.path.join(odp, "points3D" + ext)
+        if ext == ".bin":
+            write_cameras_binary(colmap_cams, cameras_ofp)
+            write_images_binary(colmap_images, images_ofp)
+            ColmapFileHandler._write_points3D_binary(point_array, points_ofp)
+        else:
+            write_cameras_text(colmap_cams, cameras_ofp)
+            write_images_text(colmap_images, images_ofp)
+            ColmapFileHandler._write_points3D_text(point_array, points_ofp)
+        log_report(
+            "INFO", "Duration: " + str(stop_watch.get_elapsed_time()), op
         )
@@ -1,5 +1,6 @@
 import os
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+import struct
+from photogrammetry_importer.utility.logging_utility import log_report
 
 try:
     from PIL import Image as _PILImage
@@ -7,9 +8,80 @@ except ImportError:
     _PILImage = None
 
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Start of frame markers (excluding DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a segment (TEM, RST0-RST7, SOI and EOI)
+_JPEG_STANDALONE_MARKERS = frozenset([0x01] + list(range(0xD0, 0xDA)))
+
+
 class ImageFileHandler:
     """Class to read and write images using :code:`Pillow`."""
 
+    @staticmethod
+    def _read_png_size(image_file):
+        header = image_file.read(24)
+        if len(header) < 24 or header[12:16] != b"IHDR":
+            return None
+        return struct.unpack(">II", header[16:24])
+
+    @staticmethod
+    def _read_jpeg_size(image_file):
+        image_file.seek(2)
+        while True:
+            byte = image_file.read(1)
+            if not byte:
+                return None
+            if byte != b"\xff":
+                continue
+            marker = image_file.read(1)
+            # Skip fill bytes
+            while marker == b"\xff":
+                marker = image_file.read(1)
+            if not marker:
+                return None
+            marker = ord(marker)
+            if marker in _JPEG_STANDALONE_MARKERS:
+                continue
+            segment_length_bytes = image_file.read(2)
+            if len(segment_length_bytes) < 2:
+                return None
+            segment_length = struct.unpack(">H", segment_length_bytes)[0]
+            if marker in _JPEG_SOF_MARKERS:
+                sof_data = image_file.read(5)
+                if len(sof_data) < 5:
+                    return None
+                # The segment contains precision, height and width
+                height, width = struct.unpack(">HH", sof_data[1:5])
+                return width, height
+            image_file.seek(segment_length - 2, os.SEEK_CUR)
+
+    @staticmethod
+    def read_image_size_from_header(image_ifp):
+        """Read the image size from the file header.
+
+        The header of :code:`.png` and :code:`.jpg` files is parsed directly,
+        other formats are opened (lazily) with :code:`Pillow`. Returns
+        :code:`None`, if the size could not be determined.
+        """
+        try:
+            with open(image_ifp, "rb") as image_file:
+                signature = image_file.read(8)
+                image_file.seek(0)
+                size = None
+                if signature == _PNG_SIGNATURE:
+                    size = ImageFileHandler._read_png_size(image_file)
+                elif signature[0:2] == b"\xff\xd8":
+                    size = ImageFileHandler._read_jpeg_size(image_file)
+                if size is not None:
+                    return size
+            if _PILImage is not None:
+                with _PILImage.open(image_ifp) as image:
+                    return image.size
+        except (OSError, struct.error):
+            pass
+        return None
+
     @staticmethod
     def read_image_size(image_ifp, default_width, default_height, op=None):
         """Read image size from disk."""
@@ -1,13 +1,58 @@
-import json
 import numpy as np
 import os
 
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.utility.blender_camera_utility import (
+from photogrammetry_importer.utility.camera_utility import (
     check_radial_distortion,
 )
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.json_utility import (
+    JSONStreamReader,
+    load_json,
+    use_json_streaming,
+)
+from photogrammetry_importer.utility.profiling_utility import count_bytes_read
+
+
+class MeshroomSfMIndex:
+    """Class to look up the elements of a :code:`Meshroom` SfM file by id.
+
+    The dictionaries are created once per file, which avoids linear scans of
+    the views, intrinsics and poses.
+    """
+
+    def __init__(self, json_data):
+        self.view_id_to_view = {}
+        self.pose_id_to_view = {}
+        for view in json_data.get("views", []):
+            self.view_id_to_view.setdefault(int(view["viewId"]), view)
+            self.pose_id_to_view.setdefault(int(view["poseId"]), view)
+        self.intrinsic_id_to_intrinsic = {}
+        for intrinsic in json_data.get("intrinsics", []):
+            self.intrinsic_id_to_intrinsic.setdefault(
+                int(intrinsic["intrinsicId"]), intrinsic
+            )
+        self.pose_id_to_pose = {}
+        for pose in json_data.get("poses", []):
+            self.pose_id_to_pose.setdefault(int(pose["poseId"]), pose)
+        # Filled while parsing the cameras
+        self.pose_id_to_camera_index = {}
+
+    def get_view_by_pose_id(self, pose_id):
+        """Return the view corresponding to the given pose id."""
+        return self.pose_id_to_view[pose_id]
+
+    def get_intrinsic(self, intrinsic_id):
+        """Return the intrinsic with the given id."""
+        return self.intrinsic_id_to_intrinsic[intrinsic_id]
+
+    def get_camera_index(self, view_id):
+        """Return the index of the camera observed in the view (or None)."""
+        view = self.view_id_to_view.get(int(view_id))
+        if view is None:
+            return None
+        return self.pose_id_to_camera_index.get(int(view["poseId"]))
 
 
 class MeshroomFileHandler:
@@ -15,23 +60,17 @@ class MeshroomFileHandler:
 
     # Note: *.SfM files are actually just *.JSON files.
 
-    @staticmethod
-    def _get_element(data_list, id_string, query_id):
-        result = None
-        for ele in data_list:
-            if int(ele[id_string]) == query_id:
-                result = ele
-                break
-        assert result is not None
-        return result
-
     @staticmethod
     def _parse_cameras_from_json_data(
-        json_data, image_dp, image_fp_type, suppress_distortion_warnings, op
+        json_data,
+        sfm_index,
+        image_dp,
+        image_fp_type,
+        suppress_distortion_warnings,
+        op,
     ):
 
         cams = []
-        image_index_to_camera_index = {}
 
         is_valid_file = (
             "views" in json_data
@@ -46,10 +85,8 @@ class MeshroomFileHandler:
                 + " SfM reconstruction results: view, intrinsics and poses.",
                 op,
             )
-            return cams, image_index_to_camera_index
+            return cams
 
-        views = json_data["views"]  # is a list of dicts (view)
-        intrinsics = json_data["intrinsics"]  # is a list of dicts (intrinsic)
         extrinsics = json_data["poses"]  # is a list of dicts (extrinsic)
 
         # IMPORTANT:
@@ -61,11 +98,9 @@ class MeshroomFileHandler:
 
             camera = Camera()
             view_index = int(extrinsic["poseId"])
-            image_index_to_camera_index[view_index] = rec_index
+            sfm_index.pose_id_to_camera_index[view_index] = rec_index
 
-            corresponding_view = MeshroomFileHandler._get_element(
-                views, "poseId", view_index
-            )
+            corresponding_view = sfm_index.get_view_by_pose_id(view_index)
 
             camera.image_fp_type = image_fp_type
             camera.image_dp = image_dp
@@ -85,9 +120,7 @@ class MeshroomFileHandler:
             camera.height = int(corresponding_view["height"])
             id_intrinsic = int(corresponding_view["intrinsicId"])
 
-            intrinsic_params = MeshroomFileHandler._get_element(
-                intrinsics, "intrinsicId", id_intrinsic
-            )
+            intrinsic_params = sfm_index.get_intrinsic(id_intrinsic)
 
             focal_length = float(intrinsic_params["pxFocalLength"])
             cx = float(intrinsic_params["principalPoint"][0])
@@ -128,12 +161,19 @@ class MeshroomFileHandler:
             camera.view_index = view_index
 
             cams.append(camera)
-        return cams, image_index_to_camera_index
+        return cams
 
     @staticmethod
-    def _parse_points_from_json_data(
-        json_data, image_index_to_camera_index, op
-    ):
+    def _convert_json_point(json_point):
+        return Point(
+            coord=np.array(json_point["X"], dtype=float),
+            color=np.array(json_point["color"], dtype=int),
+            id=int(json_point["landmarkId"]),
+            scalars=[],
+        )
+
+    @staticmethod
+    def _parse_points_from_json_data(json_data, sfm_index, op):
 
         points = []
         is_valid_file = "structure" in json_data
@@ -149,15 +189,28 @@ class MeshroomFileHandler:
 
         structure = json_data["structure"]
         for json_point in structure:
-            custom_point = Point(
-                coord=np.array(json_point["X"], dtype=float),
-                color=np.array(json_point["color"], dtype=int),
-                id=int(json_point["landmarkId"]),
-                scalars=[],
-            )
-            points.append(custom_point)
+            points.append(MeshroomFileHandler._convert_json_point(json_point))
         return points
 
+    @staticmethod
+    def _read_sfm_file_streamed(sfm_ifp, op):
+        # Convert the points (which dominate the file size) while reading the
+        # file. The remaining data is kept as objects.
+        log_report("INFO", "Reading the file incrementally", op)
+        points = []
+
+        def convert_json_points(json_stream_reader):
+            for json_point in json_stream_reader.iter_array_values():
+                points.append(
+                    MeshroomFileHandler._convert_json_point(json_point)
+                )
+
+        with open(sfm_ifp, "r", encoding="utf-8") as sfm_file:
+            json_data = JSONStreamReader(sfm_file).read_object(
+                {"structure": convert_json_points}
+            )
+        return json_data, points
+
     @staticmethod
     def parse_sfm_file(
         sfm_ifp,
@@ -174,25 +227,30 @@ class MeshroomFileHandler:
         """
         log_report("INFO", "parse_sfm_file: ...", op)
         log_report("INFO", "sfm_ifp: " + sfm_ifp, op)
-        input_file = open(sfm_ifp, "r")
-        json_data = json.load(input_file)
+        if use_json_streaming(sfm_ifp):
+            json_data, points = MeshroomFileHandler._read_sfm_file_streamed(
+                sfm_ifp, op
+            )
+        else:
+            json_data = load_json(sfm_ifp)
+            points = None
 
-        (
-            cams,
-            image_index_to_camera_index,
-        ) = MeshroomFileHandler._parse_cameras_from_json_data(
+        sfm_index = MeshroomSfMIndex(json_data)
+        cams = MeshroomFileHandler._parse_cameras_from_json_data(
             json_data,
+            sfm_index,
             image_idp,
             image_fp_type,
             suppress_distortion_warnings,
             op,
         )
-        if "structure" in json_data:
-            points = MeshroomFileHandler._parse_points_from_json_data(
-                json_data, image_index_to_camera_index, op
-            )
-        else:
-            points = []
+        if points is None:
+            if "structure" in json_data:
+                points = MeshroomFileHandler._parse_points_from_json_data(
+                    json_data, sfm_index, op
+                )
+            else:
+                points = []
         log_report("INFO", "parse_sfm_file: Done", op)
         return cams, points
 
@@ -268,7 +326,7 @@ class MeshroomFileHandler:
         """Parse a :code:`Meshroom` project file (:code:`.mg`)."""
 
         cache_dp = os.path.join(os.path.dirname(mg_fp), "MeshroomCache")
-        json_data = json.load(open(mg_fp, "r"))
+        json_data = load_json(mg_fp)
         json_graph = json_data["graph"]
 
         if sfm_node_type == "ConvertSfMFormatNode":
@@ -406,6 +464,7 @@ class MeshroomFileHandler:
         Supported file formats are :code:`.mg`, :code:`.sfm` or :code:`.json`.
         """
         log_report("INFO", "parse_meshroom_file: ...", op)
+        count_bytes_read(meshroom_ifp)
         log_report("INFO", "meshroom_ifp: " + meshroom_ifp, op)
 
         ext = os.path.splitext(meshroom_ifp)[1].lower()
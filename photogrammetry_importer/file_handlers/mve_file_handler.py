@@ -7,13 +7,17 @@ import struct
 from photogrammetry_importer.file_handlers.image_file_handler import (
     ImageFileHandler,
 )
-from photogrammetry_importer.utility.os_utility import get_subdirs
-from photogrammetry_importer.utility.blender_camera_utility import (
+from photogrammetry_importer.utility.os_utility import get_subdirs, is_file
+from photogrammetry_importer.utility.image_size_utility import (
+    probe_image_sizes,
+)
+from photogrammetry_importer.utility.camera_utility import (
     check_radial_distortion,
 )
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.utility.profiling_utility import count_bytes_read
 
 
 class MVEFileHandler:
@@ -176,18 +180,25 @@ class MVEFileHandler:
         """Parse the :code:`views` directory in the :code:`MVE` workspace."""
         cameras = []
         subdirs = get_subdirs(views_idp)
+        fp_to_size = probe_image_sizes(
+            [os.path.join(subdir, "undistorted.png") for subdir in subdirs],
+            op=op,
+        )
         for subdir in subdirs:
             folder_name = os.path.basename(subdir)
             # folder_name = view_0000.mve
             camera_name = folder_name.split("_")[1].split(".")[0]
             undistorted_img_ifp = os.path.join(subdir, "undistorted.png")
-            success, width, height = ImageFileHandler.read_image_size(
-                undistorted_img_ifp,
-                default_width=default_width,
-                default_height=default_height,
-                op=op,
-            )
-            assert success
+            if fp_to_size[undistorted_img_ifp] is not None:
+                width, height = fp_to_size[undistorted_img_ifp]
+            else:
+                success, width, height = ImageFileHandler.read_image_size(
+                    undistorted_img_ifp,
+                    default_width=default_width,
+                    default_height=default_height,
+                    op=op,
+                )
+                assert success
 
             meta_ifp = os.path.join(subdir, "meta.ini")
             camera = MVEFileHandler.parse_meta(
@@ -199,7 +210,7 @@ class MVEFileHandler:
                     depth_ifp = os.path.join(
                         subdir, "depth-L" + str(level) + ".mvei"
                     )
-                    if os.path.isfile(depth_ifp):
+                    if is_file(depth_ifp):
                         camera.set_depth_map(
                             depth_ifp,
                             MVEFileHandler.read_depth_map,
@@ -229,6 +240,7 @@ class MVEFileHandler:
         log_report("INFO", workspace_idp, op)
         views_idp = os.path.join(workspace_idp, "views")
         synth_ifp = os.path.join(workspace_idp, "synth_0.out")
+        count_bytes_read(synth_ifp)
         cameras = MVEFileHandler.parse_views(
             views_idp,
             default_width,
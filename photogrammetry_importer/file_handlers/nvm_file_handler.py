@@ -2,12 +2,18 @@ import os
 from collections import defaultdict
 import numpy as np
 
-from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_array import CameraArray
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.utility.blender_camera_utility import (
+from photogrammetry_importer.types.point_array import PointArray
+from photogrammetry_importer.utility.camera_utility import (
     check_radial_distortion,
 )
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.stop_watch import StopWatch
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+    count_bytes_read,
+)
 
 
 class NVMFileHandler:
@@ -19,6 +25,7 @@ class NVMFileHandler:
     # pba/src/pba/util.h
 
     @staticmethod
+    @profile_function("Parse Cameras")
     def _parse_cameras(
         input_file,
         num_cameras,
@@ -43,7 +50,8 @@ class NVMFileHandler:
         therefore, the y and z axis of the TRANSLATION VECTOR are also inverted
         """
         # log_report('INFO', '_parse_cameras: ...', op)
-        cameras = []
+        camera_array = CameraArray(num_cameras)
+        relative_paths = []
 
         for i in range(num_cameras):
             line = input_file.readline()
@@ -55,21 +63,8 @@ class NVMFileHandler:
             relative_path = line_values[0].replace("/", os.sep)
             focal_length = float(line_values[1])
 
-            quaternion_w = float(line_values[2])
-            quaternion_x = float(line_values[3])
-            quaternion_y = float(line_values[4])
-            quaternion_z = float(line_values[5])
-            quaternion = np.array(
-                [quaternion_w, quaternion_x, quaternion_y, quaternion_z],
-                dtype=float,
-            )
-
-            camera_center_x = float(line_values[6])
-            camera_center_y = float(line_values[7])
-            camera_center_z = float(line_values[8])
-            center_vec = np.array(
-                [camera_center_x, camera_center_y, camera_center_z]
-            )
+            camera_array.quaternions[i] = line_values[2:6]
+            camera_array.centers[i] = line_values[6:9]
 
             radial_distortion = float(line_values[9])
             if not suppress_distortion_warnings:
@@ -85,43 +80,33 @@ class NVMFileHandler:
             zero_value = float(line_values[10])
             assert zero_value == 0
 
-            current_camera = Camera()
-            # Setting the quaternion also sets the rotation matrix
-            current_camera.set_quaternion(quaternion)
-
-            # Set the camera center after rotation
-            current_camera._center = center_vec
-
-            # set the camera view direction as normal w.r.t world coordinates
-            cam_view_vec_cam_coord = np.array([0, 0, 1]).T
-            cam_rotation_matrix_inv = np.linalg.inv(
-                current_camera.get_rotation_mat()
-            )
-            cam_view_vec_world_coord = cam_rotation_matrix_inv.dot(
-                cam_view_vec_cam_coord
-            )
-            current_camera.normal = cam_view_vec_world_coord
+            camera_array.calibration_mats[i] = camera_calibration_matrix
+            camera_array.radial_distortions[i] = radial_distortion
+            relative_paths.append(relative_path)
 
-            translation_vec = NVMFileHandler._compute_translation_vector(
-                center_vec, current_camera.get_rotation_mat()
-            )
-            current_camera._translation_vec = translation_vec
+        # Setting the quaternions also sets the rotation matrices
+        camera_array.set_quaternions(camera_array.quaternions)
+        # Set the camera centers after rotation (this also computes the
+        # translation vectors)
+        camera_array.set_camera_centers_after_rotation(
+            camera_array.centers, check_rotation=False
+        )
 
-            current_camera.set_calibration(
-                camera_calibration_matrix, radial_distortion=radial_distortion
-            )
-            # log_report('INFO', 'Calibration mat:', op)
-            # log_report('INFO', str(camera_calibration_matrix), op)
+        # set the camera view direction as normal w.r.t world coordinates
+        normals = camera_array.get_view_directions()
 
+        cameras = camera_array.get_cameras()
+        for i, current_camera in enumerate(cameras):
+            current_camera.normal = normals[i]
             current_camera.image_fp_type = image_fp_type
             current_camera.image_dp = image_dp
-            current_camera._relative_fp = relative_path
+            current_camera._relative_fp = relative_paths[i]
             current_camera.id = i
-            cameras.append(current_camera)
         # log_report('INFO', '_parse_cameras: Done', op)
         return cameras
 
     @staticmethod
+    @profile_function("Parse Points")
     def _parse_nvm_points(input_file, num_3D_points):
 
         points = []
@@ -173,6 +158,7 @@ class NVMFileHandler:
     ):
         """Parse a :code:`VisualSfM` (:code:`.nvm`) file."""
         log_report("INFO", "Parse NVM file: " + input_visual_fsm_file_name, op)
+        count_bytes_read(input_visual_fsm_file_name)
         input_file = open(input_visual_fsm_file_name, "r")
         # Documentation of *.NVM data format
         # http://ccwu.me/vsfm/doc.html#nvm
@@ -269,104 +255,103 @@ class NVMFileHandler:
 
     @staticmethod
     def _nvm_line(content):
-        return content + " " + os.linesep
+        return (content + " " + os.linesep).encode()
+
+    @staticmethod
+    def _write_nvm_points(output_file, point_array, block_size=100000):
+        # From the VSFM docs:
+        # <Point>  = <XYZ> <RGB> <number of measurements> <List of Measurements>
+        # Each point gets two dummy measurements
+        # <Measurement> = <Image index> <Feature Index> <xy>
+        row_format = (
+            "%r %r %r %d %d %d 2 0 0 0.0 0.0 0 0 0.0 0.0 " + os.linesep
+        )
+        num_points = len(point_array)
+        for start in range(0, num_points, block_size):
+            end = min(start + block_size, num_points)
+            values = np.empty((end - start, 6), dtype=object)
+            values[:, 0:3] = point_array.coords[start:end].tolist()
+            values[:, 3:6] = point_array.colors[start:end].tolist()
+            # Format all rows of the block with a single operation
+            block_str = row_format * (end - start) % tuple(values.ravel())
+            output_file.write(block_str.encode())
 
     @staticmethod
     def write_nvm_file(output_nvm_file_name, cameras, points, op=None):
-        """Write cameras and points as :code:`.nvm` file."""
+        """Write cameras and points as :code:`.nvm` file.
+
+        The content is streamed to the file, i.e. the points are formatted
+        and written in blocks.
+        """
 
         log_report("INFO", "Write NVM file: " + output_nvm_file_name, op)
+        stop_watch = StopWatch()
+
+        with open(output_nvm_file_name, "wb") as output_file:
+            nvm_line = NVMFileHandler._nvm_line
 
-        nvm_content = []
-        nvm_content.append(
-            NVMFileHandler._nvm_line(
-                NVMFileHandler._create_nvm_first_line(cameras, op)
+            output_file.write(
+                nvm_line(NVMFileHandler._create_nvm_first_line(cameras, op))
+            )
+            output_file.write(nvm_line(""))
+            amount_cameras = len(cameras)
+            output_file.write(nvm_line(str(amount_cameras)))
+            log_report(
+                "INFO",
+                "Amount Cameras (Images in NVM file):" + str(amount_cameras),
+                op,
             )
-        )
-        nvm_content.append(NVMFileHandler._nvm_line(""))
-        amount_cameras = len(cameras)
-        nvm_content.append(NVMFileHandler._nvm_line(str(amount_cameras)))
-        log_report(
-            "INFO",
-            "Amount Cameras (Images in NVM file):" + str(amount_cameras),
-            op,
-        )
 
-        # Write the camera section
-        # From the VSFM docs:
-        # <Camera> = <File name> <focal length> <quaternion WXYZ> <camera center> <radial distortion> 0
+            # Write the camera section
+            # From the VSFM docs:
+            # <Camera> = <File name> <focal length> <quaternion WXYZ> <camera center> <radial distortion> 0
 
-        for camera in cameras:
-            quaternion = camera.get_quaternion()
+            for camera in cameras:
+                quaternion = camera.get_quaternion()
 
-            current_line = camera.get_relative_fp()
-            current_line += "\t" + str(camera.get_calibration_mat()[0][0])
-            current_line += " " + " ".join(list(map(str, quaternion)))
-            current_line += " " + " ".join(
-                list(map(str, camera.get_camera_center()))
+                current_line = camera.get_relative_fp()
+                current_line += "\t" + str(camera.get_calibration_mat()[0][0])
+                current_line += " " + " ".join(list(map(str, quaternion)))
+                current_line += " " + " ".join(
+                    list(map(str, camera.get_camera_center()))
+                )
+                current_line += " " + "0"  # TODO USE RADIAL DISTORTION
+                current_line += " " + "0"
+                output_file.write(nvm_line(current_line))
+
+            output_file.write(nvm_line(""))
+            point_array = PointArray.from_points(points)
+            number_points = len(point_array)
+            output_file.write(nvm_line(str(number_points)))
+            log_report(
+                "INFO", "Found " + str(number_points) + " object points", op
             )
-            current_line += " " + "0"  # TODO USE RADIAL DISTORTION
-            current_line += " " + "0"
-            nvm_content.append(current_line + " " + os.linesep)
-
-        nvm_content.append(" " + os.linesep)
-        number_points = len(points)
-        nvm_content.append(str(number_points) + " " + os.linesep)
-        log_report(
-            "INFO", "Found " + str(number_points) + " object points", op
-        )
 
-        num_features = 2
-        image_idx = 0
-        feature_idx = 0
-        x = 0.0
-        y = 0.0
+            NVMFileHandler._write_nvm_points(output_file, point_array)
 
-        for point in points:
-            # From the VSFM docs:
-            # <Point>  = <XYZ> <RGB> <number of measurements> <List of Measurements>
-            current_line = " ".join(list(map(str, point.coord)))
-            current_line += " " + " ".join(list(map(str, point.color)))
-
-            # current_line += ' ' + str(len(point.measurements))
-            # for measurement in point.measurements:
-            #     current_line += ' ' + str(measurement)
-            current_line += " " + str(num_features)
-            for feature in range(num_features):
-                current_line += (
-                    " "
-                    + str(image_idx)
-                    + " "
-                    + str(feature_idx)
-                    + " "
-                    + str(x)
-                    + " "
-                    + str(y)
+            output_file.write(nvm_line(""))
+            output_file.write(nvm_line(""))
+            output_file.write(nvm_line(""))
+            output_file.write(("0" + os.linesep).encode())
+            output_file.write(nvm_line(""))
+            output_file.write(
+                nvm_line("#the last part of NVM file points to the PLY files")
+            )
+            output_file.write(
+                nvm_line(
+                    "#the first number is the number of associated PLY files"
                 )
+            )
+            output_file.write(
+                nvm_line(
+                    "#each following number gives a model-index that has PLY"
+                )
+            )
+            output_file.write(("0" + os.linesep).encode())
 
-            nvm_content.append(current_line + " " + os.linesep)
-
-        nvm_content.append(" " + os.linesep)
-        nvm_content.append(" " + os.linesep)
-        nvm_content.append(" " + os.linesep)
-        nvm_content.append("0" + os.linesep)
-        nvm_content.append(" " + os.linesep)
-        nvm_content.append(
-            "#the last part of NVM file points to the PLY files " + os.linesep
-        )
-        nvm_content.append(
-            "#the first number is the number of associated PLY files "
-            + os.linesep
-        )
-        nvm_content.append(
-            "#each following number gives a model-index that has PLY "
-            + os.linesep
+        log_report(
+            "INFO", "Duration: " + str(stop_watch.get_elapsed_time()), op
         )
-        nvm_content.append("0" + os.linesep)
-
-        output_file = open(output_nvm_file_name, "wb")
-        output_file.writelines([item.encode() for item in nvm_content])
-
         log_report("INFO", "Write NVM file: Done", op)
 
     @staticmethod
@@ -8,7 +8,8 @@ from photogrammetry_importer.utility.os_utility import (
     get_image_file_paths_in_dir,
 )
 
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import count_bytes_read
 
 
 class Open3DFileHandler:
@@ -24,6 +25,7 @@ class Open3DFileHandler:
         only extrinsic parameters.
         """
         log_report("INFO", "parse_open3d_file: ...", op)
+        count_bytes_read(open3d_ifp)
         log_report("INFO", "open3d_ifp: " + open3d_ifp, op)
         log_report("INFO", "image_dp: " + image_dp, op)
 
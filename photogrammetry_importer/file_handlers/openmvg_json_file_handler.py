@@ -1,13 +1,53 @@
-import json
 import numpy as np
 import os
+from array import array
 
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.utility.blender_camera_utility import (
+from photogrammetry_importer.utility.camera_utility import (
     check_radial_distortion,
 )
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.os_utility import is_file
+from photogrammetry_importer.utility.json_utility import (
+    JSONStreamReader,
+    load_json,
+    use_json_streaming,
+)
+from photogrammetry_importer.utility.point_color_utility import (
+    compute_point_colors_from_observations,
+    is_pillow_available,
+)
+from photogrammetry_importer.utility.profiling_utility import count_bytes_read
+
+
+class _OpenMVGStructure:
+    """Compact buffers with the point coordinates, ids and observations."""
+
+    def __init__(self, collect_observations=True):
+        self.coords = array("d")
+        self.ids = []
+        # The observations are only required to compute the point colors
+        self.collect_observations = collect_observations
+        self.observation_point_indices = array("q")
+        self.observation_view_indices = array("q")
+        self.observation_coords = array("d")
+
+    def add_json_point(self, json_point):
+        point_index = len(self.ids)
+        self.coords.extend(json_point["value"]["X"])
+        self.ids.append(int(json_point["key"]))
+        if not self.collect_observations:
+            return
+        for observation in json_point["value"]["observations"]:
+            self.observation_point_indices.append(point_index)
+            self.observation_view_indices.append(int(observation["key"]))
+            # x_openmvg_file == x_image and y_openmvg_file == y_image
+            self.observation_coords.extend(observation["value"]["x"])
+
+    def add_json_points_from_stream(self, json_stream_reader):
+        for json_point in json_stream_reader.iter_array_values():
+            self.add_json_point(json_point)
 
 
 class OpenMVGJSONFileHandler:
@@ -152,106 +192,78 @@ class OpenMVGJSONFileHandler:
         return cams
 
     @staticmethod
-    def _parse_points(json_data, view_index_to_absolute_fp=None, op=None):
-
-        compute_color = True
-        try:
-            from PIL import Image, ImageFile
+    def _get_color_image_fps(cams, op=None):
+        """Return the image paths used to compute the point colors.
 
-            ImageFile.LOAD_TRUNCATED_IMAGES = True
-        except ImportError:
+        :return: Dictionary mapping view indices to image paths or None (if
+            the colors can not be computed).
+        """
+        if not is_pillow_available():
             log_report(
                 "WARNING",
                 "Can not compute point cloud color information, since Pillow"
                 + " is not installed.",
                 op,
             )
-            compute_color = False
+            return None
 
-        if view_index_to_absolute_fp is None:
-            log_report(
-                "WARNING",
-                "Can not compute point cloud color information, since path to"
-                + " images is not correctly set.",
-                op,
-            )
-            compute_color = False
+        view_index_to_absolute_fp = {
+            cam.view_index: cam.get_absolute_fp() for cam in cams
+        }
+        for absolute_fp in view_index_to_absolute_fp.values():
+            if absolute_fp is None or not is_file(absolute_fp):
+                log_report(
+                    "WARNING",
+                    "Can not compute point cloud color information, since"
+                    + " image file path is incorrect.",
+                    op,
+                )
+                return None
+        return view_index_to_absolute_fp
 
-        if compute_color:
-            log_report(
-                "INFO",
-                "Try to collect color information from files (this might take"
-                + " a while)",
-                op,
-            )
-            view_index_to_image = {}
-            for view_index, absolute_fp in view_index_to_absolute_fp.items():
-                if os.path.isfile(absolute_fp):
-                    pil_image = Image.open(absolute_fp)
-                    view_index_to_image[view_index] = pil_image
-                else:
-                    log_report(
-                        "WARNING",
-                        "Can not compute point cloud color information, since"
-                        + " image file path is incorrect.",
-                        op,
-                    )
-                    compute_color = False
-                    break
+    @staticmethod
+    def _parse_points(
+        structure,
+        view_index_to_absolute_fp=None,
+        use_bilinear_color_interpolation=False,
+        op=None,
+    ):
 
-        if compute_color:
+        num_points = len(structure.ids)
+        if (
+            view_index_to_absolute_fp is not None
+            and structure.collect_observations
+            and len(structure.observation_point_indices) > 0
+        ):
             log_report(
                 "INFO",
                 "Compute color information from files (this might take a"
-                + "  while)",
+                + " while)",
                 op,
             )
-
-        points = []
-        structure = json_data["structure"]
-        for json_point in structure:
-
-            r = g = b = 0
-
-            # Color information can only be computed if input files are
-            # provided
-            if compute_color:
-                for observation in json_point["value"]["observations"]:
-                    view_index = int(observation["key"])
-
-                    # REMARK: The order of ndarray.shape (height, width) is
-                    # complimentary to pillow's image.size (width, height).
-                    # Therefore: x_openmvg_file == x_image == y_ndarray
-                    # and y_openmvg_file == y_image == x_ndarray
-                    x_json_file = float(
-                        observation["value"]["x"][0]
-                    )  # x has index 0
-                    y_json_file = float(
-                        observation["value"]["x"][1]
-                    )  # y has index 1
-
-                    current_image = view_index_to_image[view_index]
-                    current_r, current_g, current_b = current_image.getpixel(
-                        (x_json_file, y_json_file)
-                    )
-                    r += current_r
-                    g += current_g
-                    b += current_b
-
-                # normalize the rgb values
-                amount_observations = len(json_point["value"]["observations"])
-                r /= amount_observations
-                g /= amount_observations
-                b /= amount_observations
-
-            custom_point = Point(
-                coord=np.array(json_point["value"]["X"], dtype=float),
-                color=np.array([r, g, b], dtype=int),
-                id=int(json_point["key"]),
-                scalars=[],
+            colors = compute_point_colors_from_observations(
+                num_points,
+                np.frombuffer(
+                    structure.observation_point_indices, dtype=np.int64
+                ),
+                np.frombuffer(
+                    structure.observation_view_indices, dtype=np.int64
+                ),
+                np.frombuffer(
+                    structure.observation_coords, dtype=float
+                ).reshape(-1, 2),
+                view_index_to_absolute_fp,
+                use_bilinear_interpolation=use_bilinear_color_interpolation,
+                op=op,
             )
-
-            points.append(custom_point)
+        else:
+            colors = np.zeros((num_points, 3), dtype=int)
+
+        coords = np.array(structure.coords, dtype=float).reshape(-1, 3)
+        points = [
+            Point(coord=coord, color=color, id=id, scalars=[])
+            for coord, color, id in zip(coords, colors, structure.ids)
+        ]
         return points
 
     @staticmethod
@@ -260,29 +272,79 @@ class OpenMVGJSONFileHandler:
         image_dp,
         image_fp_type,
         suppress_distortion_warnings,
+        use_bilinear_color_interpolation=False,
         op=None,
     ):
-        """Parse an :code:`OpenMVG` (:code:`.json`) file."""
+        """Parse an :code:`OpenMVG` (:code:`.json`) file.
+
+        The point colors are computed from the observations of the points in
+        the corresponding images.
+        """
 
         log_report("INFO", "parse_openmvg_file: ...", op)
+        count_bytes_read(input_openMVG_file_path)
         log_report(
             "INFO", "input_openMVG_file_path: " + input_openMVG_file_path, op
         )
-        input_file = open(input_openMVG_file_path, "r")
-        json_data = json.load(input_file)
-
-        cams = OpenMVGJSONFileHandler._parse_cameras(
-            json_data,
-            image_dp,
-            image_fp_type,
-            suppress_distortion_warnings,
-            op,
-        )
-        view_index_to_absolute_fp = {
-            cam.view_index: cam.get_absolute_fp() for cam in cams
-        }
+        handler = OpenMVGJSONFileHandler
+        # Determine whether the point colors can be computed before reading
+        # the points, since the observations are only required for the colors
+        camera_keys = ["root_path", "views", "intrinsics", "extrinsics"]
+        cams = None
+        view_index_to_absolute_fp = None
+
+        def parse_cameras(json_data):
+            nonlocal cams, view_index_to_absolute_fp
+            cams = handler._parse_cameras(
+                json_data,
+                image_dp,
+                image_fp_type,
+                suppress_distortion_warnings,
+                op,
+            )
+            view_index_to_absolute_fp = handler._get_color_image_fps(cams, op)
+
+        def create_structure(json_data):
+            if all(key in json_data for key in camera_keys):
+                parse_cameras(json_data)
+                return _OpenMVGStructure(view_index_to_absolute_fp is not None)
+            # The cameras are stored after the points, i.e. collect the
+            # observations if the colors can potentially be computed
+            return _OpenMVGStructure(is_pillow_available())
+
+        structure = None
+        if use_json_streaming(input_openMVG_file_path):
+            # Stream the points (which dominate the file size) directly into
+            # the structure buffers. The remaining data is kept as objects.
+            log_report("INFO", "Reading the file incrementally", op)
+            with open(input_openMVG_file_path, "r", encoding="utf-8") as f:
+                json_stream_reader = JSONStreamReader(f)
+                json_data = {}
+                for key in json_stream_reader.iter_object():
+                    if key == "structure":
+                        structure = create_structure(json_data)
+                        structure.add_json_points_from_stream(
+                            json_stream_reader
+                        )
+                    else:
+                        json_data[key] = json_stream_reader.read_value()
+        else:
+            json_data = load_json(input_openMVG_file_path)
+            json_points = json_data.pop("structure", [])
+            structure = create_structure(json_data)
+            for json_point in json_points:
+                structure.add_json_point(json_point)
+            del json_points
+
+        if structure is None:
+            structure = _OpenMVGStructure(False)
+        if cams is None:
+            parse_cameras(json_data)
         points = OpenMVGJSONFileHandler._parse_points(
-            json_data, view_index_to_absolute_fp, op
+            structure,
+            view_index_to_absolute_fp,
+            use_bilinear_color_interpolation,
+            op,
         )
         log_report("INFO", "parse_openmvg_file: Done", op)
         return cams, points
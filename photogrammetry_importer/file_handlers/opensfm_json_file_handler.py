@@ -1,4 +1,3 @@
-import json
 import numpy as np
 import os
 import math
@@ -6,10 +5,16 @@ import sys
 
 from photogrammetry_importer.types.camera import Camera
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.utility.blender_camera_utility import (
+from photogrammetry_importer.utility.camera_utility import (
     check_radial_distortion,
 )
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.json_utility import (
+    JSONStreamReader,
+    load_json,
+    use_json_streaming,
+)
+from photogrammetry_importer.utility.profiling_utility import count_bytes_read
 
 
 class OpenSfMJSONFileHandler:
@@ -150,21 +155,55 @@ class OpenSfMJSONFileHandler:
             cams.append(camera)
         return cams
 
+    @staticmethod
+    def _convert_json_point(point_id, json_point):
+        return Point(
+            coord=np.array(json_point["coordinates"], dtype=float),
+            color=np.array(json_point["color"], dtype=int),
+            id=point_id,
+            scalars=[],
+        )
+
     @staticmethod
     def _parse_points(json_data, op):
         points = []
         json_points = json_data["points"]
         for point_id in json_points:
-            json_point = json_points[point_id]
-            custom_point = Point(
-                coord=np.array(json_point["coordinates"], dtype=float),
-                color=np.array(json_point["color"], dtype=int),
-                id=point_id,
-                scalars=[],
+            custom_point = OpenSfMJSONFileHandler._convert_json_point(
+                point_id, json_points[point_id]
             )
             points.append(custom_point)
         return points
 
+    @staticmethod
+    def _read_reconstruction_streamed(input_opensfm_fp, reconstruction_idx):
+        # Convert the points (which dominate the file size) while reading the
+        # file and skip all other reconstructions.
+        reconstruction_data = None
+        points = []
+
+        def convert_json_points(json_stream_reader):
+            for point_id, json_point in json_stream_reader.iter_object_items():
+                points.append(
+                    OpenSfMJSONFileHandler._convert_json_point(
+                        point_id, json_point
+                    )
+                )
+
+        with open(input_opensfm_fp, "r", encoding="utf-8") as input_file:
+            json_stream_reader = JSONStreamReader(input_file)
+            num_reconstructions = 0
+            for idx in json_stream_reader.iter_array():
+                num_reconstructions += 1
+                if idx == reconstruction_idx:
+                    reconstruction_data = json_stream_reader.read_object(
+                        {"points": convert_json_points}
+                    )
+                else:
+                    json_stream_reader.skip_value()
+        assert reconstruction_data is not None
+        return reconstruction_data, points, num_reconstructions
+
     @staticmethod
     def parse_opensfm_file(
         input_opensfm_fp,
@@ -177,11 +216,25 @@ class OpenSfMJSONFileHandler:
         """Parse a :code:`OpenSfM` (:code:`.json`) file."""
 
         log_report("INFO", "parse_opensfm_file: ...", op)
+        count_bytes_read(input_opensfm_fp)
         log_report("INFO", "input_opensfm_fp: " + input_opensfm_fp, op)
-        input_file = open(input_opensfm_fp, "r")
-        json_data = json.load(input_file)
-        reconstruction_data = json_data[reconstruction_idx]
-        if len(json_data) > 1:
+        if use_json_streaming(input_opensfm_fp):
+            log_report("INFO", "Reading the file incrementally", op)
+            (
+                reconstruction_data,
+                points,
+                num_reconstructions,
+            ) = OpenSfMJSONFileHandler._read_reconstruction_streamed(
+                input_opensfm_fp, reconstruction_idx
+            )
+        else:
+            json_data = load_json(input_opensfm_fp)
+            reconstruction_data = json_data[reconstruction_idx]
+            points = OpenSfMJSONFileHandler._parse_points(
+                reconstruction_data, op
+            )
+            num_reconstructions = len(json_data)
+        if num_reconstructions > 1:
             log_report(
                 "WARNING",
                 "OpenSfM file contains multiple reconstructions. Only "
@@ -197,6 +250,5 @@ class OpenSfMJSONFileHandler:
             suppress_distortion_warnings,
             op,
         )
-        points = OpenSfMJSONFileHandler._parse_points(reconstruction_data, op)
         log_report("INFO", "parse_opensfm_file: Done", op)
         return cams, points
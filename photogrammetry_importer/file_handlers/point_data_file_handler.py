@@ -3,7 +3,12 @@ import numpy as np
 import importlib
 
 from photogrammetry_importer.types.point import Point
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_span,
+    increment_counter,
+    count_bytes_read,
+)
 from photogrammetry_importer.utility.type_utility import is_float, is_int
 
 
@@ -189,6 +194,7 @@ class PointDataFileHandler:
         """
 
         log_report("INFO", "Parse Point Data File: ...")
+        count_bytes_read(ifp)
         # https://pyntcloud.readthedocs.io/en/latest/io.html
         # https://www.cloudcompare.org/doc/wiki/index.php?title=FILE_I/O
         module_spec = importlib.util.find_spec("pyntcloud")
@@ -202,38 +208,39 @@ class PointDataFileHandler:
         from pyntcloud import PyntCloud
 
         assert os.path.isfile(ifp)
-        ext = os.path.splitext(ifp)[1].lower()
-        if ext in [".asc", ".pts"]:
-            sep = " "
-            data_semantics = (
-                PointDataFileHandler._get_data_semantics_from_ascii(
-                    ifp, sep, has_header=True
+        with profile_span("Read File"):
+            ext = os.path.splitext(ifp)[1].lower()
+            if ext in [".asc", ".pts"]:
+                sep = " "
+                data_semantics = (
+                    PointDataFileHandler._get_data_semantics_from_ascii(
+                        ifp, sep, has_header=True
+                    )
                 )
-            )
-            names = PointDataFileHandler._convert_data_semantics_to_list(
-                data_semantics
-            )
-            point_cloud = PyntCloud.from_file(
-                ifp, sep=sep, header=0, names=names
-            )
-            pseudo_color = data_semantics.pseudo_color
-        elif ext == ".csv":
-            sep = ","
-            data_semantics = (
-                PointDataFileHandler._get_data_semantics_from_ascii(
-                    ifp, sep, has_header=False
+                names = PointDataFileHandler._convert_data_semantics_to_list(
+                    data_semantics
                 )
-            )
-            names = PointDataFileHandler._convert_data_semantics_to_list(
-                data_semantics
-            )
-            point_cloud = PyntCloud.from_file(
-                ifp, sep=sep, header=0, names=names
-            )
-            pseudo_color = data_semantics.pseudo_color
-        else:
-            pseudo_color = False
-            point_cloud = PyntCloud.from_file(ifp)
+                point_cloud = PyntCloud.from_file(
+                    ifp, sep=sep, header=0, names=names
+                )
+                pseudo_color = data_semantics.pseudo_color
+            elif ext == ".csv":
+                sep = ","
+                data_semantics = (
+                    PointDataFileHandler._get_data_semantics_from_ascii(
+                        ifp, sep, has_header=False
+                    )
+                )
+                names = PointDataFileHandler._convert_data_semantics_to_list(
+                    data_semantics
+                )
+                point_cloud = PyntCloud.from_file(
+                    ifp, sep=sep, header=0, names=names
+                )
+                pseudo_color = data_semantics.pseudo_color
+            else:
+                pseudo_color = False
+                point_cloud = PyntCloud.from_file(ifp)
         xyz_arr = point_cloud.points.loc[:, ["x", "y", "z"]].to_numpy()
         if set(["red", "green", "blue"]).issubset(point_cloud.points.columns):
             color_arr = point_cloud.points.loc[
@@ -244,15 +251,84 @@ class PointDataFileHandler:
         else:
             color_arr = np.ones_like(xyz_arr) * 255
         num_points = xyz_arr.shape[0]
-        points = []
-        for idx in range(num_points):
-            point = Point(
-                coord=xyz_arr[idx].astype("float64"),
-                color=color_arr[idx].astype("int"),
-                id=idx,
-                scalars=dict(),
-            )
-            points.append(point)
+        with profile_span("Convert Points"):
+            points = []
+            for idx in range(num_points):
+                point = Point(
+                    coord=xyz_arr[idx].astype("float64"),
+                    color=color_arr[idx].astype("int"),
+                    id=idx,
+                    scalars=dict(),
+                )
+                points.append(point)
+            increment_counter("points", num_points)
         log_report("INFO", f"Number Points {len(points)}")
         log_report("INFO", "Parse Point Data File: Done")
         return points
+
+    @staticmethod
+    def write_ply_file(ofp, point_array, block_size=1000000, op=None):
+        """Write points as binary :code:`.ply` file.
+
+        The coordinates are stored as double values and the colors as
+        unsigned chars. The points are written in blocks.
+        """
+        log_report("INFO", "Write PLY file: " + ofp, op)
+        dtype = np.dtype([("xyz", "<f8", (3,)), ("rgb", "u1", (3,))])
+        num_points = len(point_array)
+        header = (
+            "ply\n"
+            + "format binary_little_endian 1.0\n"
+            + "element vertex "
+            + str(num_points)
+            + "\n"
+            + "property double x\n"
+            + "property double y\n"
+            + "property double z\n"
+            + "property uchar red\n"
+            + "property uchar green\n"
+            + "property uchar blue\n"
+            + "end_header\n"
+        )
+        with open(ofp, "wb") as ofile:
+            ofile.write(header.encode("ascii"))
+            for start in range(0, num_points, block_size):
+                end = min(start + block_size, num_points)
+                records = np.empty(end - start, dtype=dtype)
+                records["xyz"] = point_array.coords[start:end]
+                records["rgb"] = point_array.colors[start:end]
+                ofile.write(records.tobytes())
+        log_report("INFO", "Number Points " + str(num_points), op)
+
+    @staticmethod
+    def write_las_file(ofp, point_array, op=None):
+        """Write points as :code:`.las` file.
+
+        Relies on the :code:`pylas` library.
+        """
+        log_report("INFO", "Write LAS file: " + ofp, op)
+        module_spec = importlib.util.find_spec("pylas")
+        if module_spec is None:
+            log_report(
+                "ERROR",
+                "Exporting this file type requires the pylas library.",
+                op,
+            )
+            assert False
+        import pylas
+
+        # Point format 2 contains coordinates and (16 bit) colors
+        las = pylas.create(point_format_id=2)
+        coords = point_array.coords
+        if len(coords) > 0:
+            las.header.offsets = np.floor(np.min(coords, axis=0))
+        las.header.scales = np.array([0.001, 0.001, 0.001])
+        las.x = coords[:, 0]
+        las.y = coords[:, 1]
+        las.z = coords[:, 2]
+        colors = point_array.colors.astype(np.uint16) * 257
+        las.red = colors[:, 0]
+        las.green = colors[:, 1]
+        las.blue = colors[:, 2]
+        las.write(ofp)
+        log_report("INFO", "Number Points " + str(len(coords)), op)
@@ -1,17 +1,112 @@
 import os
+import hashlib
 import numpy as np
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from concurrent.futures import ThreadPoolExecutor
+from photogrammetry_importer.utility.os_utility import get_addon_cache_dp
+from photogrammetry_importer.utility.logging_utility import log_report
 
 
 class TransformationFileHandler:
-    """Class to read directories with files storing transformations."""
+    """Class to read directories with files storing transformations.
+
+    The transformations are returned as (N, 4, 4) array together with a
+    (N,) boolean mask, which marks the valid transformations. Alternatively to
+    a directory with one .txt file per transformation, a single .npy file
+    with stacked transformations (missing ones are set to NaN) is supported.
+    """
+
+    stacked_ext = ".npy"
+
+    @staticmethod
+    def _read_transformation_txt_file(t_fp):
+        try:
+            with open(t_fp, "r") as t_file:
+                values = np.array(t_file.read().split(), dtype=float)
+        except (OSError, ValueError):
+            return None
+        if values.size != 16:
+            return None
+        return values.reshape((4, 4))
+
+    @staticmethod
+    def _get_cache_fp(t_fps):
+        # The cache file depends on the paths, sizes and modification times
+        # of all transformation files
+        hash_obj = hashlib.sha1()
+        for t_fp in t_fps:
+            stat_result = os.stat(t_fp)
+            hash_obj.update(
+                (
+                    os.path.abspath(t_fp)
+                    + str(stat_result.st_mtime_ns)
+                    + str(stat_result.st_size)
+                ).encode("utf-8")
+            )
+        return os.path.join(
+            get_addon_cache_dp(),
+            "transformations",
+            hash_obj.hexdigest() + TransformationFileHandler.stacked_ext,
+        )
+
+    @staticmethod
+    def parse_stacked_transformation_file(t_ifp, op=None):
+        """Parse a .npy file storing (N, 4, 4) transformations."""
+        transformations = np.load(t_ifp).astype(float).reshape((-1, 4, 4))
+        valid_mask = np.all(np.isfinite(transformations), axis=(1, 2))
+        log_report(
+            "INFO",
+            "Read "
+            + str(np.count_nonzero(valid_mask))
+            + " of "
+            + str(len(valid_mask))
+            + " transformations from "
+            + t_ifp,
+            op,
+        )
+        return transformations, valid_mask
 
     @staticmethod
-    def parse_transformation_folder(t_idp, op=None):
-        """Parse a directory with files storing transformations."""
+    def write_stacked_transformation_file(
+        t_ofp, transformations, valid_mask, op=None
+    ):
+        """Write transformations to a .npy file.
+
+        Invalid transformations are stored as NaN matrices.
+        """
+        transformations = np.array(transformations, dtype=float)
+        transformations[~np.asarray(valid_mask, dtype=bool)] = np.nan
+        # Write to a temporary file first to avoid incomplete cache files
+        with open(t_ofp + ".tmp", "wb") as t_file:
+            np.save(t_file, transformations)
+        os.replace(t_ofp + ".tmp", t_ofp)
+        log_report("INFO", "Wrote transformations to " + t_ofp, op)
+
+    @staticmethod
+    def parse_transformation_folder(
+        t_idp, num_threads=None, use_cache=True, op=None
+    ):
+        """Parse a directory with files storing transformations.
+
+        If :code:`t_idp` is a .npy file, the stacked transformations are
+        read instead. The files in the directory are read in parallel. The
+        result is cached in the add-on cache directory (as stacked .npy
+        file), i.e. subsequent imports of the same (unmodified) directory
+        read a single binary file.
+
+        :return: Tuple containing an (N, 4, 4) array and a (N,) boolean mask.
+            Entries of files that could not be parsed are marked as invalid.
+        """
+
+        handler = TransformationFileHandler
+        if os.path.isfile(t_idp):
+            if os.path.splitext(t_idp)[1] == handler.stacked_ext:
+                return handler.parse_stacked_transformation_file(t_idp, op)
+            log_report(
+                "WARNING", "Unsupported transformation file: " + t_idp, op
+            )
 
         if not os.path.isdir(t_idp):
-            return []
+            return np.zeros((0, 4, 4), dtype=float), np.zeros(0, dtype=bool)
 
         t_fps = sorted(
             [
@@ -22,11 +117,49 @@ class TransformationFileHandler:
             ]
         )
 
-        transformations_sorted = []
-        for t_fp in t_fps:
-            log_report("INFO", "transformation file path: " + t_fp, op)
-            trans_mat = np.loadtxt(t_fp, dtype="f", delimiter=" ")
-            # log_report('INFO', 'transformation mat: ' + str(trans_mat), op)
-            transformations_sorted.append(trans_mat)
+        if use_cache:
+            cache_fp = handler._get_cache_fp(t_fps)
+            if os.path.isfile(cache_fp):
+                try:
+                    return handler.parse_stacked_transformation_file(
+                        cache_fp, op
+                    )
+                except (OSError, ValueError):
+                    pass
+
+        log_report(
+            "INFO",
+            "Reading " + str(len(t_fps)) + " transformation files in " + t_idp,
+            op,
+        )
+        transformations = np.full((len(t_fps), 4, 4), np.nan, dtype=float)
+        valid_mask = np.zeros(len(t_fps), dtype=bool)
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            trans_mats = executor.map(
+                handler._read_transformation_txt_file, t_fps
+            )
+            for index, (t_fp, trans_mat) in enumerate(zip(t_fps, trans_mats)):
+                if trans_mat is None:
+                    log_report(
+                        "WARNING",
+                        "Could not read transformation file: " + t_fp,
+                        op,
+                    )
+                    continue
+                transformations[index] = trans_mat
+                valid_mask[index] = True
+
+        if use_cache:
+            try:
+                os.makedirs(os.path.dirname(cache_fp), exist_ok=True)
+                handler.write_stacked_transformation_file(
+                    cache_fp, transformations, valid_mask, op
+                )
+            except OSError as err:
+                log_report(
+                    "WARNING",
+                    "Could not write transformation cache: " + str(err),
+                    op,
+                )
 
-        return transformations_sorted
+        return transformations, valid_mask
@@ -1,6 +1,6 @@
 import os
 import bpy
-from bpy.props import StringProperty, CollectionProperty
+from bpy.props import StringProperty, CollectionProperty, EnumProperty
 from bpy_extras.io_utils import ExportHelper
 
 from photogrammetry_importer.file_handlers.colmap_file_handler import (
@@ -25,6 +25,20 @@ class ExportColmapOperator(ExportOperator, ExportHelper):
         type=bpy.types.OperatorFileListElement,
     )
 
+    export_format: EnumProperty(
+        name="Format",
+        description="Binary models are smaller and faster to write and read",
+        items=(
+            (
+                "BIN",
+                "Binary",
+                "Write cameras.bin, images.bin and points3D.bin",
+            ),
+            ("TXT", "Text", "Write cameras.txt, images.txt and points3D.txt"),
+        ),
+        default="BIN",
+    )
+
     filename_ext = ""
     # filter_folder : BoolProperty(default=True, options={'HIDDEN'})
 
@@ -39,6 +53,12 @@ class ExportColmapOperator(ExportOperator, ExportHelper):
         for cam in cameras:
             assert cam.get_calibration_mat() is not None
 
-        ColmapFileHandler.write_colmap_model(odp, cameras, points, self)
+        if self.export_format == "BIN":
+            ext = ".bin"
+        else:
+            ext = ".txt"
+        ColmapFileHandler.write_colmap_model(
+            odp, cameras, points, ext=ext, op=self
+        )
 
         return {"FINISHED"}
@@ -20,6 +20,7 @@ from photogrammetry_importer.file_handlers.colmap_file_handler import (
     ColmapFileHandler,
 )
 from photogrammetry_importer.utility.blender_utility import add_collection
+from photogrammetry_importer.utility.profiling_utility import profile_span
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
@@ -42,32 +43,48 @@ class ImportColmapOperator(
     # filter_folder : BoolProperty(default=True, options={'HIDDEN'})
 
     def execute(self, context):
-
-        path = self.directory
-        # Remove trailing slash
-        path = os.path.dirname(path)
-        log_report("INFO", "path: " + str(path), self)
-
-        self.image_dp = self.get_default_image_path(path, self.image_dp)
-        cameras, points, mesh_ifp = ColmapFileHandler.parse_colmap_folder(
-            path,
-            self.image_dp,
-            self.image_fp_type,
-            self.suppress_distortion_warnings,
-            self,
-        )
-
-        log_report("INFO", "Number cameras: " + str(len(cameras)), self)
-        log_report("INFO", "Number points: " + str(len(points)), self)
-        log_report("INFO", "Mesh file path: " + str(mesh_ifp), self)
-
-        reconstruction_collection = add_collection("Reconstruction Collection")
-        self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
-        self.import_photogrammetry_mesh(mesh_ifp, reconstruction_collection)
-        self.apply_general_options()
-
-        return {"FINISHED"}
+        return self.execute_import(context, self._import_reconstruction())
+
+    def _import_reconstruction(self):
+        # Yields while the reconstruction is parsed in a separate process
+        with self.import_profiling():
+            path = self.directory
+            # Remove trailing slash
+            path = os.path.dirname(path)
+            log_report("INFO", "path: " + str(path), self)
+
+            self.image_dp = self.get_default_image_path(path, self.image_dp)
+            with self.directory_index(path, self.image_dp):
+                with profile_span("Parse"):
+                    cameras, points, mesh_ifp = (
+                        yield from self.parse_reconstruction(
+                            ColmapFileHandler.parse_colmap_folder,
+                            path,
+                            self.image_dp,
+                            self.image_fp_type,
+                            self.suppress_distortion_warnings,
+                        )
+                    )
+
+                log_report(
+                    "INFO", "Number cameras: " + str(len(cameras)), self
+                )
+                log_report("INFO", "Number points: " + str(len(points)), self)
+                log_report("INFO", "Mesh file path: " + str(mesh_ifp), self)
+
+                reconstruction_collection = add_collection(
+                    "Reconstruction Collection"
+                )
+                self.import_photogrammetry_cameras(
+                    cameras, reconstruction_collection
+                )
+                self.import_photogrammetry_points(
+                    points, reconstruction_collection
+                )
+                self.import_photogrammetry_mesh(
+                    mesh_ifp, reconstruction_collection
+                )
+                self.apply_general_options()
 
     def invoke(self, context, event):
 
@@ -1,12 +1,25 @@
 import bpy
 import os
 import numpy as np
-from photogrammetry_importer.types.point import Point
+from bpy.props import BoolProperty
 from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.point_array import PointArray
+from photogrammetry_importer.utility.blender_mesh_utility import (
+    get_vertex_point_array,
+)
+from photogrammetry_importer.utility.stop_watch import StopWatch
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
 class ExportOperator(bpy.types.Operator):
+
+    use_evaluated_meshes: BoolProperty(
+        name="Apply Modifiers",
+        description="Export the vertices of the meshes with applied "
+        "modifiers (i.e. of the evaluated meshes)",
+        default=False,
+    )
+
     def invert_y_and_z_axis(self, input_matrix_or_vector):
         """
         VisualSFM and Blender use coordinate systems, which differ in the y and z coordinate
@@ -105,10 +118,13 @@ class ExportOperator(bpy.types.Operator):
             "INFO", "export_selected_cameras_and_vertices_of_meshes: ...", self
         )
         cameras = []
-        points = []
+        point_arrays = []
 
-        point_index = 0
+        stop_watch = StopWatch()
         camera_index = 0
+        depsgraph = None
+        if self.use_evaluated_meshes:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
         for obj in bpy.context.selected_objects:
             if obj.type == "CAMERA":
                 log_report("INFO", "obj.name: " + str(obj.name), self)
@@ -134,20 +150,25 @@ class ExportOperator(bpy.types.Operator):
 
             else:
                 if obj.data is not None:
-                    obj_points = []
-                    for vert in obj.data.vertices:
-                        coord_world = obj.matrix_world @ vert.co
-                        obj_points.append(
-                            Point(
-                                coord=coord_world,
-                                color=[0, 255, 0],
-                                id=point_index,
-                                scalars=[],
-                            )
-                        )
-
-                        point_index += 1
-                    points += obj_points
+                    point_array = get_vertex_point_array(
+                        obj,
+                        use_evaluated_mesh=self.use_evaluated_meshes,
+                        depsgraph=depsgraph,
+                    )
+                    if point_array is not None:
+                        point_arrays.append(point_array)
+
+        # The points of all objects get consecutive ids
+        points = PointArray.concatenate(point_arrays)
+        log_report(
+            "INFO",
+            "Extracted "
+            + str(len(points))
+            + " vertices in "
+            + str(stop_watch.get_elapsed_time())
+            + " s",
+            self,
+        )
         log_report(
             "INFO",
             "export_selected_cameras_and_vertices_of_meshes: Done",
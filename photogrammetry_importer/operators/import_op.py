@@ -2,6 +2,7 @@ import os
 import numpy as np
 import bpy
 import math
+from contextlib import contextmanager
 
 # Notes:
 #   http://sinestesia.co/blog/tutorials/using-blenders-filebrowser-with-python/
@@ -22,6 +23,8 @@ from bpy.props import (
 
 from bpy_extras.io_utils import ImportHelper, axis_conversion
 
+from photogrammetry_importer.utility.os_utility import DirectoryIndex
+
 custom_property_types = [
     bpy.types.BoolProperty,
     bpy.types.IntProperty,
@@ -50,6 +53,36 @@ class ImportOperator(bpy.types.Operator):
                 continue
             setattr(self, name, getattr(source, name))
 
+    def build_directory_index(self, *dps):
+        """Index the files in the given directories (in the background).
+
+        The index is used to resolve image and depth map paths without
+        querying the file system for each camera.
+        """
+        DirectoryIndex.clear_active_indices()
+        for dp in dps:
+            if dp is None or not os.path.isdir(dp):
+                continue
+            if DirectoryIndex.get_active_index(dp) is None:
+                DirectoryIndex.build_active_index(dp)
+
+    def clear_directory_index(self):
+        """Remove the directory index (since the files may change)."""
+        DirectoryIndex.clear_active_indices()
+
+    @contextmanager
+    def directory_index(self, *dps):
+        """Context manager providing a directory index during the import.
+
+        The index is removed when the context is left, even if the import
+        fails (otherwise later file queries would use a stale index).
+        """
+        self.build_directory_index(*dps)
+        try:
+            yield
+        finally:
+            self.clear_directory_index()
+
     def get_addon_name(self):
         return __name__.split(".")[0]
 
@@ -23,6 +23,7 @@ from photogrammetry_importer.file_handlers.meshroom_file_handler import (
     MeshroomFileHandler,
 )
 from photogrammetry_importer.utility.blender_utility import add_collection
+from photogrammetry_importer.utility.profiling_utility import profile_span
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
@@ -89,35 +90,50 @@ class ImportMeshroomOperator(
     )
 
     def execute(self, context):
-
-        path = os.path.join(self.directory, self.filepath)
-        log_report("INFO", "path: " + str(path), self)
-
-        self.image_dp = self.get_default_image_path(path, self.image_dp)
-        log_report("INFO", "image_dp: " + str(self.image_dp), self)
-
-        cameras, points, mesh_fp = MeshroomFileHandler.parse_meshroom_file(
-            path,
-            self.image_dp,
-            self.image_fp_type,
-            self.suppress_distortion_warnings,
-            self.sfm_node_type,
-            self.sfm_node_number,
-            self.mesh_node_type,
-            self.mesh_node_number,
-            self,
-        )
-
-        log_report("INFO", "Number cameras: " + str(len(cameras)), self)
-        log_report("INFO", "Number points: " + str(len(points)), self)
-
-        reconstruction_collection = add_collection("Reconstruction Collection")
-        self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
-        self.import_photogrammetry_mesh(mesh_fp, reconstruction_collection)
-        self.apply_general_options()
-
-        return {"FINISHED"}
+        return self.execute_import(context, self._import_reconstruction())
+
+    def _import_reconstruction(self):
+        # Yields while the reconstruction is parsed in a separate process
+        with self.import_profiling():
+            path = os.path.join(self.directory, self.filepath)
+            log_report("INFO", "path: " + str(path), self)
+
+            self.image_dp = self.get_default_image_path(path, self.image_dp)
+            log_report("INFO", "image_dp: " + str(self.image_dp), self)
+            with self.directory_index(self.image_dp):
+                with profile_span("Parse"):
+                    cameras, points, mesh_fp = (
+                        yield from self.parse_reconstruction(
+                            MeshroomFileHandler.parse_meshroom_file,
+                            path,
+                            self.image_dp,
+                            self.image_fp_type,
+                            self.suppress_distortion_warnings,
+                            self.sfm_node_type,
+                            self.sfm_node_number,
+                            self.mesh_node_type,
+                            self.mesh_node_number,
+                        )
+                    )
+
+                log_report(
+                    "INFO", "Number cameras: " + str(len(cameras)), self
+                )
+                log_report("INFO", "Number points: " + str(len(points)), self)
+
+                reconstruction_collection = add_collection(
+                    "Reconstruction Collection"
+                )
+                self.import_photogrammetry_cameras(
+                    cameras, reconstruction_collection
+                )
+                self.import_photogrammetry_points(
+                    points, reconstruction_collection
+                )
+                self.import_photogrammetry_mesh(
+                    mesh_fp, reconstruction_collection
+                )
+                self.apply_general_options()
 
     def invoke(self, context, event):
         addon_name = self.get_addon_name()
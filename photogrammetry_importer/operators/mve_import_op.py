@@ -17,6 +17,7 @@ from photogrammetry_importer.file_handlers.mve_file_handler import (
     MVEFileHandler,
 )
 from photogrammetry_importer.utility.blender_utility import add_collection
+from photogrammetry_importer.utility.profiling_utility import profile_span
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
@@ -36,30 +37,41 @@ class ImportMVEOperator(
     directory: StringProperty()
 
     def execute(self, context):
-
-        path = self.directory
-        # Remove trailing slash
-        path = os.path.dirname(path)
-        log_report("INFO", "path: " + str(path), self)
-
-        cameras, points = MVEFileHandler.parse_mve_workspace(
-            path,
-            self.default_width,
-            self.default_height,
-            self.add_depth_maps_as_point_cloud,
-            self.suppress_distortion_warnings,
-            self,
-        )
-
-        log_report("INFO", "Number cameras: " + str(len(cameras)), self)
-        log_report("INFO", "Number points: " + str(len(points)), self)
-
-        reconstruction_collection = add_collection("Reconstruction Collection")
-        self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
-        self.apply_general_options()
-
-        return {"FINISHED"}
+        return self.execute_import(context, self._import_reconstruction())
+
+    def _import_reconstruction(self):
+        # Yields while the reconstruction is parsed in a separate process
+        with self.import_profiling():
+            path = self.directory
+            # Remove trailing slash
+            path = os.path.dirname(path)
+            log_report("INFO", "path: " + str(path), self)
+            with self.directory_index(path):
+                with profile_span("Parse"):
+                    cameras, points = yield from self.parse_reconstruction(
+                        MVEFileHandler.parse_mve_workspace,
+                        path,
+                        self.default_width,
+                        self.default_height,
+                        self.add_depth_maps_as_point_cloud,
+                        self.suppress_distortion_warnings,
+                    )
+
+                log_report(
+                    "INFO", "Number cameras: " + str(len(cameras)), self
+                )
+                log_report("INFO", "Number points: " + str(len(points)), self)
+
+                reconstruction_collection = add_collection(
+                    "Reconstruction Collection"
+                )
+                self.import_photogrammetry_cameras(
+                    cameras, reconstruction_collection
+                )
+                self.import_photogrammetry_points(
+                    points, reconstruction_collection
+                )
+                self.apply_general_options()
 
     def invoke(self, context, event):
 
@@ -21,6 +21,7 @@ from photogrammetry_importer.utility.blender_utility import add_collection
 from photogrammetry_importer.utility.camera_utility import (
     set_image_size_for_cameras,
 )
+from photogrammetry_importer.utility.profiling_utility import profile_span
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 from photogrammetry_importer.types.camera import Camera
@@ -122,25 +123,37 @@ class ImportOpen3DOperator(
         return cameras, success
 
     def execute(self, context):
+        return self.execute_import(context, self._import_reconstruction())
+
+    def _import_reconstruction(self):
+        # Yields while the reconstruction is parsed in a separate process
+        with self.import_profiling():
+            path = os.path.join(self.directory, self.filepath)
+            log_report("INFO", "path: " + str(path), self)
+
+            self.image_dp = self.get_default_image_path(path, self.image_dp)
+            log_report("INFO", "image_dp: " + str(self.image_dp), self)
+            with self.directory_index(self.image_dp):
+                with profile_span("Parse"):
+                    cameras = yield from self.parse_reconstruction(
+                        Open3DFileHandler.parse_open3d_file,
+                        path,
+                        self.image_dp,
+                        self.image_fp_type,
+                    )
+
+                log_report("INFO", "aaaaa " + str(cameras[0].width), self)
+                log_report(
+                    "INFO", "Number cameras: " + str(len(cameras)), self
+                )
 
-        path = os.path.join(self.directory, self.filepath)
-        log_report("INFO", "path: " + str(path), self)
-
-        self.image_dp = self.get_default_image_path(path, self.image_dp)
-        log_report("INFO", "image_dp: " + str(self.image_dp), self)
-
-        cameras = Open3DFileHandler.parse_open3d_file(
-            path, self.image_dp, self.image_fp_type, self
-        )
-
-        log_report("INFO", "aaaaa " + str(cameras[0].width), self)
-        log_report("INFO", "Number cameras: " + str(len(cameras)), self)
-
-        reconstruction_collection = add_collection("Reconstruction Collection")
-        self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.apply_general_options()
-
-        return {"FINISHED"}
+                reconstruction_collection = add_collection(
+                    "Reconstruction Collection"
+                )
+                self.import_photogrammetry_cameras(
+                    cameras, reconstruction_collection
+                )
+                self.apply_general_options()
 
     def invoke(self, context, event):
         addon_name = self.get_addon_name()
@@ -1,6 +1,6 @@
 import os
 import bpy
-from bpy.props import StringProperty
+from bpy.props import StringProperty, BoolProperty
 from bpy_extras.io_utils import ImportHelper
 
 from photogrammetry_importer.operators.import_op import ImportOperator
@@ -18,6 +18,7 @@ from photogrammetry_importer.file_handlers.openmvg_json_file_handler import (
     OpenMVGJSONFileHandler,
 )
 from photogrammetry_importer.utility.blender_utility import add_collection
+from photogrammetry_importer.utility.profiling_utility import profile_span
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
@@ -42,31 +43,50 @@ class ImportOpenMVGOperator(
     directory: StringProperty()
     filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
 
-    def execute(self, context):
-
-        path = os.path.join(self.directory, self.filepath)
-        log_report("INFO", "path: " + str(path), self)
-
-        self.image_dp = self.get_default_image_path(path, self.image_dp)
-        log_report("INFO", "image_dp: " + str(self.image_dp), self)
-
-        cameras, points = OpenMVGJSONFileHandler.parse_openmvg_file(
-            path,
-            self.image_dp,
-            self.image_fp_type,
-            self.suppress_distortion_warnings,
-            self,
-        )
-
-        log_report("INFO", "Number cameras: " + str(len(cameras)), self)
-        log_report("INFO", "Number points: " + str(len(points)), self)
-
-        reconstruction_collection = add_collection("Reconstruction Collection")
-        self.import_photogrammetry_cameras(cameras, reconstruction_collection)
-        self.import_photogrammetry_points(points, reconstruction_collection)
-        self.apply_general_options()
+    use_bilinear_color_interpolation: BoolProperty(
+        name="Bilinear Color Interpolation",
+        description="Use bilinear interpolation to sample the point colors "
+        + "from the images. Otherwise, the nearest pixel is used.",
+        default=False,
+    )
 
-        return {"FINISHED"}
+    def execute(self, context):
+        return self.execute_import(context, self._import_reconstruction())
+
+    def _import_reconstruction(self):
+        # Yields while the reconstruction is parsed in a separate process
+        with self.import_profiling():
+            path = os.path.join(self.directory, self.filepath)
+            log_report("INFO", "path: " + str(path), self)
+
+            self.image_dp = self.get_default_image_path(path, self.image_dp)
+            log_report("INFO", "image_dp: " + str(self.image_dp), self)
+            with self.directory_index(self.image_dp):
+                with profile_span("Parse"):
+                    cameras, points = yield from self.parse_reconstruction(
+                        OpenMVGJSONFileHandler.parse_openmvg_file,
+                        path,
+                        self.image_dp,
+                        self.image_fp_type,
+                        self.suppress_distortion_warnings,
+                        self.use_bilinear_color_interpolation,
+                    )
+
+                log_report(
+                    "INFO", "Number cameras: " + str(len(cameras)), self
+                )
+                log_report("INFO", "Number points: " + str(len(points)), self)
+
+                reconstruction_collection = add_collection(
+                    "Reconstruction Collection"
+                )
+                self.import_photogrammetry_cameras(
+                    cameras, reconstruction_collection
+                )
+                self.import_photogrammetry_points(
+                    points, reconstruction_collection
+                )
+                self.apply_general_options()
 
     def invoke(self, context, event):
         addon_name = self.get_addon_name()
@@ -79,6 +99,7 @@ class ImportOpenMVGOperator(
 
     def draw(self, context):
         layout = self.layout
+        layout.prop(self, "use_bilinear_color_interpolation")
         self.draw_camera_options(layout)
         self.draw_point_options(layout)
         self.draw_general_options(layout)
@@ -0,0 +1,117 @@
+import os
+import bpy
+from bpy.props import StringProperty, EnumProperty, BoolProperty
+from bpy_extras.io_utils import ExportHelper
+
+from photogrammetry_importer.file_handlers.point_data_file_handler import (
+    PointDataFileHandler,
+)
+from photogrammetry_importer.types.point_array import PointArray
+from photogrammetry_importer.utility.blender_opengl_utility import (
+    get_point_cloud_anchor_point_array,
+)
+from photogrammetry_importer.utility.blender_point_utility import (
+    get_particle_system_point_array,
+)
+from photogrammetry_importer.utility.blender_mesh_utility import (
+    get_vertex_point_array,
+)
+from photogrammetry_importer.utility.stop_watch import StopWatch
+from photogrammetry_importer.utility.blender_logging_utility import log_report
+
+
+class ExportPointDataOperator(bpy.types.Operator, ExportHelper):
+    """Export point clouds (OpenGL, particle systems and meshes)"""
+
+    bl_idname = "export_scene.point_data"
+    bl_label = "Export Point Data"
+    bl_options = {"PRESET"}
+
+    export_format: EnumProperty(
+        name="Format",
+        items=(
+            ("PLY", "PLY", "Binary PLY file"),
+            ("LAS", "LAS", "LAS file (requires pylas)"),
+        ),
+        default="PLY",
+    )
+    use_selection: BoolProperty(
+        name="Selected Objects",
+        description="Export only the points of the selected objects",
+        default=True,
+    )
+    use_evaluated_meshes: BoolProperty(
+        name="Apply Modifiers",
+        description="Export the vertices of the meshes with applied "
+        "modifiers (i.e. of the evaluated meshes)",
+        default=False,
+    )
+
+    filename_ext = ".ply"
+    filter_glob: StringProperty(default="*.ply;*.las", options={"HIDDEN"})
+
+    def _get_ext(self):
+        if self.export_format == "LAS":
+            return ".las"
+        return ".ply"
+
+    def check(self, context):
+        # Adjust the extension of the file path to the selected format
+        filepath = bpy.path.ensure_ext(
+            os.path.splitext(self.filepath)[0], self._get_ext()
+        )
+        if filepath != self.filepath:
+            self.filepath = filepath
+            return True
+        return False
+
+    def get_point_array(self, context):
+        """Collect the points of the (selected) objects in world coords."""
+        if self.use_selection:
+            objects = context.selected_objects
+        else:
+            objects = context.scene.objects
+        depsgraph = None
+        if self.use_evaluated_meshes:
+            depsgraph = context.evaluated_depsgraph_get()
+
+        point_arrays = []
+        for obj in objects:
+            if obj.type == "EMPTY":
+                point_array = get_point_cloud_anchor_point_array(obj)
+            elif obj.type == "MESH" and len(obj.particle_systems) > 0:
+                point_array = get_particle_system_point_array(obj)
+            elif obj.type == "MESH":
+                point_array = get_vertex_point_array(
+                    obj,
+                    use_evaluated_mesh=self.use_evaluated_meshes,
+                    depsgraph=depsgraph,
+                )
+            else:
+                point_array = None
+            if point_array is not None:
+                log_report(
+                    "INFO",
+                    "Exporting "
+                    + str(len(point_array))
+                    + " points of "
+                    + obj.name,
+                    self,
+                )
+                point_arrays.append(point_array)
+        return PointArray.concatenate(point_arrays)
+
+    def execute(self, context):
+        ofp = bpy.path.ensure_ext(
+            os.path.splitext(self.filepath)[0], self._get_ext()
+        )
+        stop_watch = StopWatch()
+        point_array = self.get_point_array(context)
+        if self.export_format == "LAS":
+            PointDataFileHandler.write_las_file(ofp, point_array, op=self)
+        else:
+            PointDataFileHandler.write_ply_file(ofp, point_array, op=self)
+        log_report(
+            "INFO", "Duration: " + str(stop_watch.get_elapsed_time()), self
+        )
+        return {"FINISHED"}
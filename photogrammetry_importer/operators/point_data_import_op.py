@@ -21,6 +21,7 @@ from photogrammetry_importer.file_handlers.transformation_file_handler import (
     TransformationFileHandler,
 )
 from photogrammetry_importer.utility.blender_utility import add_collection
+from photogrammetry_importer.utility.profiling_utility import profile_span
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
@@ -48,25 +49,39 @@ class ImportPointDataOperator(
     )
 
     def execute(self, context):
-        path = os.path.join(self.directory, self.filepath)
-        log_report("INFO", "path: " + str(path), self)
+        return self.execute_import(context, self._import_reconstruction())
 
-        points = PointDataFileHandler.parse_point_data_file(path, self)
-        log_report("INFO", "Number points: " + str(len(points)), self)
+    def _import_reconstruction(self):
+        # Yields while the reconstruction is parsed in a separate process
+        with self.import_profiling():
+            path = os.path.join(self.directory, self.filepath)
+            log_report("INFO", "path: " + str(path), self)
 
-        transformations_sorted = (
-            TransformationFileHandler.parse_transformation_folder(
-                self.path_to_transformations, self
-            )
-        )
+            with profile_span("Parse"):
+                points = yield from self.parse_reconstruction(
+                    PointDataFileHandler.parse_point_data_file,
+                    path,
+                )
+            log_report("INFO", "Number points: " + str(len(points)), self)
 
-        reconstruction_collection = add_collection("Reconstruction Collection")
-        self.import_photogrammetry_points(
-            points, reconstruction_collection, transformations_sorted
-        )
-        self.apply_general_options()
+            # The transformation animation of points is not supported yet,
+            # i.e. the mask of the valid transformations is not required
+            (
+                transformations_sorted,
+                _,
+            ) = TransformationFileHandler.parse_transformation_folder(
+                self.path_to_transformations,
+                use_cache=self.use_transformation_cache,
+                op=self,
+            )
 
-        return {"FINISHED"}
+            reconstruction_collection = add_collection(
+                "Reconstruction Collection"
+            )
+            self.import_photogrammetry_points(
+                points, reconstruction_collection, transformations_sorted
+            )
+            self.apply_general_options()
 
     def invoke(self, context, event):
         addon_name = self.get_addon_name()
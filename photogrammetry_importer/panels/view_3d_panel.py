@@ -5,9 +5,13 @@ import bpy
 from photogrammetry_importer.types.point import Point
 from photogrammetry_importer.utility.blender_camera_utility import (
     get_selected_camera,
+    load_full_resolution_images,
+    get_camera_frusta_indices,
+    add_cameras_of_camera_frusta,
 )
 from photogrammetry_importer.utility.blender_opengl_utility import (
     render_opengl_image,
+    is_camera_frusta_anchor,
 )
 from photogrammetry_importer.utility.blender_opengl_draw_manager import (
     DrawManager,
@@ -93,6 +97,8 @@ class OpenGLPanel(bpy.types.Panel):
         )
 
         bpy.utils.register_class(UpdatePointCloudVisualizationOperator)
+        bpy.utils.register_class(LoadFullResolutionImagesOperator)
+        bpy.utils.register_class(AddCamerasOfCameraFrustaOperator)
         bpy.utils.register_class(SaveOpenGLRenderImageOperator)
         bpy.utils.register_class(ExportOpenGLRenderImageOperator)
         bpy.utils.register_class(ExportOpenGLRenderAnimationOperator)
@@ -112,6 +118,8 @@ class OpenGLPanel(bpy.types.Panel):
         del bpy.types.Scene.opengl_panel_export_animation_settings
 
         bpy.utils.unregister_class(UpdatePointCloudVisualizationOperator)
+        bpy.utils.unregister_class(LoadFullResolutionImagesOperator)
+        bpy.utils.unregister_class(AddCamerasOfCameraFrustaOperator)
         bpy.utils.unregister_class(SaveOpenGLRenderImageOperator)
         bpy.utils.unregister_class(ExportOpenGLRenderImageOperator)
         bpy.utils.unregister_class(ExportOpenGLRenderAnimationOperator)
@@ -129,6 +137,16 @@ class OpenGLPanel(bpy.types.Panel):
         row = viz_box.row()
         row.operator(UpdatePointCloudVisualizationOperator.bl_idname)
 
+        image_box = layout.box()
+        image_box.label(text="Select cameras or image planes with proxies:")
+        row = image_box.row()
+        row.operator(LoadFullResolutionImagesOperator.bl_idname)
+
+        frusta_box = layout.box()
+        frusta_box.label(text="Select an OpenGL camera frusta handle:")
+        row = frusta_box.row()
+        row.operator(AddCamerasOfCameraFrustaOperator.bl_idname)
+
         write_box = layout.box()
         write_box.label(
             text="Select a camera to save/export an OpenGL rendering:"
@@ -183,6 +201,81 @@ class UpdatePointCloudVisualizationOperator(bpy.types.Operator):
         return {"FINISHED"}
 
 
+class LoadFullResolutionImagesOperator(bpy.types.Operator):
+    bl_idname = "photogrammetry_importer.load_full_resolution_images"
+    bl_label = "Load Full Resolution Images"
+    bl_description = (
+        "Replace the image proxies of the selected cameras and image planes "
+        + "with the original images"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.selected_objects) > 0
+
+    def execute(self, context):
+        log_report("INFO", "Load full resolution images: ...", self)
+        load_full_resolution_images(context.selected_objects, self)
+        log_report("INFO", "Load full resolution images: Done", self)
+        return {"FINISHED"}
+
+
+class AddCamerasOfCameraFrustaOperator(bpy.types.Operator):
+    bl_idname = "photogrammetry_importer.add_cameras_of_camera_frusta"
+    bl_label = "Add Cameras of Camera Frusta"
+    bl_description = (
+        "Add Blender cameras for a subset of the cameras drawn by the "
+        + "selected OpenGL camera frusta handle"
+    )
+
+    camera_id_or_name_str: StringProperty(
+        name="Camera IDs or Names",
+        description="A list of camera indices or names (separated by "
+        + "whitespaces). If no indices are provided, the cameras closest to "
+        + "the 3D cursor are added. The names must not contain whitespaces",
+        default="",
+    )
+    num_closest_cameras: IntProperty(
+        name="Number of Cameras Closest to the 3D Cursor",
+        description="Number of cameras added, if no camera indices or "
+        + "names are provided",
+        default=10,
+        min=1,
+    )
+    add_background_images: BoolProperty(
+        name="Add a Background Image for each Camera",
+        description="The background image is only visible by viewing the "
+        + "scene from a specific camera",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return is_camera_frusta_anchor(context.active_object)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        log_report("INFO", "Add cameras of camera frusta: ...", self)
+        object_anchor_handle = context.active_object
+        camera_indices = get_camera_frusta_indices(
+            object_anchor_handle,
+            self.camera_id_or_name_str,
+            self.num_closest_cameras,
+            context.scene.cursor.location,
+            op=self,
+        )
+        add_cameras_of_camera_frusta(
+            object_anchor_handle,
+            camera_indices,
+            add_background_images=self.add_background_images,
+            op=self,
+        )
+        log_report("INFO", "Add cameras of camera frusta: Done", self)
+        return {"FINISHED"}
+
+
 class SaveOpenGLRenderImageOperator(bpy.types.Operator):
     bl_idname = "photogrammetry_importer.save_opengl_render_image"
     bl_label = "Save as Image"
@@ -59,6 +59,9 @@ class PhotogrammetryImporterPreferences(
     visualsfm_exporter_bool: BoolProperty(
         name="VisualSfM Exporter", default=True
     )
+    point_data_exporter_bool: BoolProperty(
+        name="Point Data Exporter", default=True
+    )
 
     @classmethod
     def register(cls):
@@ -115,6 +118,7 @@ class PhotogrammetryImporterPreferences(
         exporter_box = column.box()
         exporter_box.prop(self, "colmap_exporter_bool")
         exporter_box.prop(self, "visualsfm_exporter_bool")
+        exporter_box.prop(self, "point_data_exporter_bool")
 
         importer_exporter_box.operator(UpdateImportersAndExporters.bl_idname)
 
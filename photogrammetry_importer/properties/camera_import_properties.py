@@ -15,6 +15,9 @@ from photogrammetry_importer.utility.blender_camera_utility import (
     add_cameras,
     add_camera_animation,
 )
+from photogrammetry_importer.utility.blender_opengl_utility import (
+    draw_camera_frusta,
+)
 from photogrammetry_importer.types.camera import Camera
 
 
@@ -82,6 +85,34 @@ class CameraImportProperties:
         + "center",
         default=float("nan"),
     )
+    camera_visualization_type: EnumProperty(
+        name="Camera Visualization",
+        description="Add a Blender camera object for each camera or draw "
+        + "the frusta of all cameras with OpenGL. The OpenGL visualization "
+        + "scales to very large numbers of cameras. Use the Photogrammetry "
+        + "Importer panel to add Blender cameras for a subset of the "
+        + "cameras later on",
+        items=(
+            ("OBJECTS", "Camera Objects", ""),
+            ("FRUSTA", "OpenGL Frusta", ""),
+        ),
+    )
+    camera_frustum_color: FloatVectorProperty(
+        name="Camera Frustum Color",
+        description="Color of the OpenGL camera frusta",
+        subtype="COLOR",
+        size=3,  # RGBA colors are not compatible with the GPU Module
+        default=(0.0, 0.0, 1.0),
+        min=0.0,
+        max=1.0,
+    )
+    share_camera_data: BoolProperty(
+        name="Share Camera Data",
+        description="Cameras with identical intrinsic parameters (focal "
+        + "length, principal point and resolution) share a single camera "
+        + "data block. Not possible, if background images are added",
+        default=False,
+    )
     add_background_images: BoolProperty(
         name="Add a Background Image for each Camera",
         description="The background image is only visible by viewing the "
@@ -108,6 +139,32 @@ class CameraImportProperties:
         min=0,
         max=1,
     )
+    use_image_proxies: BoolProperty(
+        name="Use Image Proxies",
+        description="Load downscaled versions of the images for the "
+        + "background images and image planes. The proxies are cached on "
+        + "disk. Use the Photogrammetry Importer panel to load the full "
+        + "resolution images of selected cameras",
+        default=False,
+    )
+    image_proxy_max_edge: IntProperty(
+        name="Image Proxy Max Edge",
+        description="Maximum width/height (in pixels) of the image proxies",
+        default=1024,
+        min=16,
+    )
+    camera_pair_layout: EnumProperty(
+        name="Camera Pair Layout",
+        description="Choose how cameras are grouped with the corresponding "
+        + "image planes and depth maps. Pair collections create a "
+        + "collection for each camera, which slows down large imports. "
+        + "Alternatively, the image planes and depth maps are parented to "
+        + "the corresponding cameras",
+        items=(
+            ("COLLECTIONS", "Pair Collections", ""),
+            ("PARENT", "Parent to Camera", ""),
+        ),
+    )
     add_depth_maps_as_point_cloud: BoolProperty(
         name="Add Depth Maps (EXPERIMENTAL)",
         description="Add the depth map (if available) as point cloud "
@@ -269,8 +326,18 @@ class CameraImportProperties:
         import_camera_box = camera_box.box()
         import_camera_box.prop(self, "import_cameras")
         if self.import_cameras or draw_everything:
+            import_camera_box.row().prop(
+                self, "camera_visualization_type", expand=True
+            )
             import_camera_box.prop(self, "camera_extent")
+            if self.camera_visualization_type == "FRUSTA" or draw_everything:
+                import_camera_box.prop(self, "camera_frustum_color")
+        if (
+            self.import_cameras and self.camera_visualization_type == "OBJECTS"
+        ) or draw_everything:
             import_camera_box.prop(self, "add_background_images")
+            if not self.add_background_images or draw_everything:
+                import_camera_box.prop(self, "share_camera_data")
 
             image_plane_box = import_camera_box.box()
             image_plane_box.prop(self, "add_image_planes")
@@ -278,6 +345,16 @@ class CameraImportProperties:
                 image_plane_box.prop(self, "add_image_plane_emission")
                 image_plane_box.prop(self, "image_plane_transparency")
 
+            if (
+                self.add_background_images
+                or self.add_image_planes
+                or draw_everything
+            ):
+                image_proxy_box = import_camera_box.box()
+                image_proxy_box.prop(self, "use_image_proxies")
+                if self.use_image_proxies or draw_everything:
+                    image_proxy_box.prop(self, "image_proxy_max_edge")
+
             if draw_depth_map_import or draw_everything:
                 depth_map_box = import_camera_box.box()
                 depth_map_box.prop(self, "add_depth_maps_as_point_cloud")
@@ -288,6 +365,15 @@ class CameraImportProperties:
                     depth_map_box.prop(self, "depth_map_display_sparsity")
                     depth_map_box.prop(self, "depth_map_id_or_name_str")
 
+            if (
+                self.add_image_planes
+                or self.add_depth_maps_as_point_cloud
+                or draw_everything
+            ):
+                import_camera_box.row().prop(
+                    self, "camera_pair_layout", expand=True
+                )
+
         anim_box = camera_box.box()
         anim_box.prop(self, "add_camera_motion_as_animation")
 
@@ -333,7 +419,18 @@ class CameraImportProperties:
                 if self.adjust_render_settings:
                     adjust_render_settings_if_possible(cameras, op=self)
 
-                if self.import_cameras:
+                if (
+                    self.import_cameras
+                    and self.camera_visualization_type == "FRUSTA"
+                ):
+                    draw_camera_frusta(
+                        cameras,
+                        parent_collection,
+                        frustum_scale=self.camera_extent,
+                        color=self.camera_frustum_color,
+                        op=self,
+                    )
+                elif self.import_cameras:
                     add_cameras(
                         cameras,
                         parent_collection,
@@ -348,6 +445,10 @@ class CameraImportProperties:
                         depth_map_default_color=self.depth_map_default_color,
                         depth_map_display_sparsity=self.depth_map_display_sparsity,
                         depth_map_id_or_name_str=self.depth_map_id_or_name_str,
+                        use_image_proxies=self.use_image_proxies,
+                        image_proxy_max_edge=self.image_proxy_max_edge,
+                        share_camera_data=self.share_camera_data,
+                        camera_pair_layout=self.camera_pair_layout,
                         op=self,
                     )
 
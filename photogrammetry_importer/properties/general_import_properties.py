@@ -1,9 +1,25 @@
 import os
 import sys
+import time
 import bpy
+from contextlib import contextmanager
 from bpy.props import BoolProperty
+from photogrammetry_importer.utility.os_utility import get_addon_cache_dp
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_span,
+    start_profiling,
+    stop_profiling,
+)
+from photogrammetry_importer.utility.process_utility import (
+    ProcessCall,
+    ProcessCommunicationError,
+    is_process_execution_available,
+)
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
+# Seconds between two checks whether the worker process is done
+_WORKER_POLL_INTERVAL = 0.1
+
 
 class GeneralImportProperties:
     """ This class encapsulates general Blender UI properties. """
@@ -14,9 +30,175 @@ class GeneralImportProperties:
         default=False,
     )
 
+    parse_in_separate_process: BoolProperty(
+        name="Parse in Separate Process",
+        description="Parse the reconstruction in a separate Python process. "
+        "The camera poses and the points are transferred with shared "
+        "memory. Only the creation of the Blender objects is performed in "
+        "Blender's process, i.e. the user interface remains responsive "
+        "while parsing (press Esc to cancel the import). Requires Python "
+        "3.8 or newer.",
+        default=False,
+    )
+
+    use_profiling: BoolProperty(
+        name="Profile Import",
+        description="Measure the durations of the import steps and print "
+        "them as tree to the console.",
+        default=False,
+    )
+    track_memory: BoolProperty(
+        name="Track Memory",
+        description="Additionally measure the memory consumption (RSS and "
+        "peak of the memory allocated by Python) of each import step. This "
+        "slows down the import considerably.",
+        default=False,
+    )
+    write_profiling_report: BoolProperty(
+        name="Write Profiling Report",
+        description="Write the measured durations and counters as JSON file "
+        "next to the .blend file (or to the add-on cache directory, if the "
+        ".blend file has not been saved yet).",
+        default=False,
+    )
+
     def draw_general_options(self, layout):
         mesh_box = layout.box()
         mesh_box.prop(self, "adjust_clipping_distance")
+        if is_process_execution_available():
+            mesh_box.prop(self, "parse_in_separate_process")
+        mesh_box.prop(self, "use_profiling")
+        if self.use_profiling:
+            mesh_box.prop(self, "track_memory")
+            mesh_box.prop(self, "write_profiling_report")
+
+    def parse_reconstruction(self, parse_func, *args):
+        """Generator calling the parse function of a file handler.
+
+        Use :code:`result = yield from self.parse_reconstruction(...)` in
+        the import steps passed to :code:`execute_import()`.
+
+        If :code:`parse_in_separate_process` is enabled, the function is
+        called in a separate process (see :code:`ProcessCall`) and the
+        generator yields until the process is done. If this process can not
+        be started or can not transfer the result, the function is called
+        in Blender's process instead. The operator is passed as :code:`op`
+        argument of the function.
+        """
+        if self.parse_in_separate_process:
+            # Before Blender 2.91, sys.executable refers to the Blender binary
+            if bpy.app.version < (2, 91, 0):
+                python_executable = bpy.app.binary_path_python
+            else:
+                python_executable = sys.executable
+            process_call = ProcessCall(
+                parse_func,
+                args,
+                {"op": None},
+                python_executable=python_executable,
+            )
+            try:
+                with profile_span("Wait for Worker Process"):
+                    process_call.start()
+                    log_report("INFO", "Parse in a separate process", self)
+                    while not process_call.is_done():
+                        yield
+                return process_call.get_result(op=self)
+            except ProcessCommunicationError as err:
+                log_report(
+                    "WARNING",
+                    "Parsing in a separate process failed, parsing in "
+                    "Blender's process instead. " + str(err),
+                    self,
+                )
+            except RuntimeError as err:
+                # The parser failed, i.e. parsing again would fail as well
+                log_report("ERROR", str(err), self)
+                raise
+            finally:
+                # Stops the worker, if the import has been cancelled
+                process_call.terminate()
+        return parse_func(*args, op=self)
+
+    def execute_import(self, context, import_steps):
+        """Run the import steps (a generator) of an import operator.
+
+        The generator yields while it waits for a worker process (see
+        :code:`parse_reconstruction()`). In Blender's user interface, the
+        remaining steps are performed by the modal handler of the operator,
+        i.e. the user interface is not blocked while the worker parses the
+        reconstruction. Otherwise (e.g. in background mode), this method
+        waits for the worker.
+        """
+        if not self._continue_import(import_steps):
+            return {"FINISHED"}
+        if bpy.app.background or context.window is None:
+            while self._continue_import(import_steps):
+                time.sleep(_WORKER_POLL_INTERVAL)
+            return {"FINISHED"}
+
+        self._import_steps = import_steps
+        window_manager = context.window_manager
+        self._import_timer = window_manager.event_timer_add(
+            _WORKER_POLL_INTERVAL, window=context.window
+        )
+        window_manager.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type == "ESC":
+            self._stop_modal_import(context)
+            log_report("WARNING", "Import cancelled", self)
+            return {"CANCELLED"}
+        if event.type != "TIMER" or event.timer != self._import_timer:
+            return {"PASS_THROUGH"}
+        try:
+            is_running = self._continue_import(self._import_steps)
+        except Exception:
+            self._stop_modal_import(context)
+            raise
+        if is_running:
+            return {"PASS_THROUGH"}
+        self._stop_modal_import(context)
+        return {"FINISHED"}
+
+    @staticmethod
+    def _continue_import(import_steps):
+        try:
+            next(import_steps)
+        except StopIteration:
+            return False
+        return True
+
+    def _stop_modal_import(self, context):
+        # Closing the generator stops the worker (if it is still running)
+        self._import_steps.close()
+        context.window_manager.event_timer_remove(self._import_timer)
+
+    @contextmanager
+    def import_profiling(self):
+        """Context manager profiling the import (if enabled).
+
+        The profiling is stopped and the results are reported when the
+        context is left, even if the import fails.
+        """
+        if not self.use_profiling:
+            yield
+            return
+        start_profiling(self.bl_label, self.track_memory)
+        try:
+            yield
+        finally:
+            report_ofp = None
+            if self.write_profiling_report:
+                if bpy.data.filepath != "":
+                    report_ofp_stem = os.path.splitext(bpy.data.filepath)[0]
+                else:
+                    report_ofp_stem = os.path.join(
+                        get_addon_cache_dp(), "import"
+                    )
+                report_ofp = report_ofp_stem + "_profile.json"
+            stop_profiling(report_ofp, self)
 
     def apply_general_options(self):
         if self.adjust_clipping_distance:
@@ -30,11 +212,11 @@ class GeneralImportProperties:
                     break
             # Setting "active_space.clip_end" to values close to "sys.maxsize"
             # causes strange graphical artifacts in the 3D view.
-            if sys.maxsize == 2 ** 63 - 1:
+            if sys.maxsize == 2**63 - 1:
                 # 2**(63-8) = 2**55 works without artifacts
-                active_space.clip_end = 2 ** 55 - 1
+                active_space.clip_end = 2**55 - 1
             else:
-                active_space.clip_end = 2 ** 23 - 1
+                active_space.clip_end = 2**23 - 1
             log_report(
                 "INFO", "Adjust clipping distance of 3D view: Done", self
             )
@@ -2,6 +2,7 @@ import os
 import bpy
 from bpy.props import BoolProperty
 from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import profile_function
 from photogrammetry_importer.utility.blender_mesh_utility import (
     add_color_emission_to_material,
     add_mesh_vertex_color_material,
@@ -33,6 +34,7 @@ class MeshImportProperties:
         if self.import_mesh:
             mesh_box.prop(self, "add_mesh_color_emission")
 
+    @profile_function("Import Mesh")
     def import_photogrammetry_mesh(self, mesh_fp, reconstruction_collection):
         if self.import_mesh and mesh_fp is not None:
             log_report("INFO", "Importing mesh: ...", self)
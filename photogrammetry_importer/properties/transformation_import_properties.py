@@ -1,6 +1,6 @@
 import bpy
 import numpy as np
-from bpy.props import StringProperty
+from bpy.props import StringProperty, BoolProperty
 
 
 class TransformationImportProperties:
@@ -8,10 +8,20 @@ class TransformationImportProperties:
 
     path_to_transformations: StringProperty(
         name="Transformation Directory",
-        description="Path to transformations stored in .txt files",
+        description="Path to a directory with transformations stored in "
+        + ".txt files or path to a .npy file with stacked (Nx4x4) "
+        + "transformations",
         default="",
     )
+    use_transformation_cache: BoolProperty(
+        name="Cache Transformations",
+        description="Store the transformations of a directory as single "
+        + "binary file in the add-on cache directory. Subsequent imports "
+        + "of the same directory read the binary file",
+        default=True,
+    )
 
     def draw_transformation_options(self, layout):
         transformation_box = layout.box()
         transformation_box.prop(self, "path_to_transformations")
+        transformation_box.prop(self, "use_transformation_cache")
@@ -26,6 +26,9 @@ from photogrammetry_importer.operators.nvm_export_op import ExportNVMOperator
 from photogrammetry_importer.operators.colmap_export_op import (
     ExportColmapOperator,
 )
+from photogrammetry_importer.operators.point_data_export_op import (
+    ExportPointDataOperator,
+)
 
 
 # Import Functions
@@ -92,6 +95,18 @@ def visualsfm_export_operator_function(self, context):
     self.layout.operator(ExportNVMOperator.bl_idname, text="VisualSfM (.nvm)")
 
 
+def point_data_export_operator_function(self, context):
+    module_spec = importlib.util.find_spec("pylas")
+    if module_spec is not None:
+        suffix = "(.ply/.las)"
+    else:
+        suffix = "(.ply)"
+    self.layout.operator(
+        ExportPointDataOperator.bl_idname,
+        text="Point Data " + suffix,
+    )
+
+
 # Define register/unregister Functions
 def bl_idname_to_bpy_types_name(bl_idname, bpy_types_prefix):
     assert bpy_types_prefix in ["IMPORT", "EXPORT"]
@@ -218,9 +233,17 @@ def register_exporters(export_prefs):
         ExportNVMOperator,
         visualsfm_export_operator_function,
     )
+    register_exporter(
+        export_prefs.point_data_exporter_bool,
+        ExportPointDataOperator,
+        point_data_export_operator_function,
+    )
 
 
 def unregister_exporters():
     """ Unregister exporters. """
     unregister_exporter(ExportColmapOperator, colmap_export_operator_function)
     unregister_exporter(ExportNVMOperator, visualsfm_export_operator_function)
+    unregister_exporter(
+        ExportPointDataOperator, point_data_export_operator_function
+    )
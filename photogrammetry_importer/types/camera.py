@@ -3,7 +3,32 @@ __author__ = "sebastian"
 import math
 import os
 import numpy as np
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.os_utility import is_file
+from photogrammetry_importer.utility.profiling_utility import profile_function
+
+
+def _get_read_only_array(values, dtype):
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+# Default values shared by all cameras. These arrays are read-only, i.e. the
+# camera parameters must be replaced (not modified in place).
+_DEFAULT_VEC3 = _get_read_only_array([0, 0, 0], float)
+_DEFAULT_QUATERNION = _get_read_only_array([0, 0, 0, 0], float)
+_DEFAULT_MAT3 = _get_read_only_array(np.zeros((3, 3)), float)
+_DEFAULT_COLOR = _get_read_only_array([255, 255, 255], int)
+
+# Parameters of cameras created by CameraArray and the corresponding arrays
+_CAMERA_ARRAY_ATTRIBUTES = {
+    "_quaternion": "quaternions",
+    "_rotation_mat": "rotation_mats",
+    "_center": "centers",
+    "_translation_vec": "translation_vecs",
+    "_calibration_mat": "calibration_mats",
+}
 
 
 class Camera(object):
@@ -11,8 +36,43 @@ class Camera(object):
     This class represents a reconstructed camera and provides functionality
     to manage intrinsic and extrinsic camera parameters as well as image
     information.
+
+    In order to reduce the memory consumption and the construction time of
+    large reconstructions, the class uses :code:`__slots__` and the default
+    parameters refer to shared read-only arrays. Cameras created by
+    :code:`CameraArray` store only the camera array and their index. The
+    views into the rows of the pose and calibration arrays are created on
+    first access.
     """
 
+    __slots__ = (
+        "_center",
+        "_translation_vec",
+        "normal",
+        "color",
+        "_quaternion",
+        "_rotation_mat",
+        "_calibration_mat",
+        "_radial_distortion",
+        "image_fp_type",
+        "image_dp",
+        "_relative_fp",
+        "_absolute_fp",
+        "_undistorted_relative_fp",
+        "_undistorted_absolute_fp",
+        "width",
+        "height",
+        "panoramic_type",
+        "depth_map_fp",
+        "depth_map_callback",
+        "depth_map_semantic",
+        "shift_depth_map_to_pixel_center",
+        "id",
+        "view_index",
+        "_camera_array",
+        "_array_index",
+    )
+
     panoramic_type_equirectangular = "EQUIRECTANGULAR"
 
     IMAGE_FP_TYPE_NAME = "NAME"
@@ -23,16 +83,16 @@ class Camera(object):
     DEPTH_MAP_WRT_CANONICAL_VECTORS = "DEPTH_MAP_WRT_CANONICAL_VECTORS"
 
     def __init__(self):
-        self._center = np.array([0, 0, 0], dtype=float)  # C = -R^T t
-        self._translation_vec = np.array([0, 0, 0], dtype=float)  # t = -R C
-        self.normal = np.array([0, 0, 0], dtype=float)
-        self.color = np.array([255, 255, 255], dtype=int)
+        self._center = _DEFAULT_VEC3  # C = -R^T t
+        self._translation_vec = _DEFAULT_VEC3  # t = -R C
+        self.normal = _DEFAULT_VEC3
+        self.color = _DEFAULT_COLOR
 
         # Use these attributes ONLY with getter and setter methods
-        self._quaternion = np.array([0, 0, 0, 0], dtype=float)
-        self._rotation_mat = np.zeros((3, 3), dtype=float)
+        self._quaternion = _DEFAULT_QUATERNION
+        self._rotation_mat = _DEFAULT_MAT3
 
-        self._calibration_mat = np.zeros((3, 3), dtype=float)
+        self._calibration_mat = _DEFAULT_MAT3
 
         self.image_fp_type = None
         self.image_dp = None
@@ -52,6 +112,55 @@ class Camera(object):
         self.shift_depth_map_to_pixel_center = None
 
         self.id = None  # A unique identifier (natural number)
+        self.view_index = None
+
+        # Use these attributes ONLY with _set_camera_array()
+        self._camera_array = None
+        self._array_index = None
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set, i.e. for parameters of
+        # cameras referring to a camera array, whose views are not created yet
+        array_name = _CAMERA_ARRAY_ATTRIBUTES.get(name)
+        if array_name is None or self._camera_array is None:
+            raise AttributeError(name)
+        value = getattr(self._camera_array, array_name)[self._array_index]
+        setattr(self, name, value)
+        return value
+
+    def _set_camera_array(self, camera_array, array_index):
+        """Refer to the pose and calibration at the index of the camera array.
+
+        Previously set poses and calibrations are removed. If
+        :code:`camera_array` is :code:`None`, the parameters must be set with
+        the setters (or with another call of this method).
+        """
+        self._camera_array = camera_array
+        self._array_index = array_index
+        for name in _CAMERA_ARRAY_ATTRIBUTES:
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
+
+    def _is_view_of_camera_array(self, camera_array, array_index):
+        """Return whether the pose and calibration refer to the array row."""
+        if (
+            self._camera_array is not camera_array
+            or self._array_index != array_index
+        ):
+            return False
+        for name, array_name in _CAMERA_ARRAY_ATTRIBUTES.items():
+            try:
+                # Does not create views that have not been accessed yet
+                value = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            array = getattr(camera_array, array_name)
+            if not np.may_share_memory(value, array):
+                # The view has been replaced by a setter
+                return False
+        return True
 
     def __repr__(self):
         return self.__str__()
@@ -140,7 +249,7 @@ class Camera(object):
             fp = self._get_absolute_fp(
                 self._undistorted_relative_fp, self._undistorted_absolute_fp
             )
-            if os.path.isfile(fp):
+            if is_file(fp):
                 has_fp = True
         return has_fp
 
@@ -192,6 +301,8 @@ class Camera(object):
         self._calibration_mat = calibration_mat
 
     def set_principal_point(self, principal_point):
+        if not self._calibration_mat.flags.writeable:
+            self._calibration_mat = self._calibration_mat.copy()
         self._calibration_mat[0][2] = principal_point[0]
         self._calibration_mat[1][2] = principal_point[1]
 
@@ -377,6 +488,7 @@ class Camera(object):
         homogeneous_mat[0:3, 3] = self.get_camera_center()
         return homogeneous_mat
 
+    @profile_function("Back-Project Depth Map")
     def convert_depth_map_to_world_coords(
         self, depth_map_display_sparsity=100
     ):
@@ -0,0 +1,149 @@
+import numpy as np
+
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.utility.rotation_utility import (
+    quaternions_to_rotation_matrices,
+    rotation_matrices_to_quaternions,
+    are_rotation_matrices_valid,
+)
+
+
+class CameraArray:
+    """
+    This class stores the parameters of many cameras in contiguous arrays,
+    which allows to process the poses of whole reconstructions at once.
+
+    The :code:`Camera` objects returned by :code:`get_camera()` and
+    :code:`get_cameras()` are views, i.e. the poses and intrinsics of these
+    cameras refer to the rows of the arrays. The views are created when the
+    camera accesses the corresponding parameter. Note that the setters of
+    :code:`Camera` replace the views of the corresponding camera.
+    """
+
+    def __init__(self, num_cameras):
+        self.quaternions = np.zeros((num_cameras, 4), dtype=float)
+        self.rotation_mats = np.zeros((num_cameras, 3, 3), dtype=float)
+        self.centers = np.zeros((num_cameras, 3), dtype=float)
+        self.translation_vecs = np.zeros((num_cameras, 3), dtype=float)
+        self.calibration_mats = np.zeros((num_cameras, 3, 3), dtype=float)
+        self.radial_distortions = np.zeros(num_cameras, dtype=float)
+
+    def __len__(self):
+        return self.quaternions.shape[0]
+
+    @classmethod
+    def from_cameras(cls, cameras):
+        """Create an array with the parameters of the given cameras.
+
+        If the cameras are the (unmodified) views returned by
+        :code:`get_cameras()` of a camera array, this array is returned
+        instead of a copy.
+        """
+        if len(cameras) > 0:
+            camera_array = cameras[0]._camera_array
+            if (
+                camera_array is not None
+                and len(camera_array) == len(cameras)
+                and all(
+                    camera._is_view_of_camera_array(camera_array, index)
+                    for index, camera in enumerate(cameras)
+                )
+            ):
+                return camera_array
+        camera_array = cls(len(cameras))
+        for index, camera in enumerate(cameras):
+            camera_array.quaternions[index] = camera.get_quaternion()
+            camera_array.rotation_mats[index] = camera.get_rotation_mat()
+            camera_array.centers[index] = camera.get_camera_center()
+            camera_array.translation_vecs[index] = camera.get_translation_vec()
+            camera_array.calibration_mats[index] = camera._calibration_mat
+        return camera_array
+
+    def set_quaternions(self, quaternions):
+        """Set the quaternions (w, x, y, z) and the rotation matrices."""
+        quaternions = np.reshape(quaternions, (-1, 4))
+        self.quaternions[:] = quaternions
+        self.rotation_mats[:] = quaternions_to_rotation_matrices(quaternions)
+
+    def set_rotation_mats(self, rotation_mats, check_rotation=True):
+        """Set the rotation matrices and the quaternions."""
+        rotation_mats = np.reshape(rotation_mats, (-1, 3, 3))
+        if check_rotation:
+            assert np.all(are_rotation_matrices_valid(rotation_mats))
+        self.rotation_mats[:] = rotation_mats
+        self.quaternions[:] = rotation_matrices_to_quaternions(rotation_mats)
+
+    def set_camera_centers_after_rotation(self, centers, check_rotation=True):
+        """Set the camera centers and the translation vectors (t = -R C)."""
+        if check_rotation:
+            assert np.all(are_rotation_matrices_valid(self.rotation_mats))
+        self.centers[:] = np.reshape(centers, (-1, 3))
+        self.translation_vecs[:] = -np.einsum(
+            "nij,nj->ni", self.rotation_mats, self.centers
+        )
+
+    def set_camera_translation_vectors_after_rotation(
+        self, translation_vecs, check_rotation=True
+    ):
+        """Set the translation vectors and the camera centers (C = -R^T t)."""
+        if check_rotation:
+            assert np.all(are_rotation_matrices_valid(self.rotation_mats))
+        self.translation_vecs[:] = np.reshape(translation_vecs, (-1, 3))
+        self.centers[:] = -np.einsum(
+            "nji,nj->ni", self.rotation_mats, self.translation_vecs
+        )
+
+    def set_calibration_mats(self, calibration_mats):
+        """Set the calibration matrices (a single matrix is broadcasted)."""
+        self.calibration_mats[:] = np.reshape(calibration_mats, (-1, 3, 3))
+
+    def set_radial_distortions(self, radial_distortions):
+        """Set the radial distortions (a single value is broadcasted)."""
+        self.radial_distortions[:] = radial_distortions
+
+    def get_view_directions(self):
+        """Return the viewing directions in world coordinates.
+
+        The viewing direction corresponds to the positive z axis of the
+        (computer vision) camera coordinate system, i.e. to R^T [0, 0, 1]^T.
+        """
+        return self.rotation_mats[:, 2, :].copy()
+
+    def get_4x4_cam_to_world_mats(self):
+        """Return the (N, 4, 4) camera to world matrices."""
+        # M = [R^T    c]
+        #     [0      1]
+        cam_to_world_mats = np.zeros((len(self), 4, 4), dtype=float)
+        cam_to_world_mats[:, 0:3, 0:3] = np.transpose(
+            self.rotation_mats, (0, 2, 1)
+        )
+        cam_to_world_mats[:, 0:3, 3] = self.centers
+        cam_to_world_mats[:, 3, 3] = 1.0
+        return cam_to_world_mats
+
+    def compute_camera_matrix_worlds(self, convert_coordinate_system=True):
+        """Compute the world matrices of all cameras.
+
+        Vectorized version of :code:`compute_camera_matrix_world()`.
+
+        :return: Array with (N, 4, 4) matrices.
+        """
+        cam_to_world_mats = self.get_4x4_cam_to_world_mats()
+        if convert_coordinate_system:
+            # Transform the camera coordinate system from computer vision
+            # camera coordinate frames to the computer graphics camera
+            # coordinate frames, i.e. invert the y and z axis of the camera
+            cam_to_world_mats[:, 0:3, 1:3] *= -1
+        return cam_to_world_mats
+
+    def get_camera(self, index):
+        """Return a :code:`Camera` viewing the parameters at the index."""
+        camera = Camera()
+        # The views into the rows are created when the camera accesses them
+        camera._set_camera_array(self, index)
+        camera._radial_distortion = float(self.radial_distortions[index])
+        return camera
+
+    def get_cameras(self):
+        """Return a list of :code:`Camera` views (one for each index)."""
+        return [self.get_camera(index) for index in range(len(self))]
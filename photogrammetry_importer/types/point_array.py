@@ -0,0 +1,98 @@
+import numpy as np
+
+from photogrammetry_importer.types.point import Point
+
+
+class PointArray:
+    """
+    This class stores the coordinates, colors and ids of many points in
+    contiguous arrays (i.e. in a columnar layout).
+
+    Iterating over a point array yields :code:`Point` objects, which allows
+    to use point arrays with functions expecting lists of points.
+    """
+
+    def __init__(self, coords, colors=None, ids=None):
+        self.coords = np.asarray(coords, dtype=float).reshape((-1, 3))
+        num_points = self.coords.shape[0]
+        if colors is None:
+            colors = np.zeros((num_points, 3), dtype=np.uint8)
+        self.colors = np.asarray(colors).reshape((-1, 3))
+        if ids is None:
+            ids = np.arange(num_points)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        assert self.colors.shape[0] == num_points
+        assert self.ids.shape[0] == num_points
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def __getitem__(self, key):
+        """Return a :code:`Point` (integer index) or a point array (slice).
+
+        The arrays of the returned point array are views, which allows to
+        subsample large point clouds without copying them.
+        """
+        if isinstance(key, slice):
+            return PointArray(
+                self.coords[key], self.colors[key], self.ids[key]
+            )
+        return Point(
+            coord=self.coords[key],
+            color=self.colors[key].tolist(),
+            id=int(self.ids[key]),
+            scalars=[],
+        )
+
+    def __iter__(self):
+        colors = self.colors.tolist()
+        ids = self.ids.tolist()
+        for index, coord in enumerate(self.coords):
+            yield Point(
+                coord=coord, color=colors[index], id=ids[index], scalars=[]
+            )
+
+    @classmethod
+    def from_points(cls, points):
+        """Create a point array from a list of :code:`Point` objects.
+
+        The colors keep their values (e.g. 16 bit colors of :code:`.las` or
+        :code:`.ply` files). Integer colors are stored with the smallest
+        unsigned integer type representing all values.
+        """
+        if isinstance(points, PointArray):
+            return points
+        num_points = len(points)
+        coords = np.empty((num_points, 3), dtype=float)
+        ids = np.empty(num_points, dtype=np.int64)
+        for index, point in enumerate(points):
+            coords[index] = point.coord
+            ids[index] = point.id
+        colors = np.asarray([point.color for point in points])
+        colors = colors.reshape((num_points, 3))
+        if colors.dtype.kind in "iu" and num_points > 0 and colors.min() >= 0:
+            colors = colors.astype(np.min_scalar_type(colors.max()))
+        return cls(coords, colors, ids)
+
+    @classmethod
+    def concatenate(cls, point_arrays):
+        """Concatenate point arrays and assign consecutive ids."""
+        if len(point_arrays) == 0:
+            return cls(np.zeros((0, 3), dtype=float))
+        coords = np.concatenate([pa.coords for pa in point_arrays])
+        colors = np.concatenate([pa.colors for pa in point_arrays])
+        return cls(coords, colors)
+
+    def get_rgba_colors(self):
+        """Return the colors as (N, 4) RGBA array used by Blender.
+
+        Like :code:`Point.split_points()`, the color values are divided by
+        255 and the alpha values are set to 1.
+        """
+        rgba_colors = np.ones((len(self), 4), dtype=np.float32)
+        rgba_colors[:, 0:3] = self.colors / 255.0
+        return rgba_colors
+
+    def get_points(self):
+        """Return a list of :code:`Point` objects."""
+        return list(self)
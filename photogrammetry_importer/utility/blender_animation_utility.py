@@ -1,8 +1,29 @@
+import numpy as np
 import bpy
-from mathutils import Quaternion
-from mathutils import Matrix
+from photogrammetry_importer.utility.rotation_utility import (
+    decompose_transformation_matrices,
+    remove_quaternion_sign_flips,
+)
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
+# Values of the enum eBezTriple_Interpolation (DNA_curve_types.h), which are
+# required to set the interpolation of keyframes with foreach_set()
+_INTERPOLATION_TYPE_TO_VALUE = {
+    "CONSTANT": 0,
+    "LINEAR": 1,
+    "BEZIER": 2,
+    "BACK": 3,
+    "BOUNCE": 4,
+    "CIRC": 5,
+    "CUBIC": 6,
+    "ELASTIC": 7,
+    "EXPO": 8,
+    "QUAD": 9,
+    "QUART": 10,
+    "QUINT": 11,
+    "SINE": 12,
+}
+
 
 def remove_quaternion_discontinuities(target_obj):
 
@@ -13,47 +34,30 @@ def remove_quaternion_discontinuities(target_obj):
     action = target_obj.animation_data.action
 
     # quaternion curves
-    fqw = action.fcurves.find("rotation_quaternion", index=0)
-    fqx = action.fcurves.find("rotation_quaternion", index=1)
-    fqy = action.fcurves.find("rotation_quaternion", index=2)
-    fqz = action.fcurves.find("rotation_quaternion", index=3)
+    fcurves = [
+        action.fcurves.find("rotation_quaternion", index=index)
+        for index in range(4)
+    ]
+    num_keyframes = len(fcurves[0].keyframe_points)
+    if num_keyframes == 0:
+        return
+
+    # Read the keyframes of all curves at once, i.e. avoid accessing each
+    # keyframe with Python
+    co_list = []
+    for fcurve in fcurves:
+        co = np.empty(2 * num_keyframes, dtype=np.float32)
+        fcurve.keyframe_points.foreach_get("co", co)
+        co_list.append(co)
+    quaternions = np.stack([co[1::2] for co in co_list], axis=1)
 
     # invert quaternion so that interpolation takes the shortest path
-    if len(fqw.keyframe_points) > 0:
-        current_quat = Quaternion(
-            (
-                fqw.keyframe_points[0].co[1],
-                fqx.keyframe_points[0].co[1],
-                fqy.keyframe_points[0].co[1],
-                fqz.keyframe_points[0].co[1],
-            )
-        )
+    quaternions = remove_quaternion_sign_flips(quaternions)
 
-        for i in range(len(fqw.keyframe_points) - 1):
-            last_quat = current_quat
-            current_quat = Quaternion(
-                (
-                    fqw.keyframe_points[i + 1].co[1],
-                    fqx.keyframe_points[i + 1].co[1],
-                    fqy.keyframe_points[i + 1].co[1],
-                    fqz.keyframe_points[i + 1].co[1],
-                )
-            )
-
-            if last_quat.dot(current_quat) < 0:
-                current_quat.negate()
-                fqw.keyframe_points[i + 1].co[1] = -fqw.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqx.keyframe_points[i + 1].co[1] = -fqx.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqy.keyframe_points[i + 1].co[1] = -fqy.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqz.keyframe_points[i + 1].co[1] = -fqz.keyframe_points[
-                    i + 1
-                ].co[1]
+    for index, (fcurve, co) in enumerate(zip(fcurves, co_list)):
+        co[1::2] = quaternions[:, index]
+        fcurve.keyframe_points.foreach_set("co", co)
+        fcurve.update()
 
 
 def set_fcurve_interpolation(some_obj, interpolation_type="LINEAR"):
@@ -67,14 +71,75 @@ def set_fcurve_interpolation(some_obj, interpolation_type="LINEAR"):
             kf.interpolation = interpolation_type
 
 
+def add_fcurve_keyframes(
+    id_data,
+    data_path,
+    index,
+    frames,
+    values,
+    interpolation_type=None,
+    action_group="",
+):
+    """Write the keyframes of an F-Curve with a single bulk operation.
+
+    This is much faster than calling :code:`keyframe_insert()` for each
+    frame. An existing F-Curve with the same data path and index is replaced.
+    """
+    animation_data = id_data.animation_data
+    if animation_data is None:
+        animation_data = id_data.animation_data_create()
+    if animation_data.action is None:
+        animation_data.action = bpy.data.actions.new(id_data.name + "Action")
+    fcurves = animation_data.action.fcurves
+    fcurve = fcurves.find(data_path, index=index)
+    if fcurve is not None:
+        fcurves.remove(fcurve)
+    fcurve = fcurves.new(data_path, index=index, action_group=action_group)
+
+    num_keyframes = len(frames)
+    keyframe_points = fcurve.keyframe_points
+    keyframe_points.add(num_keyframes)
+    co = np.empty(2 * num_keyframes, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    keyframe_points.foreach_set("co", co)
+
+    if interpolation_type is not None:
+        interpolation = np.full(
+            num_keyframes,
+            _INTERPOLATION_TYPE_TO_VALUE[interpolation_type],
+            dtype=np.int32,
+        )
+        keyframe_points.foreach_set("interpolation", interpolation)
+
+    # Sort the keyframes and recompute the handles
+    fcurve.update()
+    return fcurve
+
+
+def _get_keyframe_indices(values_sorted, step_size, mask=None):
+    # Entries without value (i.e. None or masked entries) are skipped, but the
+    # frame numbers of the following entries are not affected
+    if mask is None:
+        mask = [value is not None for value in values_sorted]
+    indices = np.flatnonzero(np.asarray(mask, dtype=bool))
+    return indices, (indices + 1) * step_size
+
+
 def add_transformation_animation(
     animated_obj_name,
     transformations_sorted,
     number_interpolation_frames,
     interpolation_type=None,
     remove_rotation_discontinuities=True,
+    transformation_mask=None,
     op=None,
 ):
+    """Add an animation reflecting the transformations.
+
+    Missing transformations are either represented by :code:`None` entries
+    or by the (optional) boolean :code:`transformation_mask`.
+    """
     log_report("INFO", "Adding transformation animation: ...", op)
 
     scene = bpy.context.scene
@@ -83,41 +148,46 @@ def add_transformation_animation(
     scene.frame_end = step_size * len(transformations_sorted)
     animated_obj = bpy.data.objects[animated_obj_name]
 
-    for index, transformation in enumerate(transformations_sorted):
-        # log_report('INFO', 'index: ' + str(index), op)
-        # log_report('INFO', 'transformation: ' + str(transformation), op)
-
-        current_keyframe_index = (index + 1) * step_size
-
-        if transformation is None:
-            continue
-
-        animated_obj.matrix_world = Matrix(transformation)
-
-        animated_obj.keyframe_insert(
-            data_path="location", index=-1, frame=current_keyframe_index
+    indices, frames = _get_keyframe_indices(
+        transformations_sorted, step_size, transformation_mask
+    )
+    if len(indices) == 0:
+        log_report("INFO", "Adding transformation animation: Done", op)
+        return
+
+    transformation_mats = np.array(
+        [transformations_sorted[index] for index in indices], dtype=float
+    )
+    # Don't use euler rotations, they show too many discontinuties
+    locations, quaternions, _ = decompose_transformation_matrices(
+        transformation_mats
+    )
+    if remove_rotation_discontinuities:
+        # q and -q represent the same rotation
+        quaternions = remove_quaternion_sign_flips(quaternions)
+
+    animated_obj.rotation_mode = "QUATERNION"
+    for index in range(3):
+        add_fcurve_keyframes(
+            animated_obj,
+            "location",
+            index,
+            frames,
+            locations[:, index],
+            interpolation_type,
+            action_group="Object Transforms",
         )
-
-        # Don't use euler rotations, they show too many discontinuties
-        # animated_obj.keyframe_insert(
-        #   data_path="rotation_euler",
-        #   index=-1,
-        #   frame=current_keyframe_index)
-
-        animated_obj.rotation_mode = "QUATERNION"
-        animated_obj.keyframe_insert(
-            data_path="rotation_quaternion",
-            index=-1,
-            frame=current_keyframe_index,
+    for index in range(4):
+        add_fcurve_keyframes(
+            animated_obj,
+            "rotation_quaternion",
+            index,
+            frames,
+            quaternions[:, index],
+            interpolation_type,
+            action_group="Object Transforms",
         )
 
-        if remove_rotation_discontinuities:
-            # q and -q represent the same rotation
-            remove_quaternion_discontinuities(animated_obj)
-
-        if interpolation_type is not None:
-            set_fcurve_interpolation(animated_obj, interpolation_type)
-
     log_report("INFO", "Adding transformation animation: Done", op)
 
 
@@ -129,25 +199,35 @@ def add_camera_intrinsics_animation(
 
     step_size = number_interpolation_frames + 1
     animated_obj = bpy.data.objects[animated_obj_name]
+    camera_data = animated_obj.data
 
-    for index, intrinsics in enumerate(intrinsics_sorted):
-        current_keyframe_index = (index + 1) * step_size
-
-        if intrinsics is None:
-            continue
-
-        animated_obj.data.angle = intrinsics.field_of_view
-        animated_obj.data.shift_x = intrinsics.shift_x
-        animated_obj.data.shift_y = intrinsics.shift_y
-
-        animated_obj.data.keyframe_insert(
-            data_path="lens", index=-1, frame=current_keyframe_index
-        )
-        animated_obj.data.keyframe_insert(
-            data_path="shift_x", index=-1, frame=current_keyframe_index
-        )
-        animated_obj.data.keyframe_insert(
-            data_path="shift_y", index=-1, frame=current_keyframe_index
+    indices, frames = _get_keyframe_indices(intrinsics_sorted, step_size)
+    if len(indices) == 0:
+        log_report(
+            "INFO", "Adding camera intrinsic parameter animation: Done", op
         )
+        return
+
+    field_of_views = np.array(
+        [intrinsics_sorted[index].field_of_view for index in indices]
+    )
+    shifts_x = np.array(
+        [intrinsics_sorted[index].shift_x for index in indices]
+    )
+    shifts_y = np.array(
+        [intrinsics_sorted[index].shift_y for index in indices]
+    )
+
+    # Convert the field of view to the focal length (in mm) in the same way
+    # as the "angle" property of Blender cameras
+    if camera_data.sensor_fit == "VERTICAL":
+        sensor_size = camera_data.sensor_height
+    else:
+        sensor_size = camera_data.sensor_width
+    lenses = (sensor_size / 2.0) / np.tan(field_of_views / 2.0)
+
+    add_fcurve_keyframes(camera_data, "lens", 0, frames, lenses)
+    add_fcurve_keyframes(camera_data, "shift_x", 0, frames, shifts_x)
+    add_fcurve_keyframes(camera_data, "shift_y", 0, frames, shifts_y)
 
     log_report("INFO", "Adding camera intrinsic parameter animation: Done", op)
@@ -1,15 +1,18 @@
 import os
 import math
 import bpy
+from bpy.app.handlers import persistent
 import colorsys
 import numpy as np
-from mathutils import Vector
+from mathutils import Vector, Matrix
 from collections import namedtuple
 
 from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_array import CameraArray
 
 from photogrammetry_importer.utility.os_utility import (
     get_image_file_paths_in_dir,
+    is_file,
 )
 from photogrammetry_importer.utility.blender_utility import (
     compute_camera_matrix_world,
@@ -20,12 +23,27 @@ from photogrammetry_importer.utility.blender_animation_utility import (
     add_transformation_animation,
     add_camera_intrinsics_animation,
 )
-from photogrammetry_importer.utility.blender_opengl_utility import draw_coords
+from photogrammetry_importer.utility.blender_opengl_utility import (
+    draw_coords,
+    get_camera_frusta_parameters,
+)
+from photogrammetry_importer.utility.image_proxy_utility import (
+    create_image_proxies,
+)
 from photogrammetry_importer.utility.stop_watch import StopWatch
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+    increment_counter,
+)
 from photogrammetry_importer.utility.type_utility import is_int
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
+ORIGINAL_IMAGE_FP_PROPERTY_NAME = "photogrammetry_importer_original_fp"
+IMAGE_PLANE_NODE_GROUP_NAME = "Image Plane Shader"
+IMAGE_PLANE_TEXTURE_NODE_NAME = "Image Plane Texture"
+
+
 class DummyCamera(object):
     def __init__(self):
         self._relative_fp = None
@@ -91,6 +109,20 @@ def compute_shift(camera, relativ_to_largest_extend):
     return shift_x, shift_y
 
 
+def _get_camera_data_key(camera):
+    if camera.is_panoramic():
+        focal_length = None
+    else:
+        focal_length = camera.get_focal_length()
+    return (
+        focal_length,
+        tuple(camera.get_principal_point().tolist()),
+        camera.width,
+        camera.height,
+        camera.get_panoramic_type(),
+    )
+
+
 def add_single_camera(camera_name, camera, op=None):
     # Add camera:
     bcamera = bpy.data.cameras.new(camera_name)
@@ -151,6 +183,7 @@ def enhance_cameras_with_dummy_cameras(
     return cameras
 
 
+@profile_function("Add Camera Animation")
 def add_camera_animation(
     cameras,
     parent_collection,
@@ -276,6 +309,106 @@ def color_from_value(val, min_val, max_val):
     return r, g, b, 1
 
 
+def _get_image_fp_of_camera(camera):
+    if camera.has_undistorted_absolute_fp():
+        return camera.get_undistored_absolute_fp()
+    else:
+        return camera.get_absolute_fp()
+
+
+def load_image(image_fp, proxy_fp=None):
+    """Load an image (or a downscaled proxy of it) into Blender.
+
+    The path of the original image is stored as custom property of proxy
+    images, which allows to load the full resolution later on.
+    """
+    if proxy_fp is None or proxy_fp == image_fp:
+        return bpy.data.images.load(image_fp)
+    blender_image = bpy.data.images.load(proxy_fp)
+    blender_image.name = os.path.basename(image_fp)
+    blender_image[ORIGINAL_IMAGE_FP_PROPERTY_NAME] = image_fp
+    return blender_image
+
+
+def _get_images_of_objects(objs):
+    name_to_image = {}
+    for obj in objs:
+        if obj.type == "CAMERA":
+            for background_image in obj.data.background_images:
+                if background_image.image is not None:
+                    image = background_image.image
+                    name_to_image[image.name] = image
+        for material_slot in obj.material_slots:
+            material = material_slot.material
+            if material is None or material.node_tree is None:
+                continue
+            for node in material.node_tree.nodes:
+                if node.type == "TEX_IMAGE" and node.image is not None:
+                    name_to_image[node.image.name] = node.image
+    return name_to_image.values()
+
+
+def load_full_resolution_images(objs, op=None):
+    """Replace the image proxies used by the objects with the originals.
+
+    Considers the background images of cameras and the textures of image
+    planes.
+    """
+    num_replaced = 0
+    for image in _get_images_of_objects(objs):
+        original_fp = image.get(ORIGINAL_IMAGE_FP_PROPERTY_NAME)
+        if original_fp is None:
+            continue
+        if not os.path.isfile(original_fp):
+            log_report(
+                "WARNING", "Could not find image at " + str(original_fp), op
+            )
+            continue
+        image.filepath = original_fp
+        image.reload()
+        del image[ORIGINAL_IMAGE_FP_PROPERTY_NAME]
+        num_replaced += 1
+    log_report(
+        "INFO", "Loaded " + str(num_replaced) + " full resolution images", op
+    )
+    return num_replaced
+
+
+@persistent
+def restore_missing_image_proxies(dummy):
+    """Replace missing image proxies with the original images.
+
+    The proxies are stored in the cache directory of the user, i.e. they
+    are not available if the :code:`.blend` file is opened by another user
+    or on another machine (or if the cache has been cleared).
+    """
+    for image in bpy.data.images:
+        original_fp = image.get(ORIGINAL_IMAGE_FP_PROPERTY_NAME)
+        if original_fp is None:
+            continue
+        if os.path.isfile(bpy.path.abspath(image.filepath)):
+            continue
+        if not os.path.isfile(original_fp):
+            log_report(
+                "WARNING",
+                "Could not find image proxy or image at " + str(original_fp),
+            )
+            continue
+        image.filepath = original_fp
+        image.reload()
+        del image[ORIGINAL_IMAGE_FP_PROPERTY_NAME]
+        log_report("INFO", "Missing image proxy replaced by " + original_fp)
+
+
+def _set_parent_keep_transform(obj, parent_obj):
+    obj.parent = parent_obj
+    # The world matrix of the parent is only updated with the next depsgraph
+    # evaluation, while the basis matrix reflects the current location,
+    # rotation and scale (the parent itself has no parent)
+    obj.matrix_parent_inverse = parent_obj.matrix_basis.inverted()
+
+
+@profile_function("Add Cameras")
 def add_cameras(
     cameras,
     parent_collection,
@@ -294,6 +427,10 @@ def add_cameras(
     depth_map_default_color=(1.0, 0.0, 0.0),
     depth_map_display_sparsity=10,
     depth_map_id_or_name_str="",
+    use_image_proxies=False,
+    image_proxy_max_edge=1024,
+    share_camera_data=False,
+    camera_pair_layout="COLLECTIONS",
     op=None,
 ):
 
@@ -307,10 +444,14 @@ def add_cameras(
     :param convert_camera_coordinate_system:
     :param camera_collection_name:
     :param image_plane_collection_name:
+    :param camera_pair_layout: "COLLECTIONS" groups each camera and the
+        corresponding image plane / depth map in a separate collection.
+        "PARENT" parents the image plane / depth map to the camera, which
+        avoids the creation of a collection per camera.
     :return:
     """
     log_report("INFO", "Adding Cameras: ...")
-    stop_watch = StopWatch()
+    increment_counter("cameras", len(cameras))
     camera_collection = add_collection(
         camera_collection_name, parent_collection
     )
@@ -320,9 +461,14 @@ def add_cameras(
         image_planes_collection = add_collection(
             image_plane_collection_name, parent_collection
         )
-        camera_image_plane_pair_collection = add_collection(
-            "Camera Image Plane Pair Collection", parent_collection
+        bpy.context.scene.render.engine = "CYCLES"
+        image_plane_material_template = create_image_plane_material_template(
+            image_plane_transparency, add_image_plane_emission
         )
+        if camera_pair_layout == "COLLECTIONS":
+            camera_image_plane_pair_collection = add_collection(
+                "Camera Image Plane Pair Collection", parent_collection
+            )
     else:
         log_report("INFO", "Adding image planes: False")
 
@@ -331,9 +477,10 @@ def add_cameras(
         depth_map_collection = add_collection(
             depth_map_collection_name, parent_collection
         )
-        camera_depth_map_pair_collection = add_collection(
-            "Camera Depth Map Pair Collection", parent_collection
-        )
+        if camera_pair_layout == "COLLECTIONS":
+            camera_depth_map_pair_collection = add_collection(
+                "Camera Depth Map Pair Collection", parent_collection
+            )
     else:
         log_report("INFO", "Adding depth maps as point cloud: False")
 
@@ -362,6 +509,34 @@ def add_cameras(
                         + str(cam_rel_fp_to_idx.keys()),
                     )
 
+    if use_image_proxies and (add_image_planes or add_background_images):
+        image_fp_to_proxy_fp = create_image_proxies(
+            [
+                image_fp
+                for image_fp in map(_get_image_fp_of_camera, cameras)
+                if is_file(image_fp)
+            ],
+            image_proxy_max_edge,
+            op=op,
+        )
+    else:
+        image_fp_to_proxy_fp = {}
+
+    # Background images are stored in the camera data, i.e. the camera data
+    # can only be shared if no background images are added
+    share_camera_data = share_camera_data and not add_background_images
+    camera_data_key_to_bcamera = {}
+
+    log_report("INFO", "Camera pair layout: " + camera_pair_layout)
+    object_stop_watch = StopWatch()
+    num_objects = 0
+
+    # Compute the world matrices of all cameras at once. Cameras created by
+    # a camera array (e.g. by the Colmap and NVM parsers) reuse this array.
+    matrix_worlds = CameraArray.from_cameras(
+        cameras
+    ).compute_camera_matrix_worlds()
+
     # Adding cameras and image planes:
     for index, camera in enumerate(cameras):
 
@@ -369,25 +544,36 @@ def add_cameras(
         # Replace the camera name so it matches the image name (without extension)
         blender_image_name_stem = camera.get_blender_obj_gui_str()
         camera_name = blender_image_name_stem + "_cam"
-        bcamera = add_single_camera(camera_name, camera, op)
+        if share_camera_data:
+            camera_data_key = _get_camera_data_key(camera)
+            bcamera = camera_data_key_to_bcamera.get(camera_data_key)
+            if bcamera is None:
+                bcamera = add_single_camera(
+                    "Shared Camera Data %d" % len(camera_data_key_to_bcamera),
+                    camera,
+                    op,
+                )
+                camera_data_key_to_bcamera[camera_data_key] = bcamera
+        else:
+            bcamera = add_single_camera(camera_name, camera, op)
         camera_object = add_obj(bcamera, camera_name, camera_collection)
-        matrix_world = compute_camera_matrix_world(camera)
+        matrix_world = Matrix(matrix_worlds[index].tolist())
         camera_object.matrix_world = matrix_world
         camera_object.scale *= camera_scale
+        num_objects += 1
 
         if not add_image_planes and not add_background_images:
             continue
 
-        if camera.has_undistorted_absolute_fp():
-            image_path = camera.get_undistored_absolute_fp()
-        else:
-            image_path = camera.get_absolute_fp()
+        image_path = _get_image_fp_of_camera(camera)
 
-        if not os.path.isfile(image_path):
+        if not is_file(image_path):
             log_report("WARNING", "Could not find image at " + str(image_path))
             continue
 
-        blender_image = bpy.data.images.load(image_path)
+        blender_image = load_image(
+            image_path, image_fp_to_proxy_fp.get(image_path)
+        )
 
         if add_background_images:
             camera_data = bpy.data.objects[camera_name].data
@@ -396,13 +582,6 @@ def add_cameras(
             background_image.image = blender_image
 
         if add_image_planes and not camera.is_panoramic():
-            # Group image plane and camera:
-            camera_image_plane_pair_collection_current = add_collection(
-                "Camera Image Plane Pair Collection %s"
-                % blender_image_name_stem,
-                camera_image_plane_pair_collection,
-            )
-
             image_plane_name = blender_image_name_stem + "_image_plane"
 
             image_plane_obj = add_camera_image_plane(
@@ -413,15 +592,26 @@ def add_cameras(
                 transparency=image_plane_transparency,
                 add_image_plane_emission=add_image_plane_emission,
                 image_planes_collection=image_planes_collection,
+                image_plane_material_template=image_plane_material_template,
                 op=op,
             )
+            num_objects += 1
 
-            camera_image_plane_pair_collection_current.objects.link(
-                camera_object
-            )
-            camera_image_plane_pair_collection_current.objects.link(
-                image_plane_obj
-            )
+            # Group image plane and camera:
+            if camera_pair_layout == "COLLECTIONS":
+                camera_image_plane_pair_collection_current = add_collection(
+                    "Camera Image Plane Pair Collection %s"
+                    % blender_image_name_stem,
+                    camera_image_plane_pair_collection,
+                )
+                camera_image_plane_pair_collection_current.objects.link(
+                    camera_object
+                )
+                camera_image_plane_pair_collection_current.objects.link(
+                    image_plane_obj
+                )
+            else:
+                _set_parent_keep_transform(image_plane_obj, camera_object)
 
         if not add_depth_maps_as_point_cloud:
             continue
@@ -435,13 +625,6 @@ def add_cameras(
 
         depth_map_fp = camera.depth_map_fp
 
-        # Group image plane and camera:
-        camera_depth_map_pair_collection_current = add_collection(
-            "Camera Depth Map Pair Collection %s"
-            % os.path.basename(depth_map_fp),
-            camera_depth_map_pair_collection,
-        )
-
         depth_map_world_coords = camera.convert_depth_map_to_world_coords(
             depth_map_display_sparsity=depth_map_display_sparsity
         )
@@ -463,16 +646,239 @@ def add_cameras(
             color=color,
             op=op,
         )
+        num_objects += 1
+
+        # Group depth map and camera:
+        if camera_pair_layout == "COLLECTIONS":
+            camera_depth_map_pair_collection_current = add_collection(
+                "Camera Depth Map Pair Collection %s"
+                % os.path.basename(depth_map_fp),
+                camera_depth_map_pair_collection,
+            )
+            camera_depth_map_pair_collection_current.objects.link(
+                camera_object
+            )
+            camera_depth_map_pair_collection_current.objects.link(
+                depth_map_anchor_handle
+            )
+        else:
+            _set_parent_keep_transform(depth_map_anchor_handle, camera_object)
+
+    object_creation_time = object_stop_watch.get_elapsed_time()
+    log_report(
+        "INFO",
+        "Created "
+        + str(num_objects)
+        + " objects in "
+        + str(object_creation_time)
+        + " s ("
+        + str(num_objects / max(object_creation_time, 1e-9))
+        + " objects/s, layout: "
+        + camera_pair_layout
+        + ")",
+        op,
+    )
+
+    if add_image_planes:
+        bpy.data.materials.remove(image_plane_material_template)
 
-        camera_depth_map_pair_collection_current.objects.link(camera_object)
-        camera_depth_map_pair_collection_current.objects.link(
-            depth_map_anchor_handle
+    if share_camera_data:
+        log_report(
+            "INFO",
+            "Number of shared camera data blocks: "
+            + str(len(camera_data_key_to_bcamera)),
         )
 
-    log_report("INFO", "Duration: " + str(stop_watch.get_elapsed_time()))
     log_report("INFO", "Adding Cameras: Done")
 
 
+def get_camera_frusta_indices(
+    object_anchor_handle,
+    camera_id_or_name_str="",
+    num_closest_cameras=10,
+    reference_location=(0.0, 0.0, 0.0),
+    op=None,
+):
+    """Select cameras of a camera frusta anchor.
+
+    The cameras are selected by indices or (relative) image paths separated by
+    whitespaces. If no indices or paths are provided, the cameras closest to
+    the reference location (e.g. the 3D cursor) are selected.
+    """
+    (
+        cam_to_world_mats,
+        _,
+        relative_fps,
+        _,
+    ) = get_camera_frusta_parameters(object_anchor_handle)
+    num_cameras = len(relative_fps)
+
+    camera_id_or_name_str = camera_id_or_name_str.strip()
+    if camera_id_or_name_str != "":
+        rel_fp_to_idx = {
+            rel_fp: idx for idx, rel_fp in enumerate(relative_fps)
+        }
+        camera_indices = []
+        for id_or_name in camera_id_or_name_str.split():
+            if is_int(id_or_name) and 0 <= int(id_or_name) < num_cameras:
+                camera_indices.append(int(id_or_name))
+            elif id_or_name in rel_fp_to_idx:
+                camera_indices.append(rel_fp_to_idx[id_or_name])
+            else:
+                log_report(
+                    "WARNING",
+                    "Could not find camera " + id_or_name,
+                    op,
+                )
+        return camera_indices
+
+    anchor_matrix_world = np.array(object_anchor_handle.matrix_world)
+    # The last column of the camera to world matrices contains the
+    # homogeneous camera centers
+    centers = (anchor_matrix_world @ cam_to_world_mats[:, :, 3].T)[0:3].T
+    distances = np.linalg.norm(
+        centers - np.asarray(reference_location, dtype=float), axis=1
+    )
+    return np.argsort(distances)[0:num_closest_cameras].tolist()
+
+
+def add_cameras_of_camera_frusta(
+    object_anchor_handle,
+    camera_indices,
+    add_background_images=False,
+    op=None,
+):
+    """Add Blender cameras for a subset of the cameras of a frusta anchor.
+
+    See :code:`draw_camera_frusta()`. The cameras are added to a collection
+    next to the anchor. Transformations of the anchor are considered.
+    """
+    (
+        cam_to_world_mats,
+        intrinsics,
+        relative_fps,
+        panoramic_types,
+    ) = get_camera_frusta_parameters(object_anchor_handle)
+    image_fp_type = object_anchor_handle["camera_frusta_image_fp_type"]
+    image_dp = object_anchor_handle["camera_frusta_image_dp"] or None
+    anchor_matrix_world = np.array(object_anchor_handle.matrix_world)
+
+    cameras = []
+    for index in camera_indices:
+        camera = Camera()
+        # For absolute image paths the "relative" path is the absolute one
+        camera.set_relative_fp(relative_fps[index], image_fp_type)
+        camera.set_absolute_fp(relative_fps[index])
+        camera.image_dp = image_dp
+        camera.set_4x4_cam_to_world_mat(
+            anchor_matrix_world @ cam_to_world_mats[index],
+            check_rotation=False,
+        )
+        focal_length, p_x, p_y, width, height = intrinsics[index]
+        camera.set_calibration_mat(
+            Camera.compute_calibration_mat(focal_length, p_x, p_y)
+        )
+        camera.width = int(width)
+        camera.height = int(height)
+        camera.set_panoramic_type(panoramic_types[index])
+        cameras.append(camera)
+
+    add_cameras(
+        cameras,
+        object_anchor_handle.users_collection[0],
+        add_background_images=add_background_images,
+        add_image_planes=False,
+        add_depth_maps_as_point_cloud=False,
+        camera_collection_name="Cameras of " + object_anchor_handle.name,
+        camera_scale=object_anchor_handle["camera_frusta_scale"],
+        op=op,
+    )
+    return cameras
+
+
+def _get_image_plane_node_group():
+    # The node group is shared by all image plane materials. The transparency
+    # and the emission are inputs of the group.
+    if IMAGE_PLANE_NODE_GROUP_NAME in bpy.data.node_groups:
+        return bpy.data.node_groups[IMAGE_PLANE_NODE_GROUP_NAME]
+
+    node_group = bpy.data.node_groups.new(
+        IMAGE_PLANE_NODE_GROUP_NAME, "ShaderNodeTree"
+    )
+    node_group.inputs.new("NodeSocketColor", "Color")
+    node_group.inputs.new("NodeSocketFloatFactor", "Alpha")
+    node_group.inputs.new("NodeSocketFloatFactor", "Emission")
+    node_group.outputs.new("NodeSocketShader", "Shader")
+
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+    shader_node_principled_bsdf = nodes.new("ShaderNodeBsdfPrincipled")
+    # Emission = Emission Factor * Color
+    shader_node_mix_rgb = nodes.new("ShaderNodeMixRGB")
+    shader_node_mix_rgb.inputs["Color1"].default_value = (0, 0, 0, 1)
+
+    links.new(
+        group_input.outputs["Color"],
+        shader_node_principled_bsdf.inputs["Base Color"],
+    )
+    links.new(
+        group_input.outputs["Alpha"],
+        shader_node_principled_bsdf.inputs["Alpha"],
+    )
+    links.new(
+        group_input.outputs["Emission"], shader_node_mix_rgb.inputs["Fac"]
+    )
+    links.new(
+        group_input.outputs["Color"], shader_node_mix_rgb.inputs["Color2"]
+    )
+    links.new(
+        shader_node_mix_rgb.outputs["Color"],
+        shader_node_principled_bsdf.inputs["Emission"],
+    )
+    links.new(
+        shader_node_principled_bsdf.outputs["BSDF"],
+        group_output.inputs["Shader"],
+    )
+    return node_group
+
+
+def create_image_plane_material_template(
+    transparency, add_image_plane_emission
+):
+    """Create a material that is copied for each image plane.
+
+    The material consists of an image texture node and an instance of the
+    (shared) image plane node group.
+    """
+    material = bpy.data.materials.new(name="image_plane_material_template")
+    # Adds "Principled BSDF" and a "Material Output" node
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+    nodes.remove(nodes.get("Principled BSDF"))
+
+    shader_node_tex_image = nodes.new(type="ShaderNodeTexImage")
+    shader_node_tex_image.name = IMAGE_PLANE_TEXTURE_NODE_NAME
+    shader_node_group = nodes.new(type="ShaderNodeGroup")
+    shader_node_group.node_tree = _get_image_plane_node_group()
+    shader_node_group.inputs["Alpha"].default_value = transparency
+    shader_node_group.inputs["Emission"].default_value = float(
+        add_image_plane_emission
+    )
+
+    links.new(
+        shader_node_tex_image.outputs["Color"],
+        shader_node_group.inputs["Color"],
+    )
+    links.new(
+        shader_node_group.outputs["Shader"],
+        nodes.get("Material Output").inputs["Surface"],
+    )
+    return material
+
+
 def add_camera_image_plane(
     matrix_world,
     blender_image,
@@ -481,10 +887,16 @@ def add_camera_image_plane(
     transparency,
     add_image_plane_emission,
     image_planes_collection,
+    image_plane_material_template=None,
     op=None,
 ):
     """
     Create mesh for image plane
+
+    If provided, the material of the image plane is a copy of
+    :code:`image_plane_material_template` (see
+    :code:`create_image_plane_material_template()`). Only the image of the
+    copy is replaced, i.e. no nodes are created.
     """
     # log_report('INFO', 'add_camera_image_plane: ...')
     # log_report('INFO', 'name: ' + str(name))
@@ -496,7 +908,6 @@ def add_camera_image_plane(
 
     assert width is not None and height is not None
 
-    bpy.context.scene.render.engine = "CYCLES"
     mesh = bpy.data.meshes.new(name)
     mesh.update()
     mesh.validate()
@@ -523,29 +934,18 @@ def add_camera_image_plane(
     # Add mesh to new image plane object:
     mesh_obj = add_obj(mesh, name, image_planes_collection)
 
-    image_plane_material = bpy.data.materials.new(name="image_plane_material")
-    # Adds "Principled BSDF" and a "Material Output" node
-    image_plane_material.use_nodes = True
-
-    nodes = image_plane_material.node_tree.nodes
-    links = image_plane_material.node_tree.links
-
-    shader_node_tex_image = nodes.new(type="ShaderNodeTexImage")
-    shader_node_principled_bsdf = nodes.get("Principled BSDF")
-    shader_node_principled_bsdf.inputs["Alpha"].default_value = transparency
-
-    links.new(
-        shader_node_tex_image.outputs["Color"],
-        shader_node_principled_bsdf.inputs["Base Color"],
-    )
-
-    if add_image_plane_emission:
-        links.new(
-            shader_node_tex_image.outputs["Color"],
-            shader_node_principled_bsdf.inputs["Emission"],
+    if image_plane_material_template is None:
+        bpy.context.scene.render.engine = "CYCLES"
+        image_plane_material_template = create_image_plane_material_template(
+            transparency, add_image_plane_emission
         )
-
-    shader_node_tex_image.image = blender_image
+        image_plane_material = image_plane_material_template
+    else:
+        image_plane_material = image_plane_material_template.copy()
+    image_plane_material.name = "image_plane_material"
+    image_plane_material.node_tree.nodes[
+        IMAGE_PLANE_TEXTURE_NODE_NAME
+    ].image = blender_image
 
     # Assign it to object
     if mesh_obj.data.materials:
@@ -597,31 +997,3 @@ def get_selected_camera():
         return selected_obj
     else:
         return None
-
-
-def check_radial_distortion(radial_distortion, camera_name, op=None):
-    # TODO
-    # Integrate lens distortion nodes
-    # https://docs.blender.org/manual/en/latest/compositing/types/distort/lens_distortion.html
-    # to properly support radial distortion consisting of a single parameter
-
-    if radial_distortion is None:
-        return
-    if np.array_equal(
-        np.asarray(radial_distortion), np.zeros_like(radial_distortion)
-    ):
-        return
-
-    output = (
-        "Blender does not support radial distortion of cameras in the 3D View."
-    )
-    output += (
-        " Distortion of camera "
-        + camera_name
-        + ": "
-        + str(radial_distortion)
-        + "."
-    )
-    output += " If possible, re-compute the reconstruction using a camera model without radial distortion parameters."
-    output += ' Use "Suppress Distortion Warnings" in the import settings to suppress this message.'
-    log_report("WARNING", output, op)
@@ -1,12 +1,15 @@
 import logging
 
+from photogrammetry_importer.utility.logging_utility import (
+    default_log_handler,
+)
+
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger()
 
 
 def log_report(output_type, some_str, op=None):
     """ Write a string to the console and to Blender's info area."""
     # output_type is one of: 'INFO', 'WARNING' or 'ERROR'
-    logger.info(output_type + ": " + some_str)
+    default_log_handler(output_type, some_str)
     if op is not None:
         op.report({output_type}, some_str)
@@ -1,4 +1,6 @@
 import bpy
+import numpy as np
+from photogrammetry_importer.types.point_array import PointArray
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
@@ -56,3 +58,80 @@ def add_mesh_vertex_color_material(
             attribute_node.outputs["Color"],
             principled_bsdf_node.inputs["Emission"],
         )
+
+
+def _get_vertex_colors(mesh):
+    # Returns an (N, 4) float array with values in [0, 1] or None
+    num_vertices = len(mesh.vertices)
+    attributes = getattr(mesh, "attributes", None)
+    if attributes is not None:
+        # Generic color attributes (Blender 2.92 and newer)
+        for attribute in attributes:
+            if attribute.domain == "POINT" and attribute.data_type in [
+                "FLOAT_COLOR",
+                "BYTE_COLOR",
+            ]:
+                colors = np.empty(num_vertices * 4, dtype=np.float32)
+                attribute.data.foreach_get("color", colors)
+                return colors.reshape((-1, 4))
+
+    vertex_colors = getattr(mesh, "vertex_colors", None)
+    if vertex_colors is not None and vertex_colors.active is not None:
+        # Vertex colors are stored per loop (i.e. per face corner)
+        num_loops = len(mesh.loops)
+        loop_colors = np.empty(num_loops * 4, dtype=np.float32)
+        vertex_colors.active.data.foreach_get("color", loop_colors)
+        loop_vertex_indices = np.empty(num_loops, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+        colors = np.zeros((num_vertices, 4), dtype=np.float32)
+        colors[loop_vertex_indices] = loop_colors.reshape((-1, 4))
+        return colors
+    return None
+
+
+def get_vertex_point_array(
+    obj, use_evaluated_mesh=False, default_color=(0, 255, 0), depsgraph=None
+):
+    """Return the vertices of an object in world coordinates.
+
+    The coordinates and (if present) the vertex colors are read with
+    :code:`foreach_get()` and transformed with a single matrix product.
+    If :code:`use_evaluated_mesh` is set, the mesh with applied modifiers is
+    used.
+
+    :return: A :code:`PointArray` or None (if the object has no mesh data).
+    """
+    if use_evaluated_mesh:
+        if depsgraph is None:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+    elif obj.type == "MESH":
+        eval_obj = None
+        mesh = obj.data
+    else:
+        return None
+    if mesh is None:
+        return None
+
+    try:
+        num_vertices = len(mesh.vertices)
+        coords = np.empty(num_vertices * 3, dtype=float)
+        mesh.vertices.foreach_get("co", coords)
+        coords = coords.reshape((-1, 3))
+        vertex_colors = _get_vertex_colors(mesh)
+    finally:
+        if eval_obj is not None:
+            eval_obj.to_mesh_clear()
+
+    matrix_world = np.array(obj.matrix_world, dtype=float)
+    world_coords = coords @ matrix_world[0:3, 0:3].T + matrix_world[0:3, 3]
+
+    if vertex_colors is None:
+        colors = np.empty((num_vertices, 3), dtype=np.uint8)
+        colors[:] = default_color
+    else:
+        colors = np.clip(np.round(vertex_colors[:, 0:3] * 255), 0, 255).astype(
+            np.uint8
+        )
+    return PointArray(world_coords, colors)
@@ -8,26 +8,19 @@ from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
 def compute_transformed_coords(object_anchor_matrix_world, positions):
+    """Return the transformed positions as (N, 3) array of 32 bit floats.
 
-    if len(positions) == 0:
-        return []
+    The result can be passed directly (i.e. without creating Python objects
+    for each position) to :code:`batch_for_shader()`.
+    """
+    pos_arr = np.asarray(positions, dtype=float).reshape((-1, 3))
+    matrix_world = np.asarray(object_anchor_matrix_world, dtype=float)
+    transf_pos_arr = pos_arr @ matrix_world[0:3, 0:3].T + matrix_world[0:3, 3]
+    return transf_pos_arr.astype(np.float32)
 
-    pos_arr = np.asarray(positions)
-    ones_arr = np.ones((pos_arr.shape[0], 1))
-    pos_hom_arr = np.hstack((pos_arr, ones_arr))
 
-    # Transpose the matrix with the coordinates,
-    # so they can be transformed with a single matrix multiplication
-    pos_hom_arr_transposed = np.transpose(pos_hom_arr)
-    transf_pos_hom_transposed_arr = np.matmul(
-        object_anchor_matrix_world, pos_hom_arr_transposed
-    )
-    transf_pos_arr_hom = transf_pos_hom_transposed_arr.T
-
-    # Delete the homogeneous entries
-    transf_pos_arr = np.delete(transf_pos_arr_hom, -1, axis=1)
-    transf_pos_list = transf_pos_arr.tolist()
-    return transf_pos_list
+def _get_color_array(colors):
+    return np.ascontiguousarray(colors, dtype=np.float32).reshape((-1, 4))
 
 
 class DrawManager:
@@ -35,6 +28,8 @@ class DrawManager:
         self.draw_callback_handler_list = []
         self.anchor_to_point_coords = {}
         self.anchor_to_point_colors = {}
+        self.anchor_to_line_coords = {}
+        self.anchor_to_line_colors = {}
 
     @classmethod
     def get_singleton(cls):
@@ -47,6 +42,7 @@ class DrawManager:
         return draw_manger
 
     def register_points_draw_callback(self, object_anchor, coords, colors):
+        colors = _get_color_array(colors)
         draw_callback_handler = DrawCallBackHandler()
         draw_callback_handler.register_points_draw_callback(
             self, object_anchor, coords, colors
@@ -56,25 +52,41 @@ class DrawManager:
         self.anchor_to_point_coords[object_anchor] = coords
         self.anchor_to_point_colors[object_anchor] = colors
 
+    def register_lines_draw_callback(self, object_anchor, coords, colors):
+        # Consecutive pairs of coordinates define the lines
+        colors = _get_color_array(colors)
+        draw_callback_handler = DrawCallBackHandler(primitive_type="LINES")
+        draw_callback_handler.register_points_draw_callback(
+            self, object_anchor, coords, colors
+        )
+        self.draw_callback_handler_list.append(draw_callback_handler)
+
+        self.anchor_to_line_coords[object_anchor] = coords
+        self.anchor_to_line_colors[object_anchor] = colors
+
     def get_coords_and_colors(self):
 
-        transf_coord_list = []
-        color_list = []
+        transf_coord_arrs = [np.zeros((0, 3), dtype=np.float32)]
+        color_arrs = [np.zeros((0, 4), dtype=np.float32)]
         for object_anchor in self.anchor_to_point_coords:
 
             coords = self.anchor_to_point_coords[object_anchor]
-            transf_coord_list = transf_coord_list + compute_transformed_coords(
-                object_anchor.matrix_world, coords
+            transf_coord_arrs.append(
+                compute_transformed_coords(object_anchor.matrix_world, coords)
             )
 
             colors = self.anchor_to_point_colors[object_anchor]
-            color_list = color_list + colors
+            color_arrs.append(colors)
 
-        return transf_coord_list, color_list
+        return np.concatenate(transf_coord_arrs), np.concatenate(color_arrs)
 
     def delete_anchor(self, object_anchor):
-        del self.anchor_to_point_coords[object_anchor]
-        del self.anchor_to_point_colors[object_anchor]
+        if object_anchor in self.anchor_to_point_coords:
+            del self.anchor_to_point_coords[object_anchor]
+            del self.anchor_to_point_colors[object_anchor]
+        if object_anchor in self.anchor_to_line_coords:
+            del self.anchor_to_line_coords[object_anchor]
+            del self.anchor_to_line_colors[object_anchor]
 
     def set_point_size(self, point_size):
         for draw_back_handler in self.draw_callback_handler_list:
@@ -82,7 +94,8 @@ class DrawManager:
 
 
 class DrawCallBackHandler:
-    def __init__(self):
+    def __init__(self, primitive_type="POINTS"):
+        self.primitive_type = primitive_type
         self.shader = gpu.shader.from_builtin("3D_FLAT_COLOR")
 
         # Handle to the function
@@ -130,14 +143,15 @@ class DrawCallBackHandler:
                         self.object_anchor_pose_previous = np.copy(
                             object_anchor.matrix_world
                         )
-                        transf_pos_list = compute_transformed_coords(
+                        transf_pos_arr = compute_transformed_coords(
                             object_anchor.matrix_world, positions
                         )
 
+                        # The arrays are copied with the buffer protocol
                         self.batch_cached = batch_for_shader(
                             self.shader,
-                            "POINTS",
-                            {"pos": transf_pos_list, "color": colors},
+                            self.primitive_type,
+                            {"pos": transf_pos_arr, "color": colors},
                         )
 
                     self.shader.bind()
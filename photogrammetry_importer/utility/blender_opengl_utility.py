@@ -1,3 +1,4 @@
+import numpy as np
 import bpy
 import bgl
 import gpu
@@ -6,12 +7,28 @@ from mathutils import Matrix
 from gpu.types import GPUOffScreen
 from gpu_extras.batch import batch_for_shader
 
-from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.point_array import PointArray
 from photogrammetry_importer.utility.blender_opengl_draw_manager import (
     DrawManager,
 )
 from photogrammetry_importer.utility.blender_utility import add_empty
+from photogrammetry_importer.utility.camera_utility import (
+    get_camera_frustum_parameters,
+    compute_camera_frustum_line_coords,
+)
 from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_span,
+    profile_function,
+    increment_counter,
+)
+
+
+def _get_id_property_array(id_property, num_columns):
+    # Older files store the values as nested lists, newer files as flat lists
+    if hasattr(id_property, "to_list"):
+        id_property = id_property.to_list()
+    return np.array(id_property, dtype=float).reshape((-1, num_columns))
 
 
 def draw_coords_with_color(
@@ -23,13 +40,19 @@ def draw_coords_with_color(
     op=None,
 ):
 
+    # The draw manager creates the batch directly from the arrays
+    coords = np.asarray(coords, dtype=float).reshape((-1, 3))
+    colors = np.asarray(colors, dtype=np.float32).reshape((-1, 4))
+
     object_anchor_handle = add_empty(
         object_anchor_handle_name, reconstruction_collection
     )
     if add_points_to_point_cloud_handle:
-        object_anchor_handle["particle_coords"] = coords
-        object_anchor_handle["particle_colors"] = colors
-        bpy.context.scene["contains_opengl_point_clouds"] = True
+        with profile_span("Store Points as ID Properties"):
+            # Flat lists are considerably faster to store than nested lists
+            object_anchor_handle["particle_coords"] = coords.ravel().tolist()
+            object_anchor_handle["particle_colors"] = colors.ravel().tolist()
+            bpy.context.scene["contains_opengl_point_clouds"] = True
 
     draw_manager = DrawManager.get_singleton()
     draw_manager.register_points_draw_callback(
@@ -38,6 +61,7 @@ def draw_coords_with_color(
     return object_anchor_handle
 
 
+@profile_function("Draw Points")
 def draw_points(
     points,
     add_points_to_point_cloud_handle,
@@ -47,11 +71,13 @@ def draw_points(
 ):
 
     log_report("INFO", "Add particle draw handlers", op)
+    increment_counter("points", len(points))
 
-    coords, colors = Point.split_points(points)
+    # Point arrays (e.g. returned by a worker process) are used as they are
+    point_array = PointArray.from_points(points)
     object_anchor_handle = draw_coords_with_color(
-        coords,
-        colors,
+        point_array.coords,
+        point_array.get_rgba_colors(),
         add_points_to_point_cloud_handle,
         reconstruction_collection,
         object_anchor_handle_name,
@@ -71,7 +97,7 @@ def draw_coords(
     if len(color) == 3:
         color = (color[0], color[1], color[2], 1)
     assert len(color) == 4
-    colors = [color for coord in coords]
+    colors = np.tile(np.array(color, dtype=np.float32), (len(coords), 1))
     object_anchor_handle = draw_coords_with_color(
         coords,
         colors,
@@ -83,6 +109,143 @@ def draw_coords(
     return object_anchor_handle
 
 
+def get_point_cloud_anchor_point_array(object_anchor_handle):
+    """Return the points of an OpenGL point cloud in world coordinates.
+
+    :return: A :code:`PointArray` or None (if the object is no point cloud
+        anchor).
+    """
+    draw_manager = DrawManager.get_singleton()
+    if object_anchor_handle in draw_manager.anchor_to_point_coords:
+        coords = draw_manager.anchor_to_point_coords[object_anchor_handle]
+        colors = draw_manager.anchor_to_point_colors[object_anchor_handle]
+    elif "particle_coords" in object_anchor_handle:
+        coords = _get_id_property_array(
+            object_anchor_handle["particle_coords"], 3
+        )
+        colors = _get_id_property_array(
+            object_anchor_handle["particle_colors"], 4
+        )
+    else:
+        return None
+    coords = np.array(coords, dtype=float).reshape((-1, 3))
+    colors = np.array(colors, dtype=float).reshape((-1, 4))
+    matrix_world = np.array(object_anchor_handle.matrix_world, dtype=float)
+    world_coords = coords @ matrix_world[0:3, 0:3].T + matrix_world[0:3, 3]
+    # The OpenGL colors are defined as RGBA values between 0 and 1
+    colors = np.clip(np.round(colors[:, 0:3] * 255), 0, 255).astype(np.uint8)
+    return PointArray(world_coords, colors)
+
+
+def is_camera_frusta_anchor(obj):
+    """Return whether the object is an anchor created by
+    :code:`draw_camera_frusta()`."""
+    return obj is not None and "camera_frusta_cam_to_world_mats" in obj
+
+
+def get_camera_frusta_parameters(object_anchor_handle):
+    """Return the camera parameters stored in a camera frusta anchor.
+
+    :return: Tuple containing the (N, 4, 4) camera to world matrices, the
+        (N, 5) intrinsics, the relative image paths and the panoramic types
+        (:code:`None` for pinhole cameras).
+    """
+    cam_to_world_mats = np.array(
+        object_anchor_handle["camera_frusta_cam_to_world_mats"], dtype=float
+    ).reshape(-1, 4, 4)
+    intrinsics = np.array(
+        object_anchor_handle["camera_frusta_intrinsics"], dtype=float
+    ).reshape(-1, 5)
+    relative_fps = list(object_anchor_handle["camera_frusta_relative_fps"])
+    panoramic_types = [
+        panoramic_type if panoramic_type != "" else None
+        for panoramic_type in object_anchor_handle[
+            "camera_frusta_panoramic_types"
+        ]
+    ]
+    return cam_to_world_mats, intrinsics, relative_fps, panoramic_types
+
+
+def _register_camera_frusta_draw_callback(object_anchor_handle):
+    (
+        cam_to_world_mats,
+        intrinsics,
+        _,
+        panoramic_types,
+    ) = get_camera_frusta_parameters(object_anchor_handle)
+    # Panoramic cameras have no frustum
+    is_pinhole = np.array(
+        [panoramic_type is None for panoramic_type in panoramic_types],
+        dtype=bool,
+    )
+    coords = compute_camera_frustum_line_coords(
+        cam_to_world_mats[is_pinhole],
+        intrinsics[is_pinhole],
+        object_anchor_handle["camera_frusta_scale"],
+    )
+    color = tuple(object_anchor_handle["camera_frusta_color"])
+    colors = [color] * len(coords)
+
+    draw_manager = DrawManager.get_singleton()
+    draw_manager.register_lines_draw_callback(
+        object_anchor_handle, coords, colors
+    )
+
+
+@profile_function("Draw Camera Frusta")
+def draw_camera_frusta(
+    cameras,
+    reconstruction_collection=None,
+    frustum_scale=1.0,
+    color=(0.0, 0.0, 1.0),
+    object_anchor_handle_name="OpenGL Camera Frusta",
+    op=None,
+):
+    """Draw the frusta of all cameras as a single batch of lines.
+
+    In contrast to :code:`add_cameras()` no Blender objects are created for
+    the cameras. The camera parameters are stored in the returned anchor, so
+    that Blender cameras can be added for a subset of the cameras later on.
+    """
+    if len(cameras) == 0:
+        return None
+    log_report(
+        "INFO",
+        "Add camera frusta draw handler (" + str(len(cameras)) + ")",
+        op,
+    )
+    if len(color) == 3:
+        color = (color[0], color[1], color[2], 1)
+    assert len(color) == 4
+
+    cam_to_world_mats, intrinsics = get_camera_frustum_parameters(cameras)
+    object_anchor_handle = add_empty(
+        object_anchor_handle_name, reconstruction_collection
+    )
+    object_anchor_handle[
+        "camera_frusta_cam_to_world_mats"
+    ] = cam_to_world_mats.flatten().tolist()
+    object_anchor_handle[
+        "camera_frusta_intrinsics"
+    ] = intrinsics.flatten().tolist()
+    object_anchor_handle["camera_frusta_relative_fps"] = [
+        camera.get_relative_fp() for camera in cameras
+    ]
+    object_anchor_handle["camera_frusta_panoramic_types"] = [
+        camera.get_panoramic_type() or "" for camera in cameras
+    ]
+    object_anchor_handle["camera_frusta_image_fp_type"] = cameras[
+        0
+    ].image_fp_type
+    object_anchor_handle["camera_frusta_image_dp"] = cameras[0].image_dp or ""
+    object_anchor_handle["camera_frusta_scale"] = frustum_scale
+    object_anchor_handle["camera_frusta_color"] = color
+    bpy.context.scene["contains_opengl_point_clouds"] = True
+
+    _register_camera_frusta_draw_callback(object_anchor_handle)
+    return object_anchor_handle
+
+
 @persistent
 def redraw_points(dummy):
 
@@ -97,8 +260,8 @@ def redraw_points(dummy):
         )
         for obj in bpy.data.objects:
             if "particle_coords" in obj and "particle_colors" in obj:
-                coords = obj["particle_coords"]
-                colors = obj["particle_colors"]
+                coords = _get_id_property_array(obj["particle_coords"], 3)
+                colors = _get_id_property_array(obj["particle_colors"], 4)
 
                 draw_manager = DrawManager.get_singleton()
                 draw_manager.register_points_draw_callback(obj, coords, colors)
@@ -106,6 +269,8 @@ def redraw_points(dummy):
                     bpy.context.scene.opengl_panel_viz_settings.viz_point_size
                 )
                 draw_manager.set_point_size(viz_point_size)
+            elif is_camera_frusta_anchor(obj):
+                _register_camera_frusta_draw_callback(obj)
 
         for area in bpy.context.screen.areas:
             if area.type == "VIEW_3D":
@@ -2,37 +2,28 @@ import bpy
 import numpy as np
 from mathutils import Vector
 
-from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.point_array import PointArray
 from photogrammetry_importer.utility.blender_utility import (
     add_collection,
     add_obj,
 )
-from photogrammetry_importer.utility.stop_watch import StopWatch
+from photogrammetry_importer.utility.blender_mesh_utility import (
+    get_vertex_point_array,
+)
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_function,
+    increment_counter,
+)
 from photogrammetry_importer.utility.blender_logging_utility import log_report
 
 
-def copy_values_to_image(value_tripplets, image_name):
-    """ Copy values to image pixels. """
-    image = bpy.data.images[image_name]
-    # working on a copy of the pixels results in a MASSIVE performance speed
-    local_pixels = list(image.pixels[:])
-    for value_index, tripplet in enumerate(value_tripplets):
-        column_offset = value_index * 4  # (R,G,B,A)
-        # Order is R,G,B, opacity
-        local_pixels[column_offset] = tripplet[0]
-        local_pixels[column_offset + 1] = tripplet[1]
-        local_pixels[column_offset + 2] = tripplet[2]
-        # opacity (0 = transparent, 1 = opaque)
-        # local_pixels[column_offset + 3] = 1.0    # already set by default
-    image.pixels = local_pixels[:]
-
-
 def compute_particle_color_texture(colors, name="ParticleColor"):
     # To view the texture we set the height of the texture to vis_image_height
     image = bpy.data.images.new(name=name, width=len(colors), height=1)
 
-    copy_values_to_image(colors, image.name)
-    image = bpy.data.images[image.name]
+    # Copy all (R,G,B,A) values at once (with the buffer protocol)
+    rgba_colors = np.ascontiguousarray(colors, dtype=np.float32)
+    image.pixels.foreach_set(rgba_colors.ravel())
     # https://docs.blender.org/api/current/bpy.types.Image.html#bpy.types.Image.pack
     image.pack()
     return image
@@ -184,13 +175,22 @@ def add_particle_material(
         )
 
 
+def _add_vertex_mesh(mesh_name, coords):
+    # Creates the vertices from the (N, 3) coordinate array at once (instead
+    # of converting each coordinate with from_pydata())
+    coords = np.ascontiguousarray(coords, dtype=np.float32).reshape((-1, 3))
+    mesh = bpy.data.meshes.new(mesh_name)
+    mesh.vertices.add(coords.shape[0])
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.update()
+    mesh.validate()
+    return mesh
+
+
 def add_particle_system(
     coords, particle_obj, point_cloud_obj_name, reconstruction_collection
 ):
-    point_cloud_mesh = bpy.data.meshes.new(point_cloud_obj_name)
-    point_cloud_mesh.update()
-    point_cloud_mesh.validate()
-    point_cloud_mesh.from_pydata(coords, [], [])
+    point_cloud_mesh = _add_vertex_mesh(point_cloud_obj_name, coords)
     point_cloud_obj = add_obj(
         point_cloud_mesh, point_cloud_obj_name, reconstruction_collection
     )
@@ -211,6 +211,7 @@ def add_particle_system(
     return point_cloud_obj
 
 
+@profile_function("Add Points as Particle System")
 def add_points_as_particle_system(
     points,
     mesh_type,
@@ -221,7 +222,9 @@ def add_points_as_particle_system(
     op=None,
 ):
     log_report("INFO", "Adding Points as Particle System: ...", op)
-    stop_watch = StopWatch()
+    increment_counter("points", len(points))
+    # Point arrays (e.g. returned by a worker process) are used as they are
+    point_array = PointArray.from_points(points)
 
     # The particle systems in Blender do not work for large particle numbers
     # (see https://developer.blender.org/T81103). Thus, we represent large
@@ -232,14 +235,16 @@ def add_points_as_particle_system(
         "Particle System", reconstruction_collection
     )
 
-    for i in range(0, len(points), max_number_particles):
+    for i in range(0, len(point_array), max_number_particles):
 
         particle_obj_name = f"Particle Shape {i}"
         particle_material_name = f"Point Cloud Material {i}"
         point_cloud_obj_name = f"Particle Point Cloud {i}"
 
-        points_subset = points[i : i + max_number_particles]
-        coords, colors = Point.split_points(points_subset)
+        # Slicing returns views, i.e. the arrays are not copied
+        points_subset = point_array[i : i + max_number_particles]
+        coords = points_subset.coords
+        colors = points_subset.get_rgba_colors()
 
         particle_obj = add_particle(
             colors,
@@ -260,24 +265,66 @@ def add_points_as_particle_system(
 
     bpy.context.view_layer.update()
 
-    log_report("INFO", "Duration: " + str(stop_watch.get_elapsed_time()), op)
     log_report("INFO", "Adding Points as Particle System: Done", op)
     return point_cloud_obj.name
 
 
+def _get_particle_colors(particle_obj, num_particles):
+    # Returns the (N, 4) colors defined by the material created with
+    # add_particle_material() or None
+    if particle_obj is None or particle_obj.active_material is None:
+        return None
+    node_tree = particle_obj.active_material.node_tree
+    if node_tree is None:
+        return None
+    if "Image Texture" in node_tree.nodes:
+        image = node_tree.nodes["Image Texture"].image
+        if image is not None:
+            colors = np.array(image.pixels[:], dtype=float).reshape((-1, 4))
+            if colors.shape[0] == num_particles:
+                return colors
+    elif "RGB" in node_tree.nodes:
+        color = node_tree.nodes["RGB"].outputs["Color"].default_value
+        return np.tile(np.array(color, dtype=float), (num_particles, 1))
+    return None
+
+
+def get_particle_system_point_array(point_cloud_obj):
+    """Return the points of a particle system in world coordinates.
+
+    The colors are read from the material of the particle object (see
+    :code:`add_points_as_particle_system()`).
+
+    :return: A :code:`PointArray` or None (if the object has no particle
+        system).
+    """
+    if len(point_cloud_obj.particle_systems) == 0:
+        return None
+    # The particles are emitted from the vertices of the point cloud mesh
+    point_array = get_vertex_point_array(point_cloud_obj)
+    if point_array is None:
+        return None
+    particle_obj = point_cloud_obj.particle_systems[0].settings.instance_object
+    colors = _get_particle_colors(particle_obj, len(point_array))
+    if colors is not None:
+        point_array.colors = np.clip(
+            np.round(colors[:, 0:3] * 255), 0, 255
+        ).astype(np.uint8)
+    return point_array
+
+
+@profile_function("Add Points as Mesh")
 def add_points_as_mesh(points, reconstruction_collection, op=None):
     log_report("INFO", "Adding Points as Mesh: ...", op)
-    stop_watch = StopWatch()
+    increment_counter("points", len(points))
     point_cloud_obj_name = "Mesh Point Cloud"
-    point_cloud_mesh = bpy.data.meshes.new(point_cloud_obj_name)
-    point_cloud_mesh.update()
-    point_cloud_mesh.validate()
-    point_world_coordinates = [tuple(point.coord) for point in points]
-    point_cloud_mesh.from_pydata(point_world_coordinates, [], [])
+    point_array = PointArray.from_points(points)
+    point_cloud_mesh = _add_vertex_mesh(
+        point_cloud_obj_name, point_array.coords
+    )
     point_cloud_obj = add_obj(
         point_cloud_mesh, point_cloud_obj_name, reconstruction_collection
     )
 
-    log_report("INFO", "Duration: " + str(stop_watch.get_elapsed_time()), op)
     log_report("INFO", "Adding Points as Mesh: Done", op)
     return point_cloud_obj.name
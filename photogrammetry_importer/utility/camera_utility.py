@@ -1,7 +1,149 @@
+import numpy as np
+
 from photogrammetry_importer.file_handlers.image_file_handler import (
     ImageFileHandler,
 )
-from photogrammetry_importer.utility.blender_logging_utility import log_report
+from photogrammetry_importer.utility.image_size_utility import (
+    probe_image_sizes,
+)
+from photogrammetry_importer.utility.logging_utility import log_report
+
+# Frustum vertices on the image plane relative to the image size. The last
+# three vertices define a triangle indicating the up direction of the image.
+# The vertex indices of the lines refer to these vertices prepended by the
+# camera center (i.e. index 0).
+_FRUSTUM_IMAGE_VERTICES = np.array(
+    [
+        [0.0, 0.0],
+        [1.0, 0.0],
+        [1.0, 1.0],
+        [0.0, 1.0],
+        [0.25, 0.0],
+        [0.75, 0.0],
+        [0.5, -0.25],
+    ],
+    dtype=float,
+)
+_FRUSTUM_LINE_VERTEX_INDICES = np.array(
+    [
+        [0, 1],
+        [0, 2],
+        [0, 3],
+        [0, 4],
+        [1, 2],
+        [2, 3],
+        [3, 4],
+        [4, 1],
+        [5, 7],
+        [7, 6],
+    ],
+    dtype=int,
+).flatten()
+
+
+def get_camera_frustum_parameters(cameras):
+    """Return the poses and intrinsics of the cameras as arrays.
+
+    :return: Tuple containing an array with the (N, 4, 4) camera to world
+        matrices and an array with the (N, 5) intrinsics (focal length,
+        principal point x/y, width and height).
+    """
+    num_cameras = len(cameras)
+    cam_to_world_mats = np.empty((num_cameras, 4, 4), dtype=float)
+    intrinsics = np.empty((num_cameras, 5), dtype=float)
+    for index, camera in enumerate(cameras):
+        cam_to_world_mats[index] = camera.get_4x4_cam_to_world_mat()
+        calibration_mat = camera._calibration_mat
+        intrinsics[index] = (
+            calibration_mat[0][0],
+            calibration_mat[0][2],
+            calibration_mat[1][2],
+            camera.width,
+            camera.height,
+        )
+    return cam_to_world_mats, intrinsics
+
+
+def compute_camera_frustum_line_coords(
+    cam_to_world_mats, intrinsics, frustum_scale=1.0
+):
+    """Compute the line segments of the frusta of (many) pinhole cameras.
+
+    The computation is vectorized over all cameras. The largest extent of
+    each image plane is equal to :code:`frustum_scale` (this corresponds to
+    the visualization of cameras in Blender).
+
+    :param cam_to_world_mats: Array with (N, 4, 4) camera to world matrices.
+    :param intrinsics: Array with (N, 5) intrinsics, see
+        :code:`get_camera_frustum_parameters()`.
+    :return: Array with (N * 20, 3) coordinates, each consecutive pair of
+        coordinates defines a line segment.
+    """
+    cam_to_world_mats = np.asarray(cam_to_world_mats, dtype=float).reshape(
+        -1, 4, 4
+    )
+    intrinsics = np.asarray(intrinsics, dtype=float).reshape(-1, 5)
+    focal_length, p_x, p_y, width, height = intrinsics.T
+
+    num_cameras = cam_to_world_mats.shape[0]
+    num_vertices = _FRUSTUM_IMAGE_VERTICES.shape[0] + 1
+    cam_coords = np.zeros((num_cameras, num_vertices, 3), dtype=float)
+    # The image plane is located at z = focal length (in pixels), i.e. the
+    # vertices are given by K^-1 [u, v, 1]^T * focal length
+    cam_coords[:, 1:, 0] = (
+        _FRUSTUM_IMAGE_VERTICES[np.newaxis, :, 0] * width[:, np.newaxis]
+        - p_x[:, np.newaxis]
+    )
+    cam_coords[:, 1:, 1] = (
+        _FRUSTUM_IMAGE_VERTICES[np.newaxis, :, 1] * height[:, np.newaxis]
+        - p_y[:, np.newaxis]
+    )
+    cam_coords[:, 1:, 2] = focal_length[:, np.newaxis]
+    cam_coords *= (frustum_scale / np.maximum(width, height))[
+        :, np.newaxis, np.newaxis
+    ]
+
+    line_cam_coords = cam_coords[:, _FRUSTUM_LINE_VERTEX_INDICES]
+    line_world_coords = (
+        np.einsum(
+            "nij,nkj->nki", cam_to_world_mats[:, 0:3, 0:3], line_cam_coords
+        )
+        + cam_to_world_mats[:, np.newaxis, 0:3, 3]
+    )
+    return line_world_coords.reshape(-1, 3)
+
+
+def _get_intrinsic_key(camera):
+    # The principal point might not be initialized yet, i.e. do not use
+    # camera.get_calibration_mat()
+    calibration_mat = camera._calibration_mat
+    if calibration_mat is None or not calibration_mat.any():
+        return None
+    return tuple(calibration_mat.flatten().tolist())
+
+
+def _propagate_image_size_of_intrinsics(cameras):
+    # Cameras sharing an intrinsic that already carries the image size do not
+    # require any probing
+    intrinsic_key_to_sizes = {}
+    for camera in cameras:
+        if camera.width is not None and camera.height is not None:
+            intrinsic_key = _get_intrinsic_key(camera)
+            if intrinsic_key is not None:
+                intrinsic_key_to_sizes.setdefault(intrinsic_key, set()).add(
+                    (camera.width, camera.height)
+                )
+    cameras_without_size = []
+    for camera in cameras:
+        if camera.width is not None and camera.height is not None:
+            continue
+        intrinsic_key = _get_intrinsic_key(camera)
+        sizes = intrinsic_key_to_sizes.get(intrinsic_key)
+        if sizes is not None and len(sizes) == 1:
+            camera.width, camera.height = next(iter(sizes))
+        else:
+            cameras_without_size.append(camera)
+    return cameras_without_size
 
 
 def set_image_size_for_cameras(
@@ -10,15 +152,51 @@ def set_image_size_for_cameras(
     """ Set image sizes for cameras and return a boolean. """
 
     log_report("INFO", "set_image_size_for_cameras: ", op)
+    cameras_without_size = _propagate_image_size_of_intrinsics(cameras)
+    fp_to_size = probe_image_sizes(
+        [camera.get_absolute_fp() for camera in cameras_without_size], op=op
+    )
     success = True
-    for camera in cameras:
+    for camera in cameras_without_size:
         image_fp = camera.get_absolute_fp()
-        success, width, height = ImageFileHandler.read_image_size(
-            image_fp, default_width, default_height, op
-        )
+        size = fp_to_size[image_fp]
+        if size is not None:
+            width, height = size
+        else:
+            success, width, height = ImageFileHandler.read_image_size(
+                image_fp, default_width, default_height, op
+            )
         camera.width = width
         camera.height = height
         if not success:
             break
     log_report("INFO", "set_image_size_for_cameras: Done", op)
     return success
+
+
+def check_radial_distortion(radial_distortion, camera_name, op=None):
+    # TODO
+    # Integrate lens distortion nodes
+    # https://docs.blender.org/manual/en/latest/compositing/types/distort/lens_distortion.html
+    # to properly support radial distortion consisting of a single parameter
+
+    if radial_distortion is None:
+        return
+    if np.array_equal(
+        np.asarray(radial_distortion), np.zeros_like(radial_distortion)
+    ):
+        return
+
+    output = (
+        "Blender does not support radial distortion of cameras in the 3D View."
+    )
+    output += (
+        " Distortion of camera "
+        + camera_name
+        + ": "
+        + str(radial_distortion)
+        + "."
+    )
+    output += " If possible, re-compute the reconstruction using a camera model without radial distortion parameters."
+    output += ' Use "Suppress Distortion Warnings" in the import settings to suppress this message.'
+    log_report("WARNING", output, op)
@@ -0,0 +1,192 @@
+"""
+Functions to create downscaled proxies of (large) images.
+"""
+
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from photogrammetry_importer.utility.os_utility import get_addon_cache_dp
+from photogrammetry_importer.utility.logging_utility import log_report
+
+try:
+    from PIL import Image as _PILImage
+except ImportError:
+    _PILImage = None
+
+
+class ImageProxyCache:
+    """Class that manages the image proxies of a specific resolution.
+
+    The proxies are stored in a cache directory together with a manifest,
+    which maps the original image paths to the proxy files. A proxy is
+    re-created, if the modification time or the size of the original image
+    changes.
+    """
+
+    manifest_fn = "manifest.json"
+    jpeg_exts = [".jpg", ".jpeg"]
+
+    def __init__(self, max_edge, proxy_dp=None):
+        self.max_edge = max_edge
+        if proxy_dp is None:
+            proxy_dp = os.path.join(
+                get_addon_cache_dp(), "image_proxies", str(max_edge)
+            )
+        os.makedirs(proxy_dp, exist_ok=True)
+        self.proxy_dp = proxy_dp
+        self._manifest = self._read_manifest()
+
+    def _get_manifest_fp(self):
+        return os.path.join(self.proxy_dp, self.manifest_fn)
+
+    def _read_manifest(self):
+        manifest_fp = self._get_manifest_fp()
+        if os.path.isfile(manifest_fp):
+            try:
+                with open(manifest_fp, "r") as manifest_file:
+                    return json.load(manifest_file)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def write_manifest(self):
+        """Write the manifest of the proxies to disk."""
+        manifest_fp = self._get_manifest_fp()
+        with open(manifest_fp + ".tmp", "w") as manifest_file:
+            json.dump(self._manifest, manifest_file)
+        os.replace(manifest_fp + ".tmp", manifest_fp)
+
+    @staticmethod
+    def _get_file_signature(image_fp):
+        stat_result = os.stat(image_fp)
+        return [stat_result.st_mtime_ns, stat_result.st_size]
+
+    def _get_proxy_fn(self, image_fp):
+        # JPEG images are stored as JPEG, all other images as (lossless) PNG
+        abs_image_fp = os.path.abspath(image_fp)
+        path_hash = hashlib.sha1(abs_image_fp.encode("utf-8")).hexdigest()
+        if os.path.splitext(image_fp)[1].lower() in self.jpeg_exts:
+            return path_hash + ".jpg"
+        return path_hash + ".png"
+
+    def get_cached_proxy_fp(self, image_fp):
+        """Return the path of a valid proxy (or None)."""
+        entry = self._manifest.get(os.path.abspath(image_fp))
+        if entry is None:
+            return None
+        try:
+            if entry["signature"] != self._get_file_signature(image_fp):
+                return None
+        except OSError:
+            return None
+        if entry["proxy_fn"] is None:
+            # The image is smaller than the proxy resolution
+            return image_fp
+        proxy_fp = os.path.join(self.proxy_dp, entry["proxy_fn"])
+        if not os.path.isfile(proxy_fp):
+            return None
+        return proxy_fp
+
+    def create_proxy(self, image_fp):
+        """Create a downscaled version of the image.
+
+        Returns the path of the proxy, the original path (if the image does
+        not exceed the proxy resolution) or None (if the image could not be
+        read). Not thread-safe with respect to the manifest, i.e. use
+        :code:`add_to_manifest()` to register the result.
+        """
+        max_size = (self.max_edge, self.max_edge)
+        with _PILImage.open(image_fp) as image:
+            if max(image.size) <= self.max_edge:
+                return image_fp
+            proxy_fp = os.path.join(
+                self.proxy_dp, self._get_proxy_fn(image_fp)
+            )
+            # Decode JPEG images directly at a reduced resolution
+            image.draft("RGB", max_size)
+            image.thumbnail(max_size)
+            if os.path.splitext(proxy_fp)[1] == ".jpg":
+                image.convert("RGB").save(proxy_fp, quality=90)
+            else:
+                image.save(proxy_fp)
+        return proxy_fp
+
+    def add_to_manifest(self, image_fp, proxy_fp):
+        """Register a proxy created with :code:`create_proxy()`."""
+        if proxy_fp == image_fp:
+            proxy_fn = None
+        else:
+            proxy_fn = os.path.basename(proxy_fp)
+        self._manifest[os.path.abspath(image_fp)] = {
+            "signature": self._get_file_signature(image_fp),
+            "proxy_fn": proxy_fn,
+        }
+
+
+def create_image_proxies(image_fps, max_edge, num_threads=None, op=None):
+    """Create (or reuse) downscaled proxies of the given images.
+
+    The proxies are created in a thread pool and cached on disk.
+
+    :return: Dictionary mapping each image path to the path of the image that
+        should be loaded (i.e. the proxy or the original image).
+    """
+    image_fp_to_proxy_fp = {image_fp: image_fp for image_fp in image_fps}
+    if _PILImage is None:
+        log_report(
+            "WARNING",
+            "Can not create image proxies, since Pillow is not installed."
+            + " Using the original images instead.",
+            op,
+        )
+        return image_fp_to_proxy_fp
+
+    proxy_cache = ImageProxyCache(max_edge)
+    missing_image_fps = []
+    for image_fp in set(image_fps):
+        proxy_fp = proxy_cache.get_cached_proxy_fp(image_fp)
+        if proxy_fp is None:
+            missing_image_fps.append(image_fp)
+        else:
+            image_fp_to_proxy_fp[image_fp] = proxy_fp
+
+    log_report(
+        "INFO",
+        "Creating "
+        + str(len(missing_image_fps))
+        + " image proxies (max edge: "
+        + str(max_edge)
+        + ") in "
+        + proxy_cache.proxy_dp,
+        op,
+    )
+
+    def create_proxy(image_fp):
+        try:
+            return proxy_cache.create_proxy(image_fp)
+        except (OSError, ValueError, _PILImage.DecompressionBombError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        proxy_fps = executor.map(create_proxy, missing_image_fps)
+        for image_fp, proxy_fp in zip(missing_image_fps, proxy_fps):
+            if proxy_fp is None:
+                log_report(
+                    "WARNING",
+                    "Could not create proxy for " + image_fp,
+                    op,
+                )
+                continue
+            image_fp_to_proxy_fp[image_fp] = proxy_fp
+            proxy_cache.add_to_manifest(image_fp, proxy_fp)
+
+    if len(missing_image_fps) > 0:
+        try:
+            proxy_cache.write_manifest()
+        except OSError as err:
+            log_report(
+                "WARNING", "Could not write proxy manifest: " + str(err), op
+            )
+    return image_fp_to_proxy_fp
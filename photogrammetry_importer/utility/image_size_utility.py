@@ -0,0 +1,159 @@
+"""
+Functions to determine the sizes of (many) images efficiently.
+"""
+
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from photogrammetry_importer.file_handlers.image_file_handler import (
+    ImageFileHandler,
+)
+from photogrammetry_importer.utility.os_utility import get_addon_cache_dp
+from photogrammetry_importer.utility.logging_utility import log_report
+from photogrammetry_importer.utility.profiling_utility import profile_function
+
+
+class ImageSizeCache:
+    """Class that memoizes image sizes per path and modification time.
+
+    The entries are persisted in the add-on cache directory, i.e. the sizes
+    are reused across imports (and Blender sessions).
+    """
+
+    _singleton = None
+    _singleton_lock = threading.Lock()
+
+    cache_fn = "image_sizes.json"
+    max_num_entries = 1000000
+
+    @classmethod
+    def get_singleton(cls):
+        """Return a singleton of this class."""
+        with cls._singleton_lock:
+            if cls._singleton is None:
+                cls._singleton = cls()
+        return cls._singleton
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fp_to_entry = None
+        self._modified = False
+
+    @staticmethod
+    def _get_file_signature(image_fp):
+        stat_result = os.stat(image_fp)
+        return [stat_result.st_mtime_ns, stat_result.st_size]
+
+    def _get_cache_fp(self):
+        return os.path.join(get_addon_cache_dp(), self.cache_fn)
+
+    def _load_lazy(self):
+        if self._fp_to_entry is not None:
+            return
+        self._fp_to_entry = {}
+        cache_fp = self._get_cache_fp()
+        if os.path.isfile(cache_fp):
+            try:
+                with open(cache_fp, "r") as cache_file:
+                    self._fp_to_entry = json.load(cache_file)
+            except (OSError, ValueError):
+                self._fp_to_entry = {}
+
+    def get_image_size(self, image_fp):
+        """Return the cached size or None, if the image has been modified."""
+        try:
+            signature = self._get_file_signature(image_fp)
+        except OSError:
+            return None
+        with self._lock:
+            self._load_lazy()
+            entry = self._fp_to_entry.get(os.path.abspath(image_fp))
+        if entry is None or entry[0:2] != signature:
+            return None
+        return entry[2], entry[3]
+
+    def set_image_size(self, image_fp, width, height):
+        """Add or update the size of an image."""
+        try:
+            signature = self._get_file_signature(image_fp)
+        except OSError:
+            return
+        with self._lock:
+            self._load_lazy()
+            self._fp_to_entry[os.path.abspath(image_fp)] = signature + [
+                width,
+                height,
+            ]
+            self._modified = True
+
+    def save(self, op=None):
+        """Write the cache to disk, if it has been modified."""
+        with self._lock:
+            if not self._modified:
+                return
+            # Remove the oldest entries (dictionaries preserve the insertion
+            # order)
+            num_surplus = len(self._fp_to_entry) - self.max_num_entries
+            if num_surplus > 0:
+                for fp in list(self._fp_to_entry)[0:num_surplus]:
+                    del self._fp_to_entry[fp]
+            cache_fp = self._get_cache_fp()
+            try:
+                with open(cache_fp + ".tmp", "w") as cache_file:
+                    json.dump(self._fp_to_entry, cache_file)
+                os.replace(cache_fp + ".tmp", cache_fp)
+                self._modified = False
+            except OSError as err:
+                log_report(
+                    "WARNING",
+                    "Could not write image size cache: " + str(err),
+                    op,
+                )
+
+
+@profile_function("Probe Image Sizes")
+def probe_image_sizes(image_fps, num_threads=None, op=None):
+    """Determine the sizes of the given images.
+
+    The sizes are read from the file headers in a thread pool (which hides
+    the latency of network storage). The results are memoized in the
+    persistent :code:`ImageSizeCache`.
+
+    :return: Dictionary mapping each image path to a (width, height) tuple or
+        to :code:`None`, if the size could not be determined.
+    """
+    image_size_cache = ImageSizeCache.get_singleton()
+    unique_image_fps = list(set(image_fps))
+
+    # The cache lookup requires a stat() call, which is (like reading the
+    # header) performed in the thread pool
+    def probe_image_size(image_fp):
+        size = image_size_cache.get_image_size(image_fp)
+        if size is not None:
+            return size, True
+        size = ImageFileHandler.read_image_size_from_header(image_fp)
+        if size is not None:
+            image_size_cache.set_image_size(image_fp, *size)
+        return size, False
+
+    fp_to_size = {}
+    num_cached = 0
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        results = executor.map(probe_image_size, unique_image_fps)
+        for image_fp, (size, is_cached) in zip(unique_image_fps, results):
+            fp_to_size[image_fp] = size
+            num_cached += is_cached
+    image_size_cache.save(op)
+
+    log_report(
+        "INFO",
+        "Probed "
+        + str(len(unique_image_fps))
+        + " image sizes ("
+        + str(num_cached)
+        + " cached)",
+        op,
+    )
+    return fp_to_size
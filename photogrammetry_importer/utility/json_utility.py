@@ -0,0 +1,176 @@
+"""
+Functions to read (large) JSON files.
+"""
+
+import json
+import os
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON files exceeding this size (in bytes) are read incrementally
+JSON_STREAMING_MIN_FILE_SIZE = 256 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_VALUE_DELIMITERS = frozenset(",:]} \t\n\r")
+
+
+def load_json(json_ifp):
+    """Read a JSON file with the fastest available backend."""
+    if orjson is not None:
+        with open(json_ifp, "rb") as json_file:
+            return orjson.loads(json_file.read())
+    with open(json_ifp, "r", encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def use_json_streaming(json_ifp):
+    """Return whether the JSON file should be read incrementally."""
+    return os.path.getsize(json_ifp) >= JSON_STREAMING_MIN_FILE_SIZE
+
+
+class JSONStreamReader:
+    """Class to read a JSON document incrementally.
+
+    The reader allows to iterate over the elements of (nested) arrays and
+    objects, so that only a single element must be kept in memory.
+    """
+
+    def __init__(self, json_file, chunk_size=4 * 1024 * 1024):
+        self._json_file = json_file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _read_chunk(self, min_size=0):
+        chunk = self._json_file.read(max(self._chunk_size, min_size))
+        # Drop the consumed part of the buffer
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        if not chunk:
+            self._eof = True
+        return len(chunk) > 0
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_chunk():
+                raise ValueError("Unexpected end of JSON document")
+
+    def _consume(self, expected_char):
+        char = self.peek()
+        if char != expected_char:
+            raise ValueError(f"Expected {expected_char}, but found {char}")
+        self._pos += 1
+
+    def _consume_separator(self, closing_char):
+        # Return True, if the end of the array / object is reached
+        char = self.peek()
+        self._pos += 1
+        if char == closing_char:
+            return True
+        if char != ",":
+            raise ValueError(f"Expected , or {closing_char}, but found {char}")
+        return False
+
+    def read_value(self):
+        """Read the next value (and all its children)."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer might be incomplete (e.g.
+                # "1.5e" is decoded as 1.5)
+                if self._eof or (
+                    end < len(self._buffer)
+                    and self._buffer[end] in _VALUE_DELIMITERS
+                ):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Grow the buffer geometrically to avoid quadratic run times for
+            # values exceeding the chunk size
+            self._read_chunk(len(self._buffer) - self._pos)
+
+    def iter_array(self):
+        """Iterate over the next array.
+
+        Yields the index of each element. The caller must consume the element
+        (e.g. with :code:`read_value()` or :code:`skip_value()`) before
+        requesting the next one.
+        """
+        self._consume("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            if self._consume_separator("]"):
+                return
+            index += 1
+
+    def iter_object(self):
+        """Iterate over the next object.
+
+        Yields the key of each member. The caller must consume the value of
+        the member before requesting the next one.
+        """
+        self._consume("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self._consume(":")
+            yield key
+            if self._consume_separator("}"):
+                return
+
+    def iter_array_values(self):
+        """Iterate over the (parsed) elements of the next array."""
+        for _ in self.iter_array():
+            yield self.read_value()
+
+    def iter_object_items(self):
+        """Iterate over the keys and (parsed) values of the next object."""
+        for key in self.iter_object():
+            yield key, self.read_value()
+
+    def skip_value(self):
+        """Skip the next value without keeping its children in memory."""
+        char = self.peek()
+        if char == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        elif char == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def read_object(self, key_to_stream_callback):
+        """Read the next object and stream the values of the given keys.
+
+        The value of a member with a key in :code:`key_to_stream_callback` is
+        not stored, instead the corresponding callback is called with this
+        reader (positioned at the value) and must consume the value. All other
+        members are returned as dictionary.
+        """
+        json_data = {}
+        for key in self.iter_object():
+            if key in key_to_stream_callback:
+                key_to_stream_callback[key](self)
+            else:
+                json_data[key] = self.read_value()
+        return json_data
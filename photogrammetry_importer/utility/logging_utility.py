@@ -0,0 +1,48 @@
+"""
+Blender independent logging with pluggable log handlers.
+
+The types, the file handlers and the utility modules without
+:code:`blender_` prefix report messages with :code:`log_report()` of this
+module, i.e. they can be used with plain Python (e.g. in worker processes).
+The messages are passed to the active log handler, which is a callable
+with the same signature as :code:`log_report()`. By default, the messages
+are written with Python's :code:`logging` module. While the add-on is
+registered, the handler of :code:`blender_logging_utility` additionally
+shows the messages in Blender's info area.
+"""
+
+import logging
+
+logger = logging.getLogger("photogrammetry_importer")
+
+
+def default_log_handler(output_type, some_str, op=None):
+    """Write a string with Python's :code:`logging` module."""
+    # output_type is one of: 'INFO', 'WARNING' or 'ERROR'
+    logger.info(output_type + ": " + some_str)
+
+
+_log_handler = default_log_handler
+
+
+def get_log_handler():
+    """Return the active log handler."""
+    return _log_handler
+
+
+def set_log_handler(log_handler):
+    """Set the log handler used by :code:`log_report()`.
+
+    :param log_handler: Callable with the signature
+        :code:`log_handler(output_type, some_str, op)` or None (to restore
+        the default handler).
+    """
+    global _log_handler
+    if log_handler is None:
+        log_handler = default_log_handler
+    _log_handler = log_handler
+
+
+def log_report(output_type, some_str, op=None):
+    """Pass a string to the active log handler."""
+    _log_handler(output_type, some_str, op)
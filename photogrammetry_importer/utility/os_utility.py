@@ -1,4 +1,7 @@
 import os
+import sys
+import tempfile
+import threading
 
 
 def natural_key(some_string):
@@ -8,6 +11,146 @@ def natural_key(some_string):
     ]
 
 
+def _normalize_path(some_path):
+    return os.path.normcase(os.path.abspath(some_path))
+
+
+class DirectoryIndex:
+    """Class that indexes the files of a directory tree.
+
+    The index is built once (with :code:`os.scandir()` in a background thread)
+    and replaces the :code:`os.path.isfile()` calls and directory walks
+    performed during an import. Active indices are queried by
+    :code:`is_file()` and :code:`get_file_paths_in_dir()`.
+    """
+
+    _active_indices = []
+    _active_indices_lock = threading.Lock()
+
+    def __init__(self, root_dp):
+        self.root_dp = _normalize_path(root_dp)
+        self._dp_to_fns = {}
+        self._dp_to_sub_dns = {}
+        self._fps = set()
+        self._thread = threading.Thread(target=self._build, daemon=True)
+
+    def _build(self):
+        # Like os.walk(), symbolic links to directories are not followed
+        dps = [self.root_dp]
+        while len(dps) > 0:
+            dp = dps.pop()
+            fns = []
+            sub_dns = []
+            try:
+                with os.scandir(dp) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                sub_dns.append(entry.name)
+                            elif entry.is_file():
+                                fns.append(entry.name)
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+            normalized_dp = os.path.normcase(dp)
+            self._dp_to_fns[normalized_dp] = fns
+            self._dp_to_sub_dns[normalized_dp] = sub_dns
+            self._fps.update(
+                os.path.normcase(os.path.join(dp, fn)) for fn in fns
+            )
+            dps.extend(os.path.join(dp, sub_dn) for sub_dn in sub_dns)
+
+    def start(self):
+        """Start building the index in a background thread."""
+        self._thread.start()
+
+    def wait(self):
+        """Wait until the index is built."""
+        self._thread.join()
+
+    def covers(self, some_path):
+        """Return True, if the path is located in the indexed tree."""
+        normalized_path = _normalize_path(some_path)
+        return normalized_path == self.root_dp or normalized_path.startswith(
+            os.path.join(self.root_dp, "")
+        )
+
+    def is_file(self, fp):
+        """Return True, if the (indexed) path is an existing file."""
+        self.wait()
+        normalized_fp = _normalize_path(fp)
+        if os.path.dirname(normalized_fp) not in self._dp_to_fns:
+            # The directory has not been indexed (e.g. a directory reached
+            # with a symbolic link)
+            return os.path.isfile(fp)
+        return normalized_fp in self._fps
+
+    def get_file_paths(self, idp, recursive=False):
+        """Return the paths of the files in the (indexed) directory.
+
+        Returns :code:`None`, if the directory has not been indexed.
+        """
+        self.wait()
+        if _normalize_path(idp) not in self._dp_to_fns:
+            return None
+        ifp_s = []
+        # Use the path representation of the caller in the results
+        idp_stack = [(_normalize_path(idp), idp)]
+        while len(idp_stack) > 0:
+            normalized_dp, dp = idp_stack.pop()
+            ifp_s += [
+                os.path.join(dp, fn)
+                for fn in self._dp_to_fns.get(normalized_dp, [])
+            ]
+            if recursive:
+                idp_stack += [
+                    (
+                        os.path.normcase(os.path.join(normalized_dp, sub_dn)),
+                        os.path.join(dp, sub_dn),
+                    )
+                    for sub_dn in self._dp_to_sub_dns.get(normalized_dp, [])
+                ]
+        return ifp_s
+
+    @classmethod
+    def build_active_index(cls, root_dp):
+        """Build an index (in the background) and register it as active."""
+        directory_index = cls(root_dp)
+        directory_index.start()
+        with cls._active_indices_lock:
+            cls._active_indices.append(directory_index)
+        return directory_index
+
+    @classmethod
+    def get_active_index(cls, some_path):
+        """Return the active index covering the path (or None)."""
+        with cls._active_indices_lock:
+            active_indices = list(cls._active_indices)
+        for directory_index in active_indices:
+            if directory_index.covers(some_path):
+                return directory_index
+        return None
+
+    @classmethod
+    def clear_active_indices(cls):
+        """Remove all active indices, e.g. at the end of an import."""
+        with cls._active_indices_lock:
+            cls._active_indices = []
+
+
+def is_file(fp):
+    """Return True, if the path is an existing file.
+
+    Uses an active :code:`DirectoryIndex` (if available) instead of querying
+    the file system.
+    """
+    directory_index = DirectoryIndex.get_active_index(fp)
+    if directory_index is None:
+        return os.path.isfile(fp)
+    return directory_index.is_file(fp)
+
+
 def get_file_paths_in_dir(
     idp,
     ext=None,
@@ -25,11 +168,16 @@ def get_file_paths_in_dir(
     (e.g. ['.jpg', '.png'] or '.jpg')
     """
 
-    if recursive:
+    ifp_s = None
+    directory_index = DirectoryIndex.get_active_index(idp)
+    if directory_index is not None:
+        ifp_s = directory_index.get_file_paths(idp, recursive)
+
+    if ifp_s is None and recursive:
         ifp_s = []
         for root, dirs, files in os.walk(idp):
             ifp_s += [os.path.join(root, ele) for ele in files]
-    else:
+    elif ifp_s is None:
         ifp_s = [
             os.path.join(idp, ele)
             for ele in os.listdir(idp)
@@ -156,3 +304,30 @@ def get_subdirs(
             sub_dps = sorted(sub_dps)
 
     return sub_dps
+
+
+def _get_user_cache_dp():
+    if sys.platform == "win32":
+        user_cache_dp = os.environ.get("LOCALAPPDATA")
+    elif sys.platform == "darwin":
+        user_cache_dp = os.path.join(
+            os.path.expanduser("~"), "Library", "Caches"
+        )
+    else:
+        user_cache_dp = os.environ.get("XDG_CACHE_HOME")
+    if not user_cache_dp:
+        user_cache_dp = os.path.join(os.path.expanduser("~"), ".cache")
+    return user_cache_dp
+
+
+def get_addon_cache_dp(create=True):
+    """Return the directory used to cache data across imports.
+
+    The directory is located in the cache directory of the current user
+    (and not in the temporary directory), since saved :code:`.blend` files
+    may refer to cached files (e.g. to image proxies).
+    """
+    cache_dp = os.path.join(_get_user_cache_dp(), "photogrammetry_importer")
+    if create and not os.path.isdir(cache_dp):
+        os.makedirs(cache_dp, exist_ok=True)
+    return cache_dp
@@ -0,0 +1,161 @@
+"""
+Functions to compute point colors from the image observations of the points.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+from photogrammetry_importer.utility.logging_utility import log_report
+
+try:
+    from PIL import Image as _PILImage
+    from PIL import ImageFile as _PILImageFile
+
+    _PILImageFile.LOAD_TRUNCATED_IMAGES = True
+except ImportError:
+    _PILImage = None
+
+
+def is_pillow_available():
+    """Return whether Pillow is available to load images."""
+    return _PILImage is not None
+
+
+def _load_image_arr(image_fp):
+    """Return the (height, width, 3) RGB array of the image."""
+    # Pillow releases the GIL while decoding, i.e. several images are
+    # decoded in parallel
+    with _PILImage.open(image_fp) as pil_image:
+        return np.asarray(pil_image.convert("RGB"))
+
+
+def sample_image_colors(
+    image_arr, x_coords, y_coords, use_bilinear_interpolation=False
+):
+    """Sample the colors of an image at the given pixel coordinates.
+
+    The coordinates are clipped to the image boundaries. Without bilinear
+    interpolation the coordinates are truncated (like Pillow's
+    :code:`getpixel()`).
+    """
+    # REMARK: The order of ndarray.shape (height, width) is complimentary to
+    # pillow's image.size (width, height).
+    height, width = image_arr.shape[0:2]
+    if use_bilinear_interpolation:
+        x_floor = np.floor(x_coords)
+        y_floor = np.floor(y_coords)
+        x_weights = (x_coords - x_floor)[:, np.newaxis]
+        y_weights = (y_coords - y_floor)[:, np.newaxis]
+        x_0 = np.clip(x_floor.astype(int), 0, width - 1)
+        y_0 = np.clip(y_floor.astype(int), 0, height - 1)
+        x_1 = np.clip(x_0 + 1, 0, width - 1)
+        y_1 = np.clip(y_0 + 1, 0, height - 1)
+        top_colors = (1 - x_weights) * image_arr[y_0, x_0] + (
+            x_weights * image_arr[y_0, x_1]
+        )
+        bottom_colors = (1 - x_weights) * image_arr[y_1, x_0] + (
+            x_weights * image_arr[y_1, x_1]
+        )
+        colors = (1 - y_weights) * top_colors + y_weights * bottom_colors
+    else:
+        x_indices = np.clip(x_coords.astype(int), 0, width - 1)
+        y_indices = np.clip(y_coords.astype(int), 0, height - 1)
+        colors = image_arr[y_indices, x_indices]
+    return colors.astype(float)
+
+
+def _group_observations_by_view(observation_view_indices):
+    order = np.argsort(observation_view_indices, kind="stable")
+    view_indices, group_starts = np.unique(
+        observation_view_indices[order], return_index=True
+    )
+    observation_groups = np.split(order, group_starts[1:])
+    return zip(view_indices.tolist(), observation_groups)
+
+
+def compute_point_colors_from_observations(
+    num_points,
+    observation_point_indices,
+    observation_view_indices,
+    observation_coords,
+    view_index_to_image_fp,
+    use_bilinear_interpolation=False,
+    num_threads=None,
+    max_num_loaded_images=None,
+    op=None,
+):
+    """Compute the point colors by averaging the observed image colors.
+
+    The observations are grouped by view, so that each image is loaded only
+    once. All observations of a view are sampled with a single indexing
+    operation. The views are processed in a thread pool. At most
+    :code:`max_num_loaded_images` views are processed at the same time, i.e.
+    the number of decoded images in memory is bounded.
+
+    :param observation_point_indices: Array with the point index of each
+        observation.
+    :param observation_view_indices: Array with the view index of each
+        observation.
+    :param observation_coords: Array of shape (num_observations, 2) with the
+        image coordinates (x, y) of each observation.
+    :return: Array of shape (num_points, 3) with integer RGB colors.
+    """
+    assert _PILImage is not None
+    observation_point_indices = np.asarray(observation_point_indices)
+    observation_view_indices = np.asarray(observation_view_indices)
+    observation_coords = np.asarray(observation_coords, dtype=float)
+
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+    if max_num_loaded_images is None:
+        max_num_loaded_images = num_threads
+    assert max_num_loaded_images > 0
+
+    def compute_view_colors(view_index, observation_indices):
+        image_arr = _load_image_arr(view_index_to_image_fp[view_index])
+        view_observation_coords = observation_coords[observation_indices]
+        view_colors = sample_image_colors(
+            image_arr,
+            view_observation_coords[:, 0],
+            view_observation_coords[:, 1],
+            use_bilinear_interpolation,
+        )
+        return observation_indices, view_colors
+
+    color_sums = np.zeros((num_points, 3), dtype=float)
+
+    def accumulate_view_colors(done_futures):
+        # The accumulation happens in this thread, i.e. no locks required
+        for future in done_futures:
+            observation_indices, view_colors = future.result()
+            np.add.at(
+                color_sums,
+                observation_point_indices[observation_indices],
+                view_colors,
+            )
+
+    view_groups = list(_group_observations_by_view(observation_view_indices))
+    log_report(
+        "INFO", "Sampling colors of " + str(len(view_groups)) + " views", op
+    )
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pending_futures = set()
+        for view_index, observation_indices in view_groups:
+            if len(pending_futures) >= max_num_loaded_images:
+                done_futures, pending_futures = wait(
+                    pending_futures, return_when=FIRST_COMPLETED
+                )
+                accumulate_view_colors(done_futures)
+            pending_futures.add(
+                executor.submit(
+                    compute_view_colors, view_index, observation_indices
+                )
+            )
+        accumulate_view_colors(wait(pending_futures).done)
+
+    num_observations = np.bincount(
+        observation_point_indices, minlength=num_points
+    )
+    colors = color_sums / np.maximum(num_observations, 1)[:, np.newaxis]
+    return colors.astype(int)
@@ -0,0 +1,366 @@
+"""
+Execution of (parse) functions in a separate process.
+
+The function is executed in a spawned Python process. The camera poses,
+the point coordinates and the point colors of the result are transferred
+with :code:`multiprocessing.shared_memory`, i.e. the corresponding arrays
+in the calling process are views into the shared memory (no copy is
+required). The remaining values are transferred with :code:`pickle`.
+"""
+
+import pickle
+import traceback
+import multiprocessing
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Requires Python 3.8 or newer
+    shared_memory = None
+
+from photogrammetry_importer.types.camera import Camera
+from photogrammetry_importer.types.camera_array import CameraArray
+from photogrammetry_importer.types.point import Point
+from photogrammetry_importer.types.point_array import PointArray
+from photogrammetry_importer.utility.logging_utility import (
+    log_report,
+    set_log_handler,
+)
+from photogrammetry_importer.utility.profiling_utility import (
+    profile_span,
+    increment_counter,
+)
+
+# Seconds the worker keeps the shared memory after sending the result
+_WORKER_RELEASE_TIMEOUT = 600
+
+_CAMERA_ARRAY_ATTRIBUTES = [
+    "quaternions",
+    "rotation_mats",
+    "centers",
+    "translation_vecs",
+    "calibration_mats",
+]
+_POINT_ARRAY_ATTRIBUTES = ["coords", "colors", "ids"]
+
+# Shared memory blocks referenced by arrays of received results
+_received_shared_memories = []
+
+
+class ProcessCommunicationError(RuntimeError):
+    """The worker process could not be started or could not send a result.
+
+    In contrast to exceptions raised by the called function, this error
+    does not depend on the function, i.e. the function can be called in the
+    current process instead.
+    """
+
+
+def is_process_execution_available():
+    """Return whether :code:`call_in_process()` can be used."""
+    return shared_memory is not None
+
+
+def _is_camera_list(value):
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(element, Camera) for element in value)
+    )
+
+
+def _is_point_list(value):
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(element, Point) for element in value)
+    )
+
+
+def _get_shared_array(shm, shape, dtype):
+    # In contrast to np.ndarray(), np.frombuffer() holds the buffer, i.e.
+    # closing the shared memory fails (instead of invalidating the array)
+    # as long as the array or views of the array exist.
+    num_elements = int(np.prod(shape))
+    return np.frombuffer(shm.buf, dtype=dtype, count=num_elements).reshape(
+        shape
+    )
+
+
+def _create_shared_array(array, shms):
+    array = np.ascontiguousarray(array)
+    # Shared memory blocks of size 0 are not supported
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shms.append(shm)
+    _get_shared_array(shm, array.shape, array.dtype)[...] = array
+    return shm.name, array.shape, array.dtype.str
+
+
+def _attach_shared_array(array_info):
+    name, shape, dtype = array_info
+    shm = shared_memory.SharedMemory(name=name)
+    # The calling process owns the memory (the worker only closes it)
+    shm.unlink()
+    _received_shared_memories.append(shm)
+    increment_counter("shared memory bytes", shm.size)
+    return _get_shared_array(shm, shape, dtype)
+
+
+def _pack_value(value, shms):
+    if _is_camera_list(value):
+        camera_array = CameraArray.from_cameras(value)
+        array_infos = {
+            array_name: _create_shared_array(
+                getattr(camera_array, array_name), shms
+            )
+            for array_name in _CAMERA_ARRAY_ATTRIBUTES
+        }
+        # Avoid that the arrays are additionally pickled
+        for index, camera in enumerate(value):
+            camera._set_camera_array(None, index)
+        return "cameras", (value, array_infos)
+    if isinstance(value, PointArray) or _is_point_list(value):
+        point_array = PointArray.from_points(value)
+        array_infos = {
+            array_name: _create_shared_array(
+                getattr(point_array, array_name), shms
+            )
+            for array_name in _POINT_ARRAY_ATTRIBUTES
+        }
+        return "points", array_infos
+    return "value", value
+
+
+def _unpack_value(packed_value):
+    value_type, value = packed_value
+    if value_type == "cameras":
+        cameras, array_infos = value
+        camera_array = CameraArray(0)
+        for array_name in _CAMERA_ARRAY_ATTRIBUTES:
+            setattr(
+                camera_array,
+                array_name,
+                _attach_shared_array(array_infos[array_name]),
+            )
+        # The radial distortions are pickled with the cameras
+        camera_array.radial_distortions = np.zeros(len(cameras), dtype=float)
+        for index, camera in enumerate(cameras):
+            camera._set_camera_array(camera_array, index)
+        return cameras
+    if value_type == "points":
+        arrays = [
+            _attach_shared_array(value[array_name])
+            for array_name in _POINT_ARRAY_ATTRIBUTES
+        ]
+        return PointArray(*arrays)
+    return value
+
+
+def _pack_result(result, shms):
+    if isinstance(result, tuple):
+        return True, [_pack_value(value, shms) for value in result]
+    return False, _pack_value(result, shms)
+
+
+def _unpack_result(packed_result):
+    is_tuple, packed_values = packed_result
+    if is_tuple:
+        return tuple(_unpack_value(value) for value in packed_values)
+    return _unpack_value(packed_values)
+
+
+def _run_worker(conn, func, args, kwargs):
+    log_messages = []
+
+    def collect_log_message(output_type, some_str, op=None):
+        log_messages.append((output_type, some_str))
+
+    # The messages are reported by the calling process
+    set_log_handler(collect_log_message)
+    shms = []
+    try:
+        result = func(*args, **kwargs)
+        conn.send(("result", _pack_result(result, shms), log_messages))
+    except Exception:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+        shms = []
+        conn.send(("error", traceback.format_exc(), log_messages))
+
+    # On Windows, the shared memory is released as soon as all handles are
+    # closed. Thus, keep the handles until the calling process attached them.
+    if conn.poll(_WORKER_RELEASE_TIMEOUT):
+        conn.recv()
+    for shm in shms:
+        shm.close()
+    conn.close()
+
+
+def release_shared_memory():
+    """Close the shared memory of results that are no longer referenced."""
+    for shm in list(_received_shared_memories):
+        try:
+            shm.close()
+        except BufferError:
+            # The memory is still referenced by arrays of a previous result
+            continue
+        _received_shared_memories.remove(shm)
+
+
+class ProcessCall:
+    """Call of a function in a separate (spawned) process.
+
+    In contrast to :code:`call_in_process()`, the calling process is not
+    blocked while the function is executed, i.e. the calling process can
+    poll :code:`is_done()` (e.g. in the modal handler of an operator) and
+    request the result with :code:`get_result()` afterwards.
+
+    The function must be importable by the spawned process, i.e. it must
+    not be a lambda or a local function.
+
+    :param python_executable: Path of the Python interpreter used to
+        spawn the process (e.g. required within Blender, if
+        :code:`sys.executable` does not refer to Python).
+    """
+
+    def __init__(self, func, args=(), kwargs=None, python_executable=None):
+        if kwargs is None:
+            kwargs = {}
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._python_executable = python_executable
+        self._process = None
+        self._parent_conn = None
+        self._is_result_attached = False
+
+    def start(self):
+        """Start the process.
+
+        :raise ProcessCommunicationError: If the process could not be
+            started.
+        """
+        if shared_memory is None:
+            raise ProcessCommunicationError(
+                "Shared memory requires Python 3.8 or newer"
+            )
+        release_shared_memory()
+
+        context = multiprocessing.get_context("spawn")
+        if self._python_executable is not None:
+            context.set_executable(self._python_executable)
+        self._parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_run_worker,
+            args=(child_conn, self._func, self._args, self._kwargs),
+            daemon=True,
+        )
+        try:
+            self._process.start()
+        except (OSError, pickle.PicklingError) as err:
+            self._process = None
+            self._parent_conn.close()
+            self._parent_conn = None
+            raise ProcessCommunicationError(
+                "The worker process could not be started: " + str(err)
+            ) from err
+        finally:
+            # Allows to detect the termination of the worker
+            child_conn.close()
+
+    def wait(self, timeout=None):
+        """Wait until the result is available (or the process died).
+
+        :return: Whether the result is available (or the process died)
+            before the timeout (in seconds) expired.
+        """
+        return self._parent_conn.poll(timeout)
+
+    def is_done(self):
+        """Return whether the result is available (or the process died)."""
+        return self.wait(0)
+
+    def get_result(self, op=None):
+        """Wait for the result of the function and return it.
+
+        Lists of cameras are returned as cameras referring to arrays in
+        shared memory and lists of points are returned as
+        :code:`PointArray` referring to arrays in shared memory. The log
+        messages of the spawned process are reported with :code:`op`.
+
+        :raise ProcessCommunicationError: If the result could not be
+            transferred.
+        :raise RuntimeError: If the function raised an exception (the
+            message contains the traceback of the spawned process).
+        """
+        try:
+            message_type, payload, log_messages = self._parent_conn.recv()
+        except (EOFError, OSError) as err:
+            self._process.join()
+            raise ProcessCommunicationError(
+                "The worker process terminated unexpectedly (exit code "
+                + str(self._process.exitcode)
+                + ")"
+            ) from err
+
+        for output_type, some_str in log_messages:
+            log_report(output_type, some_str, op)
+
+        with profile_span("Attach Shared Memory"):
+            try:
+                if message_type == "error":
+                    raise RuntimeError(
+                        "The worker process raised an exception:\n" + payload
+                    )
+                try:
+                    result = _unpack_result(payload)
+                except OSError as err:
+                    raise ProcessCommunicationError(
+                        "The shared memory could not be attached: " + str(err)
+                    ) from err
+            finally:
+                try:
+                    self._parent_conn.send("attached")
+                except OSError:
+                    # The worker terminated after sending the result
+                    pass
+                self._is_result_attached = True
+                self.terminate()
+        return result
+
+    def terminate(self):
+        """Stop the process (if it is still running) and close the pipe."""
+        if self._process is not None:
+            # After the result has been attached, the worker exits on its own
+            if not self._is_result_attached:
+                self._process.terminate()
+            self._process.join()
+            self._process = None
+        if self._parent_conn is not None:
+            self._parent_conn.close()
+            self._parent_conn = None
+
+
+def call_in_process(
+    func, args=(), kwargs=None, python_executable=None, op=None
+):
+    """Call a function in a separate (spawned) process and return its result.
+
+    The calling process is blocked until the result is available. See
+    :code:`ProcessCall` for a description of the parameters, the result
+    and the raised exceptions.
+
+    :raise ProcessCommunicationError: If the process could not be started
+        or if the result could not be transferred.
+    :raise RuntimeError: If the function raised an exception.
+    """
+    process_call = ProcessCall(func, args, kwargs, python_executable)
+    try:
+        with profile_span("Wait for Worker Process"):
+            process_call.start()
+            process_call.wait()
+        return process_call.get_result(op)
+    finally:
+        process_call.terminate()
@@ -0,0 +1,314 @@
+"""
+Hierarchical timing of the import and export steps.
+
+Use :code:`profile_span()` or :code:`profile_function()` to measure
+(nested) steps and :code:`increment_counter()` to count processed elements.
+These functions return immediately if the profiler is not running, i.e. they
+can be used in every file handler and operator without noticeable overhead.
+
+Optionally, the profiler tracks the memory consumption of each step, i.e.
+the resident set size (RSS) of the process and the peak of the memory
+allocated by Python (including :code:`numpy` arrays) using
+:code:`tracemalloc`.
+"""
+
+import os
+import json
+import time
+import functools
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from photogrammetry_importer.utility.logging_utility import log_report
+
+
+def get_rss():
+    """Return the resident set size of this process in bytes (or None).
+
+    Uses :code:`psutil` if available. Otherwise, the value is read from
+    :code:`/proc` (only available on Linux).
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as statm_file:
+            num_pages = int(statm_file.read().split()[1])
+        return num_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def _format_bytes(num_bytes):
+    if num_bytes is None:
+        return "?"
+    return "{:.1f} MB".format(num_bytes / (1024 * 1024))
+
+
+class ProfilingSpan:
+    """Class representing a named (and possibly nested) time span."""
+
+    __slots__ = (
+        "name",
+        "start_time",
+        "duration",
+        "counters",
+        "children",
+        "rss_start",
+        "rss_end",
+        "peak_traced_memory",
+    )
+
+    def __init__(self, name):
+        self.name = name
+        self.start_time = time.perf_counter()
+        self.duration = None
+        self.counters = {}
+        self.children = []
+        self.rss_start = None
+        self.rss_end = None
+        self.peak_traced_memory = None
+
+    def stop(self):
+        self.duration = time.perf_counter() - self.start_time
+
+    def get_duration(self):
+        if self.duration is None:
+            return time.perf_counter() - self.start_time
+        return self.duration
+
+    def has_memory_info(self):
+        return (
+            self.rss_start is not None or self.peak_traced_memory is not None
+        )
+
+    def get_memory_summary(self):
+        """Return the RSS before / after the span and the traced peak."""
+        return "RSS: {} -> {}, peak traced: {}".format(
+            _format_bytes(self.rss_start),
+            _format_bytes(self.rss_end),
+            _format_bytes(self.peak_traced_memory),
+        )
+
+    def to_dict(self):
+        result = {
+            "name": self.name,
+            "duration": self.get_duration(),
+            "counters": dict(self.counters),
+            "children": [child.to_dict() for child in self.children],
+        }
+        if self.has_memory_info():
+            result["rss_start"] = self.rss_start
+            result["rss_end"] = self.rss_end
+            result["peak_traced_memory"] = self.peak_traced_memory
+        return result
+
+
+class Profiler:
+    """Class to collect nested spans and counters of a single run.
+
+    The spans must be opened and closed in the main thread.
+
+    If memory tracking is enabled, the peak of the traced memory is
+    determined for each span separately, i.e. the peak of a span does not
+    include the allocations of previous (sibling) spans. This requires
+    :code:`tracemalloc.reset_peak()` (Python 3.9 or newer) - with older
+    Python versions the peak of a span is the peak since the start of the
+    run.
+    """
+
+    def __init__(self):
+        self.root_span = None
+        self._span_stack = []
+        self._track_memory = False
+        self._started_tracemalloc = False
+
+    def is_running(self):
+        return self.root_span is not None and self.root_span.duration is None
+
+    def start(self, name, track_memory=False):
+        """Start a new run (discarding the results of the previous one)."""
+        self.stop()
+        self._track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.root_span = ProfilingSpan(name)
+        self._span_stack = [self.root_span]
+        self._start_memory_tracking(self.root_span, None)
+
+    def stop(self):
+        """Stop the current run."""
+        if self.is_running():
+            self._stop_memory_tracking(self.root_span, None)
+            self.root_span.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._span_stack = []
+
+    def _update_peak(self, span):
+        peak = tracemalloc.get_traced_memory()[1]
+        if span.peak_traced_memory is None or span.peak_traced_memory < peak:
+            span.peak_traced_memory = peak
+
+    def _start_memory_tracking(self, span, parent_span):
+        if not self._track_memory:
+            return
+        span.rss_start = get_rss()
+        if tracemalloc.is_tracing():
+            if parent_span is not None:
+                # Store the peak of the parent reached so far
+                self._update_peak(parent_span)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self._update_peak(span)
+
+    def _stop_memory_tracking(self, span, parent_span):
+        if not self._track_memory:
+            return
+        span.rss_end = get_rss()
+        if tracemalloc.is_tracing():
+            self._update_peak(span)
+            if parent_span is not None:
+                # The peak of the child is also a peak of the parent
+                parent_span.peak_traced_memory = max(
+                    parent_span.peak_traced_memory, span.peak_traced_memory
+                )
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+
+    @contextmanager
+    def span(self, name):
+        """Context manager measuring a span nested in the current span."""
+        parent_span = self._span_stack[-1]
+        span = ProfilingSpan(name)
+        parent_span.children.append(span)
+        self._span_stack.append(span)
+        self._start_memory_tracking(span, parent_span)
+        try:
+            yield span
+        finally:
+            self._stop_memory_tracking(span, parent_span)
+            span.stop()
+            self._span_stack.pop()
+
+    def increment_counter(self, name, value=1):
+        """Increment a counter of the current span."""
+        counters = self._span_stack[-1].counters
+        counters[name] = counters.get(name, 0) + value
+
+    def get_total_counters(self):
+        """Return the counters accumulated over all spans."""
+        total_counters = {}
+        spans = [self.root_span]
+        while len(spans) > 0:
+            span = spans.pop()
+            for name, value in span.counters.items():
+                total_counters[name] = total_counters.get(name, 0) + value
+            spans.extend(span.children)
+        return total_counters
+
+    def get_report(self):
+        """Return the spans of the last run as tree (string)."""
+        if self.root_span is None:
+            return ""
+        lines = []
+        spans = [(self.root_span, 0)]
+        while len(spans) > 0:
+            span, depth = spans.pop()
+            line = "    " * depth + span.name
+            line += ": {:.3f} s".format(span.get_duration())
+            if len(span.counters) > 0:
+                line += " (" + ", ".join(
+                    "{}: {}".format(name, value)
+                    for name, value in span.counters.items()
+                )
+                line += ")"
+            if span.has_memory_info():
+                line += " [" + span.get_memory_summary() + "]"
+            lines.append(line)
+            spans.extend(
+                (child, depth + 1) for child in reversed(span.children)
+            )
+        return "\n".join(lines)
+
+    def to_dict(self):
+        if self.root_span is None:
+            return {}
+        result = self.root_span.to_dict()
+        result["total_counters"] = self.get_total_counters()
+        return result
+
+    def write_json(self, ofp):
+        """Write the spans and counters of the last run to a JSON file."""
+        with open(ofp, "w") as ofile:
+            json.dump(self.to_dict(), ofile, indent=4)
+
+
+_profiler = Profiler()
+_null_span = nullcontext()
+
+
+def get_profiler():
+    """Return the profiler shared by all file handlers and operators."""
+    return _profiler
+
+
+def profile_span(name):
+    """Measure a (nested) span, if the profiler is running.
+
+    Use as context manager, i.e. :code:`with profile_span("Parse"): ...`.
+    """
+    if not _profiler.is_running():
+        return _null_span
+    return _profiler.span(name)
+
+
+def profile_function(name):
+    """Decorator measuring each call of a function as span."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _profiler.is_running():
+                return func(*args, **kwargs)
+            with _profiler.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def increment_counter(name, value=1):
+    """Increment a counter of the current span, if the profiler is running."""
+    if _profiler.is_running():
+        _profiler.increment_counter(name, value)
+
+
+def count_bytes_read(*fps):
+    """Add the size of the given files to the "bytes read" counter."""
+    if not _profiler.is_running():
+        return
+    for fp in fps:
+        if fp is not None and os.path.isfile(fp):
+            _profiler.increment_counter("bytes read", os.path.getsize(fp))
+
+
+def start_profiling(name, track_memory=False):
+    """Start a new profiling run."""
+    _profiler.start(name, track_memory)
+
+
+def stop_profiling(report_ofp=None, op=None):
+    """Stop the profiling run, log the report and optionally write it."""
+    _profiler.stop()
+    log_report("INFO", "Profiling report:\n" + _profiler.get_report(), op)
+    if report_ofp is not None:
+        _profiler.write_json(report_ofp)
+        log_report("INFO", "Wrote profiling report to " + report_ofp, op)
@@ -0,0 +1,139 @@
+"""
+Vectorized functions to convert rotations and transformations.
+"""
+
+import numpy as np
+
+
+def quaternions_to_rotation_matrices(quaternions):
+    """Convert quaternions to rotation matrices.
+
+    The quaternions are normalized before the conversion. Quaternions with
+    zero norm are converted to identity matrices.
+
+    :param quaternions: Array with (N, 4) quaternions (w, x, y, z).
+    :return: Array with (N, 3, 3) rotation matrices.
+    """
+    q = np.array(quaternions, dtype=float).reshape(-1, 4)
+    norms = np.linalg.norm(q, axis=1)
+    is_zero = norms <= 0
+    q[is_zero] = (1.0, 0.0, 0.0, 0.0)
+    norms[is_zero] = 1.0
+    q /= norms[:, np.newaxis]
+    qw, qx, qy, qz = q.T
+
+    m = np.empty((q.shape[0], 3, 3), dtype=float)
+    m[:, 0, 0] = qw * qw + qx * qx - qz * qz - qy * qy
+    m[:, 0, 1] = 2 * qx * qy - 2 * qz * qw
+    m[:, 0, 2] = 2 * qy * qw + 2 * qz * qx
+    m[:, 1, 0] = 2 * qx * qy + 2 * qw * qz
+    m[:, 1, 1] = qy * qy + qw * qw - qz * qz - qx * qx
+    m[:, 1, 2] = 2 * qz * qy - 2 * qx * qw
+    m[:, 2, 0] = 2 * qx * qz - 2 * qy * qw
+    m[:, 2, 1] = 2 * qy * qz + 2 * qw * qx
+    m[:, 2, 2] = qz * qz + qw * qw - qy * qy - qx * qx
+    return m
+
+
+def are_rotation_matrices_valid(rotation_mats):
+    """Return a boolean array indicating which matrices are rotations.
+
+    Consistent with :code:`Camera.is_rotation_mat_valid()`, matrices with a
+    determinant of 1 or -1 are considered as valid.
+    """
+    dets = np.linalg.det(np.asarray(rotation_mats, dtype=float))
+    return np.isclose(dets, 1) | np.isclose(dets, -1)
+
+
+def rotation_matrices_to_quaternions(rotation_mats):
+    """Convert rotation matrices to quaternions.
+
+    :param rotation_mats: Array with (N, 3, 3) rotation matrices.
+    :return: Array with (N, 4) normalized quaternions (w, x, y, z).
+    """
+    m = np.asarray(rotation_mats, dtype=float).reshape(-1, 3, 3)
+    m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+    m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+    m20, m21, m22 = m[:, 2, 0], m[:, 2, 1], m[:, 2, 2]
+    trace = m00 + m11 + m22
+
+    # Use the numerically most stable formula for each matrix, i.e. the one
+    # dividing by the largest quaternion component
+    case = np.argmax(np.stack((trace, m00, m11, m22), axis=1), axis=1)
+    quats = np.empty((m.shape[0], 4), dtype=float)
+
+    c = case == 0
+    s = 2.0 * np.sqrt(np.maximum(1.0 + trace[c], 0.0))
+    quats[c, 0] = 0.25 * s
+    quats[c, 1] = (m21[c] - m12[c]) / s
+    quats[c, 2] = (m02[c] - m20[c]) / s
+    quats[c, 3] = (m10[c] - m01[c]) / s
+
+    c = case == 1
+    s = 2.0 * np.sqrt(np.maximum(1.0 + m00[c] - m11[c] - m22[c], 0.0))
+    quats[c, 0] = (m21[c] - m12[c]) / s
+    quats[c, 1] = 0.25 * s
+    quats[c, 2] = (m01[c] + m10[c]) / s
+    quats[c, 3] = (m02[c] + m20[c]) / s
+
+    c = case == 2
+    s = 2.0 * np.sqrt(np.maximum(1.0 + m11[c] - m00[c] - m22[c], 0.0))
+    quats[c, 0] = (m02[c] - m20[c]) / s
+    quats[c, 1] = (m01[c] + m10[c]) / s
+    quats[c, 2] = 0.25 * s
+    quats[c, 3] = (m12[c] + m21[c]) / s
+
+    c = case == 3
+    s = 2.0 * np.sqrt(np.maximum(1.0 + m22[c] - m00[c] - m11[c], 0.0))
+    quats[c, 0] = (m10[c] - m01[c]) / s
+    quats[c, 1] = (m02[c] + m20[c]) / s
+    quats[c, 2] = (m12[c] + m21[c]) / s
+    quats[c, 3] = 0.25 * s
+
+    quats /= np.linalg.norm(quats, axis=1)[:, np.newaxis]
+    return quats
+
+
+def decompose_transformation_matrices(transformation_mats):
+    """Decompose transformation matrices into location, rotation and scale.
+
+    Matrices with a negative determinant (i.e. containing a reflection)
+    are decomposed into a rotation and negative scales - like
+    :code:`Matrix.decompose()` of :code:`mathutils`.
+
+    :param transformation_mats: Array with (N, 4, 4) matrices.
+    :return: Tuple containing the (N, 3) locations, the (N, 4) quaternions
+        (w, x, y, z) and the (N, 3) scales.
+    """
+    mats = np.asarray(transformation_mats, dtype=float).reshape(-1, 4, 4)
+    locations = mats[:, 0:3, 3].copy()
+    scales = np.linalg.norm(mats[:, 0:3, 0:3], axis=1)
+    # The column norms are positive, i.e. the reflection must be moved from
+    # the rotation matrix to the scales
+    is_negative = np.linalg.det(mats[:, 0:3, 0:3]) < 0
+    scales[is_negative] *= -1
+    rotation_mats = mats[:, 0:3, 0:3] / scales[:, np.newaxis, :]
+    quaternions = rotation_matrices_to_quaternions(rotation_mats)
+    return locations, quaternions, scales
+
+
+def remove_quaternion_sign_flips(quaternions):
+    """Remove sign flips in a sequence of quaternions.
+
+    A quaternion q and its negative -q represent the same rotation, but the
+    interpolation between consecutive quaternions with different signs does
+    not take the shortest path. The signs are adjusted such that the dot
+    product of consecutive quaternions is not negative.
+
+    :param quaternions: Array with (N, 4) quaternions.
+    :return: Array with (N, 4) quaternions.
+    """
+    quaternions = np.array(quaternions, dtype=float).reshape(-1, 4)
+    if quaternions.shape[0] < 2:
+        return quaternions
+    dot_products = np.einsum("ij,ij->i", quaternions[:-1], quaternions[1:])
+    # The sign of each quaternion depends on the (adjusted) sign of its
+    # predecessor, i.e. the flips accumulate
+    flips = np.where(dot_products < 0, -1.0, 1.0)
+    signs = np.concatenate(([1.0], np.cumprod(flips)))
+    return quaternions * signs[:, np.newaxis]